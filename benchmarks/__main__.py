@@ -0,0 +1,49 @@
+import argparse
+import json
+import sys
+
+from benchmarks.suite import BENCHMARKS, run_suite, compare
+
+
+def parse_scale(value: str):
+    return [int(v) for v in value.split(",") if v]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Бенчмарки біржового симулятора")
+    parser.add_argument("--assets", type=parse_scale, default=[10, 1000], help="напр. 10,1000,100000")
+    parser.add_argument("--players", type=parse_scale, default=[1, 100], help="напр. 1,100,10000")
+    parser.add_argument("--days", type=parse_scale, default=[100], help="напр. 100,10000,100000")
+    parser.add_argument("--ticks", type=parse_scale, default=[1000], help="тіків на день, напр. 100,1000")
+    parser.add_argument("--only", nargs="*", choices=sorted(BENCHMARKS), help="запустити лише ці бенчмарки")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="файл для результатів у JSON (за замовчуванням - stdout)")
+    parser.add_argument("--compare", help="JSON попереднього прогону для порівняння")
+    parser.add_argument("--threshold", type=float, default=0.2, help="допустиме сповільнення, частка")
+    args = parser.parse_args()
+
+    scales = {"assets": args.assets, "players": args.players, "days": args.days, "ticks": args.ticks}
+    results = run_suite(scales, args.only, args.seed, log=lambda line: print(line, file=sys.stderr))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+    else:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+
+        regressions = 0
+        for row in compare(baseline, results, args.threshold):
+            marker = "РЕГРЕСІЯ" if row["regression"] else "ok"
+            print(f"{row['key']}: x{row['ratio']:.2f} {marker}", file=sys.stderr)
+            regressions += row["regression"]
+        return 1 if regressions else 0
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
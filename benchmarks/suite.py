@@ -0,0 +1,379 @@
+"""
+Бенчмарки гарячих шляхів симуляції.
+
+Кожен бенчмарк параметризується масштабом (кількість активів, гравців, днів),
+а результати записуються у JSON, щоб порівнювати прогони між собою.
+"""
+
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from game.scenario import create_synthetic_scenario
+from game.trading_game import TradingGame
+from patterns.builder import ScenarioBuilder
+
+BENCHMARKS: Dict[str, Callable[..., Dict]] = {}
+
+
+def benchmark(*params: str):
+    """Реєстрація бенчмарку з переліком параметрів масштабу, які він використовує"""
+    def decorator(func: Callable[..., Dict]) -> Callable[..., Dict]:
+        func.params = params
+        BENCHMARKS[func.__name__] = func
+        return func
+    return decorator
+
+
+def build_synthetic_scenario(assets: int, players: int = 1, seed: int = 0) -> ScenarioBuilder:
+    return create_synthetic_scenario(assets, players, num_investors=0, num_events=0, seed=seed)
+
+
+def build_game(assets: int, players: int = 1, seed: int = 0, positions: int = 10) -> TradingGame:
+    """Гра, у якій кожен гравець має довгі й короткі позиції в кількох активах"""
+    game = TradingGame(build_synthetic_scenario(assets, players, seed))
+    rng = random.Random(seed)
+    asset_list = list(game.market.assets.values())
+
+    for player in game.players:
+        for asset in rng.sample(asset_list, min(positions, len(asset_list))):
+            player.buy_asset(asset, 1, asset.current_price)
+        for asset in rng.sample(asset_list, min(positions // 2, len(asset_list))):
+            player.short_asset(asset, 1, asset.current_price)
+    return game
+
+
+def timed(func: Callable[[], None], ops: int, min_time: float = 0.05,
+          setup: Optional[Callable[[], None]] = None) -> Dict:
+    """
+    Повторює виклик, доки не набереться min_time, щоб короткі заміри не тонули в шумі.
+    setup викликається перед кожним повтором поза заміром і відновлює стан, який змінює func.
+    """
+    rounds = 0
+    elapsed = 0.0
+    while elapsed < min_time:
+        if setup is not None:
+            setup()
+        started = time.perf_counter()
+        func()
+        elapsed += time.perf_counter() - started
+        rounds += 1
+
+    seconds = elapsed / rounds
+    return {"seconds": seconds, "rounds": rounds, "ops": ops,
+            "ops_per_sec": ops / seconds if seconds > 0 else None}
+
+
+@benchmark("assets", "players")
+def build_scenario(assets: int, players: int) -> Dict:
+    return timed(lambda: create_synthetic_scenario(assets, players, num_investors=players // 10,
+                                                   num_events=assets // 20).build(), 1)
+
+
+@benchmark("assets", "days")
+def market_update(assets: int, days: int) -> Dict:
+    market = build_game(assets, positions=0).market
+
+    def run():
+        for _ in range(days):
+            market.update()
+
+    return timed(run, days)
+
+
+@benchmark("assets", "days")
+def update_prices(assets: int, days: int) -> Dict:
+    market = build_game(assets, positions=0).market
+
+    def run():
+        for _ in range(days):
+            market.current_state.update_prices(market)
+
+    return timed(run, days)
+
+
+@benchmark("assets", "days")
+def correlated_prices(assets: int, days: int) -> Dict:
+    from models.price_model import CorrelatedPriceModel
+
+    market = build_game(assets, positions=0).market
+    model = CorrelatedPriceModel(market_correlation=0.2, type_correlation=0.4)
+
+    def run():
+        for _ in range(days):
+            model.update_prices(market)
+
+    return timed(run, days)
+
+
+@benchmark("assets", "ticks")
+def tick_day(assets: int, ticks: int) -> Dict:
+    from models.price_model import TickPriceModel
+
+    market = build_game(assets, positions=0).market
+    market.price_model = TickPriceModel(ticks)
+    result = timed(market.update, ticks)
+    # У скільки разів симуляція дня швидша за реальну добу
+    result["realtime_factor"] = 86400 / result["seconds"]
+    return result
+
+
+@benchmark("assets")
+def publish_snapshot(assets: int) -> Dict:
+    from models.market_snapshot import MarketSnapshotWriter
+
+    market = build_game(assets, positions=0).market
+    writer = MarketSnapshotWriter(max(1, assets))
+    try:
+        return timed(lambda: writer.publish(market), 1)
+    finally:
+        writer.close()
+
+
+@benchmark("assets", "days")
+def simulate_regimes(assets: int, days: int) -> Dict:
+    """Шляхи режимів для кожного активу як окремого ринку (Монте-Карло)"""
+    from models.regime import RegimeEngine
+
+    engine = RegimeEngine()
+    return timed(lambda: engine.simulate(max(1, assets), days, seed=0), max(1, assets) * days)
+
+
+@benchmark("assets", "days")
+def generate_random_event(assets: int, days: int) -> Dict:
+    market = build_game(assets, positions=0).market
+
+    def run():
+        for _ in range(days):
+            market.day += 1
+            market.generate_random_event()
+
+    return timed(run, days)
+
+
+@benchmark("assets", "days")
+def event_memory(assets: int, days: int) -> Dict:
+    """Пам'ять на завершену подію: окремі об'єкти проти записів EventStore (по одній події на день)"""
+    import gc
+    import tracemalloc
+    from models.event_store import EventStore
+    from patterns.factory import EventFactory
+
+    market = build_game(assets, positions=0).market
+
+    def finished_events():
+        events = [EventFactory.create_random_event(market) for _ in range(days)]
+        for event in events:
+            event.remaining_duration = 0
+        return events
+
+    def store_events():
+        store = EventStore()
+        store.extend(finished_events())
+        store.compact()
+        return store
+
+    result = timed(store_events, days)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        events = finished_events()
+        object_bytes = tracemalloc.get_traced_memory()[0] - before
+        del events
+        gc.collect()
+
+        before = tracemalloc.get_traced_memory()[0]
+        store = store_events()
+        gc.collect()
+        store_bytes = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+    result["bytes_per_object"] = object_bytes / max(1, days)
+    result["bytes_per_record"] = store_bytes / max(1, len(store))
+    result["memory_reduction"] = object_bytes / store_bytes if store_bytes > 0 else None
+    return result
+
+
+@benchmark("assets", "players")
+def calculate_net_worth(assets: int, players: int) -> Dict:
+    game = build_game(assets, players)
+
+    def run():
+        for player in game.players:
+            player.calculate_net_worth(game.market)
+
+    return timed(run, players)
+
+
+@benchmark("assets", "players")
+def check_margin_call(assets: int, players: int) -> Dict:
+    """Половина гравців нижче вимоги до застави, тож кожен повтор ліквідує їхні короткі позиції"""
+    game = build_game(assets, players)
+    for player in game.players[::2]:
+        player.capital = 0.01
+    initial = [(player, player.capital, dict(player.portfolio), dict(player.short_positions))
+               for player in game.players]
+
+    def reset():
+        # Ліквідація змінює гравців - кожен повтор починається з того самого стану
+        for player, capital, portfolio, short_positions in initial:
+            player.capital = capital
+            player.portfolio = dict(portfolio)
+            player.short_positions = dict(short_positions)
+            player.trade_history.clear()
+            player.game_over = False
+
+    def run():
+        for player in game.players:
+            player.check_margin_call(game.market)
+
+    return timed(run, players, setup=reset)
+
+
+@benchmark("players")
+def evaluate_investors(players: int) -> Dict:
+    from game.investors import InvestorEvaluator
+
+    game = TradingGame(create_synthetic_scenario(10, players, num_investors=max(1, players // 10),
+                                                 num_events=0, seed=0))
+    rng = random.Random(0)
+    for player in game.players:
+        for investor in rng.sample(game.investors, min(3, len(game.investors))):
+            investor.invest(player, 100.0)
+        game.analytics.record(player.id, player.capital)
+        game.analytics.record(player.id, player.capital * rng.uniform(0.9, 1.1))
+
+    # Без вилучень, щоб кожен повтор оцінював однаковий набір вкладень
+    evaluator = InvestorEvaluator(withdrawal_threshold=0.0)
+    return timed(lambda: evaluator.evaluate(game), players)
+
+
+@benchmark("players")
+def settle_orders(players: int) -> Dict:
+    """Пакетний розрахунок: кожен бот надсилає по 20 дрібних ордерів на кілька активів"""
+    from patterns.command import CommandBus, TradeCommand
+    from utils.enums import TradeType
+
+    game = TradingGame(create_synthetic_scenario(20, players, num_investors=0, num_events=0, seed=0))
+    assets = list(game.market.assets.values())
+    bus = CommandBus()
+    orders_per_player = 20
+
+    def run():
+        for player in game.players:
+            for i in range(orders_per_player):
+                asset = assets[i % 4]
+                trade_type = TradeType.BUY if i % 3 else TradeType.SELL
+                bus.submit(TradeCommand(player, asset, trade_type, 1, asset.current_price))
+        bus.settle()
+        for player in game.players:
+            player.notifications.clear()
+
+    return timed(run, players * orders_per_player)
+
+
+@benchmark("players")
+def rumor_spread(players: int) -> Dict:
+    """Чутка поширюється мережею з players гравців і 9 NPC на кожного, доки не згасне"""
+    from models.social_graph import RumorNetwork
+    from utils.enums import RumorType
+
+    game = build_game(1, players, positions=0)
+    market = game.market
+    market.social = RumorNetwork.random(game.players, npcs=9 * players, seed=0)
+    creator = game.players[0]
+    asset = next(iter(market.assets.values()))
+
+    def run():
+        market.create_rumor(creator, asset, RumorType.INSIDER, "Чутка", True)
+        while market.social.spreads:
+            market.social.step(market)
+
+    result = timed(run, market.social.graph.size)
+    result["edges"] = market.social.graph.edge_count
+    return result
+
+
+@benchmark("assets", "players")
+def serialize_game(assets: int, players: int) -> Dict:
+    from patterns.adapter import GameStateAdapter
+
+    game = build_game(assets, players)
+    return timed(lambda: GameStateAdapter.serialize_game(game), 1)
+
+
+@benchmark("assets", "players")
+def save_load_roundtrip(assets: int, players: int) -> Dict:
+    game = build_game(assets, players)
+    fd, filename = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+
+    def run():
+        game.save_game(filename)
+        TradingGame().load_game(filename)
+
+    try:
+        result = timed(run, 1)
+        result["file_bytes"] = os.path.getsize(filename)
+    finally:
+        os.remove(filename)
+    return result
+
+
+def run_suite(scales: Dict[str, List[int]], names: Optional[List[str]] = None,
+              seed: int = 0, log: Optional[Callable[[str], None]] = None) -> Dict:
+    results = []
+
+    for name, func in BENCHMARKS.items():
+        if names and name not in names:
+            continue
+
+        # Декартів добуток лише тих параметрів, від яких залежить бенчмарк
+        combinations = [{}]
+        for param in func.params:
+            combinations = [dict(c, **{param: value}) for c in combinations for value in scales[param]]
+
+        for params in combinations:
+            random.seed(seed)
+            result = func(**params)
+            results.append({"benchmark": name, "params": params, **result})
+            if log:
+                log(f"{name} {params}: {result['seconds']:.4f} с")
+
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+
+def result_key(result: Dict) -> str:
+    params = ",".join(f"{k}={v}" for k, v in sorted(result["params"].items()))
+    return f"{result['benchmark']}[{params}]"
+
+
+def compare(baseline: Dict, current: Dict, threshold: float = 0.2) -> List[Dict]:
+    """Порівняння з попереднім прогоном; регресія - сповільнення понад threshold"""
+    previous = {result_key(r): r for r in baseline["results"]}
+    report = []
+
+    for result in current["results"]:
+        key = result_key(result)
+        if key not in previous or not previous[key]["seconds"]:
+            continue
+        ratio = result["seconds"] / previous[key]["seconds"]
+        report.append({"key": key, "ratio": ratio, "regression": ratio > 1 + threshold})
+
+    return report
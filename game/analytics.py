@@ -0,0 +1,143 @@
+"""
+Інкрементна аналітика ризику портфелів.
+
+Для кожного гравця раз на ігровий день записується чиста вартість. Ковзні суми
+дохідностей, пік вартості та відсортоване вікно дохідностей оновлюються за O(1)
+(з точністю до розміру вікна), тож аналітика не сповільнює турніри з тисячами ботів.
+"""
+
+import bisect
+import math
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from models.market import Market
+    from models.player import Player
+
+RISK_WINDOW = 30  # Днів у ковзному вікні волатильності, Шарпа і VaR
+EQUITY_CURVE_DAYS = 365  # Скільки останніх точок кривої вартості зберігається
+PERIODS_PER_YEAR = 252  # Для річної волатильності й коефіцієнта Шарпа
+VAR_CONFIDENCE = 0.95
+VAR_Z_SCORE = 1.6449  # Квантиль нормального розподілу для 95%
+
+
+class RiskTracker:
+    def __init__(self, window: int = RISK_WINDOW, curve_days: int = EQUITY_CURVE_DAYS):
+        self.window = window
+        self.equity_curve: Deque[float] = deque(maxlen=curve_days)
+        self._returns: Deque[float] = deque()
+        self._sorted_returns: List[float] = []
+        self._sum = 0.0
+        self._sum_squares = 0.0
+        self.peak = 0.0
+        self.max_drawdown = 0.0
+
+    def record(self, equity: float) -> None:
+        if self.equity_curve:
+            previous = self.equity_curve[-1]
+            if previous > 0:
+                self._add_return(equity / previous - 1)
+        self.equity_curve.append(equity)
+
+        if equity > self.peak:
+            self.peak = equity
+        elif self.peak > 0:
+            drawdown = 1 - equity / self.peak
+            if drawdown > self.max_drawdown:
+                self.max_drawdown = drawdown
+
+    def _add_return(self, value: float) -> None:
+        self._returns.append(value)
+        bisect.insort(self._sorted_returns, value)
+        self._sum += value
+        self._sum_squares += value * value
+
+        if len(self._returns) > self.window:
+            old = self._returns.popleft()
+            del self._sorted_returns[bisect.bisect_left(self._sorted_returns, old)]
+            self._sum -= old
+            self._sum_squares -= old * old
+
+    @property
+    def samples(self) -> int:
+        return len(self._returns)
+
+    def mean_return(self) -> float:
+        return self._sum / len(self._returns) if self._returns else 0.0
+
+    def volatility(self) -> float:
+        """Стандартне відхилення денної дохідності у вікні"""
+        count = len(self._returns)
+        if count < 2:
+            return 0.0
+        variance = (self._sum_squares - self._sum * self._sum / count) / (count - 1)
+        return math.sqrt(max(variance, 0.0))
+
+    def sharpe(self) -> Optional[float]:
+        volatility = self.volatility()
+        if volatility == 0.0:
+            return None
+        return self.mean_return() / volatility * math.sqrt(PERIODS_PER_YEAR)
+
+    def historical_var(self) -> float:
+        """Денний VaR як частка вартості: збиток, який не перевищується з імовірністю VAR_CONFIDENCE"""
+        if not self._sorted_returns:
+            return 0.0
+        index = int((1 - VAR_CONFIDENCE) * len(self._sorted_returns))
+        return max(0.0, -self._sorted_returns[index])
+
+    def parametric_var(self) -> float:
+        """Денний VaR за припущення нормального розподілу дохідностей"""
+        if len(self._returns) < 2:
+            return 0.0
+        return max(0.0, VAR_Z_SCORE * self.volatility() - self.mean_return())
+
+    def current_drawdown(self) -> float:
+        if not self.equity_curve or self.peak <= 0:
+            return 0.0
+        return max(0.0, 1 - self.equity_curve[-1] / self.peak)
+
+    def snapshot(self) -> Dict:
+        equity = self.equity_curve[-1] if self.equity_curve else 0.0
+        return {
+            "equity": equity,
+            "samples": self.samples,
+            "volatility": self.volatility(),
+            "annual_volatility": self.volatility() * math.sqrt(PERIODS_PER_YEAR),
+            "sharpe": self.sharpe(),
+            "max_drawdown": self.max_drawdown,
+            "drawdown": self.current_drawdown(),
+            "var_historical": self.historical_var() * equity,
+            "var_parametric": self.parametric_var() * equity,
+        }
+
+
+class RiskAnalytics:
+    """Трекери ризику всіх гравців гри; оновлюються один раз за ігровий день"""
+
+    def __init__(self, window: int = RISK_WINDOW, curve_days: int = EQUITY_CURVE_DAYS):
+        self.window = window
+        self.curve_days = curve_days
+        self.trackers: Dict[int, RiskTracker] = {}
+
+    def tracker(self, player_id: int) -> RiskTracker:
+        tracker = self.trackers.get(player_id)
+        if tracker is None:
+            tracker = self.trackers[player_id] = RiskTracker(self.window, self.curve_days)
+        return tracker
+
+    def record(self, player_id: int, equity: float) -> None:
+        self.tracker(player_id).record(equity)
+
+    def record_day(self, players: Iterable['Player'], market: 'Market') -> None:
+        for player in players:
+            self.record(player.id, player.calculate_net_worth(market))
+
+    def snapshot(self, player_id: int) -> Optional[Dict]:
+        tracker = self.trackers.get(player_id)
+        return tracker.snapshot() if tracker else None
+
+    def summary(self) -> Dict[int, Dict]:
+        """Показники ризику всіх гравців одразу"""
+        return {player_id: tracker.snapshot() for player_id, tracker in self.trackers.items()}
@@ -0,0 +1,54 @@
+from abc import ABC, abstractmethod
+import sys
+from typing import Iterable, Iterator, Optional, TextIO
+
+
+class InputSource(ABC):
+    # Чи дублювати прочитану відповідь у вивід (термінал робить це сам)
+    echo = False
+
+    @abstractmethod
+    def read_line(self) -> str:
+        """Читання одного рядка вводу; EOFError, якщо ввід вичерпано"""
+        pass
+
+
+class ConsoleInput(InputSource):
+    def read_line(self) -> str:
+        return input()
+
+
+class ScriptedInput(InputSource):
+    """Ввід зі сценарію: списку, ітератора або файлу, по одній відповіді на рядок"""
+
+    echo = True
+
+    def __init__(self, lines: Iterable[str]):
+        self._lines: Iterator[str] = iter(lines)
+        self.consumed = 0
+
+    @classmethod
+    def from_file(cls, filename: str) -> 'ScriptedInput':
+        with open(filename, 'r', encoding='utf-8') as f:
+            lines = f.read().splitlines()
+        return cls(lines)
+
+    def read_line(self) -> str:
+        try:
+            line = next(self._lines)
+        except StopIteration:
+            raise EOFError("Сценарій вводу вичерпано")
+        self.consumed += 1
+        return line.rstrip("\r\n")
+
+
+def prompt(source: InputSource, text: str = "", output: Optional[TextIO] = None) -> str:
+    """Аналог input(): виводить запрошення і читає відповідь з джерела"""
+    stream = output or sys.stdout
+    stream.write(text)
+    stream.flush()
+
+    line = source.read_line()
+    if source.echo:
+        stream.write(line + "\n")
+    return line
@@ -1,6 +1,8 @@
-import os
-from typing import TYPE_CHECKING
+import sys
+from typing import Dict, Optional, TextIO, Tuple, TYPE_CHECKING
 
+from game.input_source import InputSource, ConsoleInput, prompt
+from game.renderer import TerminalRenderer, CLEAR_SCREEN
 from utils.enums import RumorType
 
 if TYPE_CHECKING:
@@ -8,12 +10,45 @@ if TYPE_CHECKING:
 
 
 class TextInterface:
-    def __init__(self, game: 'TradingGame'):
+    def __init__(self, game: 'TradingGame', input_source: Optional[InputSource] = None,
+                 output: Optional[TextIO] = None):
         self.game = game
-
-    @staticmethod
-    def clear_screen():
-        os.system('cls' if os.name == 'nt' else 'clear')
+        self.input_source = input_source or ConsoleInput()
+        self._output = output  # None - поточний sys.stdout
+        self.renderer = TerminalRenderer(stream=output)
+        self._asset_rows: Dict[int, Tuple[int, str]] = {}  # ID активу до (версія ціни, рядок)
+
+    @property
+    def output(self) -> TextIO:
+        return self._output or sys.stdout
+
+    def clear_screen(self) -> None:
+        print(CLEAR_SCREEN, end="", flush=True, file=self.output)
+        self.renderer.invalidate()
+
+    def _print(self, *args, **kwargs) -> None:
+        print(*args, file=self.output, **kwargs)
+        text = kwargs.get("sep", " ").join(str(arg) for arg in args) + kwargs.get("end", "\n")
+        self.renderer.note_output(text)
+
+    def _input(self, text: str = "") -> str:
+        self.renderer.note_output(text + "\n")
+        return prompt(self.input_source, text, self.output)
+
+    def _asset_row(self, asset) -> str:
+        cached = self._asset_rows.get(asset.id)
+        if cached is not None and cached[0] == asset.price_version:
+            return cached[1]
+
+        price_change = 0
+        if len(asset.price_history) > 1:
+            prev_price = asset.price_history[-2][1]
+            price_change = ((asset.current_price - prev_price) / prev_price) * 100
+
+        change_str = f"{price_change:+.2f}%"
+        row = f"{asset.name:<30} {asset.ticker:<10} ₴{asset.current_price:<10.2f} {change_str:>8}"
+        self._asset_rows[asset.id] = (asset.price_version, row)
+        return row
 
     def display_market(self) -> str:
         """Відображення стану ринку"""
@@ -23,16 +58,10 @@ class TextInterface:
                   f"{'НАЗВА':<30} {'ТІКЕР':<10} {'ЦІНА':<10} {'ЗМІНА':>8}", f"{'-' * 60}"]
 
         for asset in self.game.market.assets.values():
-            price_change = 0
-            if len(asset.price_history) > 1:
-                prev_price = asset.price_history[-2][1]
-                price_change = ((asset.current_price - prev_price) / prev_price) * 100
-
-            change_str = f"{price_change:+.2f}%"
-            output.append(f"{asset.name:<30} {asset.ticker:<10} ₴{asset.current_price:<10.2f} {change_str:>8}")
+            output.append(self._asset_row(asset))
 
         output.append("\nПОДІЇ:")
-        active_events = [e for e in self.game.market.events if e.is_active()]
+        active_events = self.game.market.events.active()
 
         if active_events:
             for event in active_events:
@@ -63,6 +92,7 @@ class TextInterface:
         player = self.game.players[player_index]
 
         net_worth = player.calculate_net_worth(self.game.market)
+        leaderboard = self.game.leaderboard
 
         output = [
             f"{'-' * 60}",
@@ -76,6 +106,10 @@ class TextInterface:
             f"{'-' * 60}"
         ]
 
+        if len(leaderboard) > 1 and player.id in leaderboard:
+            output.insert(6, f"МІСЦЕ В РЕЙТИНГУ: {leaderboard.rank(player.id)} з {len(leaderboard)} "
+                             f"(випереджає {leaderboard.percentile(player.id):.0f}% гравців)")
+
         if player.portfolio:
             for asset_id, quantity in player.portfolio.items():
                 if asset_id in self.game.market.assets:
@@ -88,14 +122,24 @@ class TextInterface:
         output.append("\nІНВЕСТИЦІЇ:")
         if player.investor_funds:
             for investor_id, amount in player.investor_funds.items():
-                investor_name = "Невідомий інвестор"
-                for investor in self.game.investors:
-                    if investor.id == investor_id:
-                        investor_name = investor.name
+                investor = self.game.get_investor(investor_id)
+                investor_name = investor.name if investor else "Невідомий інвестор"
                 output.append(f"- Від {investor_name}: ₴{amount:.2f}")
         else:
             output.append("- Немає залучених інвестицій")
 
+        output.append("\nРИЗИК:")
+        risk = self.game.analytics.snapshot(player.id)
+        if risk and risk["samples"] >= 2:
+            sharpe = f"{risk['sharpe']:.2f}" if risk["sharpe"] is not None else "-"
+            output.append(f"- Волатильність (річна): {risk['annual_volatility'] * 100:.1f}%   Шарп: {sharpe}")
+            output.append(f"- Макс. просідання: {risk['max_drawdown'] * 100:.1f}%   "
+                          f"Поточне: {risk['drawdown'] * 100:.1f}%")
+            output.append(f"- VaR 95% (1 день): історичний ₴{risk['var_historical']:.2f}, "
+                          f"параметричний ₴{risk['var_parametric']:.2f}")
+        else:
+            output.append("- Недостатньо даних (потрібно кілька ігрових днів)")
+
         output.append("\nПОВІДОМЛЕННЯ:")
         if player.notifications:
             for notification in player.notifications[-5:]:  # Останні 5 повідомлень
@@ -124,15 +168,15 @@ class TextInterface:
         player = self.game.players[player_index]
 
         if player.game_over:
-            print(f"{player.name} вибув з гри!")
+            self._print(f"{player.name} вибув з гри!")
             return True
 
         if choice == "1":
-            print("\nДоступні активи:")
+            self._print("\nДоступні активи:")
             for i, asset in enumerate(self.game.market.assets.values()):
-                print(f"{i + 1}. {asset.name} ({asset.ticker}): ₴{asset.current_price:.2f}")
+                self._print(f"{i + 1}. {asset.name} ({asset.ticker}): ₴{asset.current_price:.2f}")
 
-            asset_choice = input("Виберіть номер активу (або 0 для скасування): ")
+            asset_choice = self._input("Виберіть номер активу (або 0 для скасування): ")
             if asset_choice == "0" or not asset_choice.isdigit():
                 return False
 
@@ -141,9 +185,9 @@ class TextInterface:
                 asset = list(self.game.market.assets.values())[asset_index]
 
                 max_shares = int(player.capital / asset.current_price)
-                print(f"У вас є ₴{player.capital:.2f}. Ви можете купити до {max_shares} акцій.")
+                self._print(f"У вас є ₴{player.capital:.2f}. Ви можете купити до {max_shares} акцій.")
 
-                quantity_str = input(f"Скільки акцій {asset.ticker} ви хочете купити?: ")
+                quantity_str = self._input(f"Скільки акцій {asset.ticker} ви хочете купити?: ")
                 if not quantity_str.isdigit():
                     return False
 
@@ -159,17 +203,17 @@ class TextInterface:
                 )
 
                 if success:
-                    print(f"Успішно куплено {quantity} акцій {asset.ticker} за ₴{asset.current_price * quantity:.2f}")
+                    self._print(f"Успішно куплено {quantity} акцій {asset.ticker} за ₴{asset.current_price * quantity:.2f}")
                 else:
-                    print("Не вдалося виконати покупку. Перевірте, чи вистачає коштів.")
-                input("\nНатисніть Enter для продовження...")
+                    self._print("Не вдалося виконати покупку. Перевірте, чи вистачає коштів.")
+                self._input("\nНатисніть Enter для продовження...")
 
         elif choice == "2":
             if not player.portfolio:
-                print("У вас немає активів для продажу!")
+                self._print("У вас немає активів для продажу!")
                 return False
 
-            print("\nВаш портфель:")
+            self._print("\nВаш портфель:")
             portfolio_assets = []
 
             for i, (asset_id, quantity) in enumerate(player.portfolio.items()):
@@ -177,9 +221,9 @@ class TextInterface:
                     asset = self.game.market.assets[asset_id]
                     portfolio_assets.append(asset)
                     value = quantity * asset.current_price
-                    print(f"{i + 1}. {asset.name} ({asset.ticker}): {quantity} акцій = ₴{value:.2f}")
+                    self._print(f"{i + 1}. {asset.name} ({asset.ticker}): {quantity} акцій = ₴{value:.2f}")
 
-            asset_choice = input("Виберіть номер активу для продажу (або 0 для скасування): ")
+            asset_choice = self._input("Виберіть номер активу для продажу (або 0 для скасування): ")
             if asset_choice == "0" or not asset_choice.isdigit():
                 return False
 
@@ -188,7 +232,7 @@ class TextInterface:
                 asset = portfolio_assets[asset_index]
                 current_quantity = player.portfolio[asset.id]
 
-                quantity_str = input(f"Скільки акцій {asset.ticker} ви хочете продати? (У вас є {current_quantity}): ")
+                quantity_str = self._input(f"Скільки акцій {asset.ticker} ви хочете продати? (У вас є {current_quantity}): ")
                 if not quantity_str.isdigit():
                     return False
 
@@ -204,25 +248,25 @@ class TextInterface:
                 )
 
                 if success:
-                    print(f"Успішно продано {quantity} акцій {asset.ticker} за ₴{asset.current_price * quantity:.2f}")
+                    self._print(f"Успішно продано {quantity} акцій {asset.ticker} за ₴{asset.current_price * quantity:.2f}")
                 else:
-                    print("Не вдалося виконати продаж.")
-                input("\nНатисніть Enter для продовження...")
+                    self._print("Не вдалося виконати продаж.")
+                self._input("\nНатисніть Enter для продовження...")
 
         elif choice == "3":
             # Поширення чутки
-            print("\nПоширення чутки про актив")
-            print("Ваша репутація:", player.reputation)
+            self._print("\nПоширення чутки про актив")
+            self._print("Ваша репутація:", player.reputation)
 
             if player.reputation < 0.2:
-                print("Ваша репутація занадто низька, щоб поширювати чутки!")
+                self._print("Ваша репутація занадто низька, щоб поширювати чутки!")
                 return False
 
-            print("\nВиберіть актив для чутки:")
+            self._print("\nВиберіть актив для чутки:")
             for i, asset in enumerate(self.game.market.assets.values()):
-                print(f"{i + 1}. {asset.name} ({asset.ticker})")
+                self._print(f"{i + 1}. {asset.name} ({asset.ticker})")
 
-            asset_choice = input("Виберіть номер активу (або 0 для скасування): ")
+            asset_choice = self._input("Виберіть номер активу (або 0 для скасування): ")
             if asset_choice == "0" or not asset_choice.isdigit():
                 return False
 
@@ -230,11 +274,11 @@ class TextInterface:
             if 0 <= asset_index < len(self.game.market.assets):
                 asset = list(self.game.market.assets.values())[asset_index]
 
-                print("\nТип чутки:")
+                self._print("\nТип чутки:")
                 for i, rumor_type in enumerate(RumorType):
-                    print(f"{i + 1}. {rumor_type.value}")
+                    self._print(f"{i + 1}. {rumor_type.value}")
 
-                rumor_type_choice = input("Виберіть тип чутки: ")
+                rumor_type_choice = self._input("Виберіть тип чутки: ")
                 if not rumor_type_choice.isdigit():
                     return False
 
@@ -242,11 +286,11 @@ class TextInterface:
                 if 0 <= rumor_type_index < len(RumorType):
                     rumor_type = list(RumorType)[rumor_type_index]
 
-                    content = input("Введіть зміст чутки: ")
+                    content = self._input("Введіть зміст чутки: ")
                     if not content:
                         return False
 
-                    truth_choice = input("Це правдива чутка? (т/н): ").lower()
+                    truth_choice = self._input("Це правдива чутка? (т/н): ").lower()
                     is_true = truth_choice == "т"
 
                     success = self.game.player_turn(
@@ -259,20 +303,20 @@ class TextInterface:
                     )
 
                     if success:
-                        print(f"Чутка успішно поширена!")
+                        self._print(f"Чутка успішно поширена!")
                         if not is_true:
-                            print("УВАГА: Якщо ця неправдива чутка буде розкрита, ваша репутація постраждає!")
+                            self._print("УВАГА: Якщо ця неправдива чутка буде розкрита, ваша репутація постраждає!")
                     else:
-                        print("Не вдалося поширити чутку.")
-                    input("\nНатисніть Enter для продовження...")
+                        self._print("Не вдалося поширити чутку.")
+                    self._input("\nНатисніть Enter для продовження...")
 
         elif choice == "4":
             # Залучення інвестицій
             if not self.game.investors:
-                print("Немає доступних інвесторів!")
+                self._print("Немає доступних інвесторів!")
                 return False
 
-            print("\nДоступні інвестори:")
+            self._print("\nДоступні інвестори:")
             for i, investor in enumerate(self.game.investors):
                 satisfaction_status = "Дуже задоволений" if investor.satisfaction > 0.8 else \
                     "Задоволений" if investor.satisfaction > 0.5 else \
@@ -282,10 +326,10 @@ class TextInterface:
                     "Поміркований" if investor.risk_tolerance > 0.3 else \
                         "Консервативний"
 
-                print(f"{i + 1}. {investor.name}: ₴{investor.capital:.2f} доступно, "
+                self._print(f"{i + 1}. {investor.name}: ₴{investor.capital:.2f} доступно, "
                       f"Статус: {satisfaction_status}, Профіль ризику: {risk_profile}")
 
-            investor_choice = input("Виберіть номер інвестора (або 0 для скасування): ")
+            investor_choice = self._input("Виберіть номер інвестора (або 0 для скасування): ")
             if investor_choice == "0" or not investor_choice.isdigit():
                 return False
 
@@ -293,7 +337,7 @@ class TextInterface:
             if 0 <= investor_index < len(self.game.investors):
                 investor = self.game.investors[investor_index]
 
-                amount_str = input(f"Скільки ви хочете залучити від {investor.name}? "
+                amount_str = self._input(f"Скільки ви хочете залучити від {investor.name}? "
                                    f"(Доступно: ₴{investor.capital:.2f}): ")
                 try:
                     amount = float(amount_str)
@@ -311,30 +355,30 @@ class TextInterface:
                 )
 
                 if success:
-                    print(f"Успішно залучено ₴{amount:.2f} від {investor.name}!")
-                    print("УВАГА: Ви повинні будете повернути ці кошти інвестору в майбутньому.")
+                    self._print(f"Успішно залучено ₴{amount:.2f} від {investor.name}!")
+                    self._print("УВАГА: Ви повинні будете повернути ці кошти інвестору в майбутньому.")
                 else:
-                    print("Не вдалося залучити інвестиції.")
+                    self._print("Не вдалося залучити інвестиції.")
 
         elif choice == "5":
             # Повернення інвестицій
             if not player.investor_funds:
-                print("У вас немає залучених інвестицій для повернення!")
+                self._print("У вас немає залучених інвестицій для повернення!")
                 return False
 
-            print("\nЗалучені інвестиції:")
+            self._print("\nЗалучені інвестиції:")
             investors_data = []
 
             for i, (investor_id, amount) in enumerate(player.investor_funds.items()):
                 investor_name = "Невідомий інвестор"
-                for investor in self.game.investors:
-                    if investor.id == investor_id:
-                        investor_name = investor.name
-                        investors_data.append((investor, amount))
+                investor = self.game.get_investor(investor_id)
+                if investor is not None:
+                    investor_name = investor.name
+                    investors_data.append((investor, amount))
 
-                print(f"{i + 1}. {investor_name}: ₴{amount:.2f}")
+                self._print(f"{i + 1}. {investor_name}: ₴{amount:.2f}")
 
-            investor_choice = input("Виберіть номер інвестора для повернення коштів (або 0 для скасування): ")
+            investor_choice = self._input("Виберіть номер інвестора для повернення коштів (або 0 для скасування): ")
             if investor_choice == "0" or not investor_choice.isdigit():
                 return False
 
@@ -342,7 +386,7 @@ class TextInterface:
             if 0 <= investor_index < len(investors_data):
                 investor, total_amount = investors_data[investor_index]
 
-                amount_str = input(f"Скільки ви хочете повернути {investor.name}? "
+                amount_str = self._input(f"Скільки ви хочете повернути {investor.name}? "
                                    f"(Загальний борг: ₴{total_amount:.2f}): ")
                 try:
                     amount = float(amount_str)
@@ -360,9 +404,9 @@ class TextInterface:
                 )
 
                 if success:
-                    print(f"Успішно повернуто ₴{amount:.2f} інвестору {investor.name}!")
+                    self._print(f"Успішно повернуто ₴{amount:.2f} інвестору {investor.name}!")
                 else:
-                    print("Не вдалося повернути інвестиції.")
+                    self._print("Не вдалося повернути інвестиції.")
 
         elif choice == "6":
             # Наступний день
@@ -375,25 +419,26 @@ class TextInterface:
 
         elif choice == "7":
             # Збереження гри
-            filename = input("Введіть ім'я файлу для збереження: ")
+            filename = self._input("Введіть ім'я файлу для збереження: ")
             if not filename:
                 filename = "trading_game_save.json"
 
-            success = self.game.save_game(filename)
+            success = self.game.save_game(filename, self.output)
             if success:
-                print(f"Гра успішно збережена у файл {filename}")
+                self._print(f"Гра успішно збережена у файл {filename}")
             else:
-                print("Помилка при збереженні гри!")
+                self.renderer.invalidate()  # Опис помилки вивела гра, повз лічильник рядків під кадром
+                self._print("Помилка при збереженні гри!")
 
         elif choice == "0":
             # Вихід з гри
-            confirm = input("Ви впевнені, що хочете вийти з гри? (т/н): ").lower()
+            confirm = self._input("Ви впевнені, що хочете вийти з гри? (т/н): ").lower()
             if confirm == "т":
-                print("Дякуємо за гру!")
+                self._print("Дякуємо за гру!")
                 return True
 
         else:
-            print("Невідомий вибір!")
+            self._print("Невідомий вибір!")
 
         return False
 
@@ -403,19 +448,22 @@ class TextInterface:
         running = True
 
         while running and not self.game.game_over:
-            self.clear_screen()
-            print("\n" + "=" * 50)
-            print(self.display_market())
-
             # Перемикання між гравцями
             current_player_index = self.game.current_player_index
 
-            print(self.display_player_info(current_player_index))
+            # Перемальовуються лише рядки, що змінилися з попереднього ходу
+            frame = self.display_market() + "\n" + self.display_player_info(current_player_index)
+            self.renderer.render(frame.split("\n"))
 
             next_turn = False
             while not next_turn:
-                choice = input(self.display_menu())
-                next_turn = self.process_menu_choice(choice, current_player_index)
+                try:
+                    choice = self._input(self.display_menu())
+                    next_turn = self.process_menu_choice(choice, current_player_index)
+                except EOFError:
+                    # Ввід вичерпано (кінець сценарію або Ctrl+D) - завершуємо гру
+                    running = False
+                    break
 
                 if self.game.game_over:
                     running = False
@@ -430,22 +478,18 @@ class TextInterface:
 
         # Завершення гри
         if self.game.game_over:
-            print("\n=== ГРА ЗАКІНЧЕНА ===")
+            self._print("\n=== ГРА ЗАКІНЧЕНА ===")
 
-            # Рейтинг гравців за чистою вартістю
-            players_ranking = []
-            for player in self.game.players:
-                net_worth = player.calculate_net_worth(self.game.market)
+            # Рейтинг гравців за чистою вартістю - з підтримуваного інкрементно рейтингу
+            self.game.refresh_leaderboard()
+            players = {player.id: player for player in self.game.players}
+
+            self._print("\nРЕЙТИНГ ГРАВЦІВ:")
+            for i, (player_id, net_worth) in enumerate(self.game.leaderboard):
+                player = players[player_id]
                 status = "В'язниця" if player.prison else \
                     "Банкрут" if player.capital <= 0 else \
                         "Активний"
-                players_ranking.append((player, net_worth, status))
-
-            # Сортування за чистою вартістю у зворотному порядку
-            players_ranking.sort(key=lambda x: x[1], reverse=True)
-
-            print("\nРЕЙТИНГ ГРАВЦІВ:")
-            for i, (player, net_worth, status) in enumerate(players_ranking):
-                print(f"{i + 1}. {player.name}: Чиста вартість ₴{net_worth:.2f}, Статус: {status}")
+                self._print(f"{i + 1}. {player.name}: Чиста вартість ₴{net_worth:.2f}, Статус: {status}")
 
-            print("\nДякуємо за гру!")
+            self._print("\nДякуємо за гру!")
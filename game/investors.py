@@ -0,0 +1,82 @@
+"""
+Періодична оцінка інвесторів.
+
+Раз на кілька днів кожен інвестор порівнює прибутковість гравців, яких він
+фінансує, зі своїми очікуваннями. Дохідності гравців рахуються один раз із
+кривих вартості аналітики ризику, а зв'язки «інвестор - гравець» обходяться
+одним проходом по вкладеннях гравців, без вкладених циклів інвестори × гравці.
+Інвестори, чиє задоволення впало нижче порогу, масово вилучають вкладення.
+"""
+
+from typing import Dict, List, Tuple, TYPE_CHECKING
+
+from game.analytics import PERIODS_PER_YEAR
+
+if TYPE_CHECKING:
+    from game.trading_game import TradingGame
+    from models.player import Investor, Player
+
+EVALUATION_PERIOD = 5  # Днів між оцінками
+WITHDRAWAL_SATISFACTION = 0.2  # Нижче цього задоволення інвестор забирає гроші
+
+
+class InvestorEvaluator:
+    def __init__(self, period: int = EVALUATION_PERIOD, withdrawal_threshold: float = WITHDRAWAL_SATISFACTION):
+        self.period = period
+        self.withdrawal_threshold = withdrawal_threshold
+
+    def is_due(self, day: int) -> bool:
+        return day % self.period == 0
+
+    def player_returns(self, game: 'TradingGame') -> Dict[int, float]:
+        """Річна (лінійно масштабована) дохідність кожного гравця за останній період"""
+        returns = {}
+        for player in game.players:
+            tracker = game.analytics.trackers.get(player.id)
+            if tracker is None or len(tracker.equity_curve) < 2:
+                continue
+            curve = tracker.equity_curve
+            start = curve[max(0, len(curve) - 1 - self.period)]
+            if start > 0:
+                days = min(self.period, len(curve) - 1)
+                returns[player.id] = (curve[-1] / start - 1) * PERIODS_PER_YEAR / days
+        return returns
+
+    def evaluate(self, game: 'TradingGame') -> List[Tuple['Investor', 'Player', float]]:
+        """Оновлення задоволення всіх інвесторів; повертає здійснені вилучення"""
+        returns = self.player_returns(game)
+
+        # Один прохід по всіх вкладеннях: зважена за сумою дохідність на кожного інвестора
+        weighted: Dict[int, float] = {}
+        invested: Dict[int, float] = {}
+        funded: Dict[int, List[Tuple['Player', float]]] = {}
+        for player in game.players:
+            player_return = returns.get(player.id)
+            for investor_id, amount in player.investor_funds.items():
+                funded.setdefault(investor_id, []).append((player, amount))
+                if player_return is not None:
+                    weighted[investor_id] = weighted.get(investor_id, 0.0) + player_return * amount
+                    invested[investor_id] = invested.get(investor_id, 0.0) + amount
+
+        withdrawals = []
+        for investor_id, total in invested.items():
+            investor = game.get_investor(investor_id)
+            if investor is None or total <= 0:
+                continue
+            investor.update_satisfaction(weighted[investor_id] / total)
+
+            if investor.satisfaction < self.withdrawal_threshold:
+                withdrawals.extend(self._withdraw_all(investor, funded[investor_id]))
+
+        return withdrawals
+
+    def _withdraw_all(self, investor: 'Investor', positions: List[Tuple['Player', float]]
+                      ) -> List[Tuple['Investor', 'Player', float]]:
+        withdrawals = []
+        for player, amount in positions:
+            # Забирається все, що гравець може повернути вільною готівкою (без зарезервованої під ордери)
+            amount = min(amount, player.capital - player.committed_cash)
+            if amount > 0 and investor.withdraw(player, amount):
+                player.notifications.append(f"ІНВЕСТОР {investor.name} вилучив ₴{amount:.2f} через низьку прибутковість")
+                withdrawals.append((investor, player, amount))
+        return withdrawals
@@ -0,0 +1,185 @@
+"""
+Рейтинг гравців за чистою вартістю.
+
+Індексований список з пропусками (skip list): кожне посилання зберігає, скільки
+елементів воно перестрибує, тому оновлення вартості, місце гравця, перцентиль
+і перші K місць обчислюються за O(log n) (+K), без сортування всього списку.
+"""
+
+import random
+from typing import Dict, Iterator, List, Optional, Tuple
+
+MAX_LEVEL = 32
+LEVEL_PROBABILITY = 0.25
+
+
+class _Node:
+    def __init__(self, key: Optional[Tuple[float, int]], level: int):
+        self.key = key  # (-вартість, ID гравця): найбільша вартість - першою
+        self.next: List[Optional['_Node']] = [None] * level
+        self.span: List[int] = [0] * level  # Скільки позицій перестрибує кожне посилання
+
+
+class Leaderboard:
+    def __init__(self, seed: Optional[int] = None):
+        # Власний генератор, щоб рівні вузлів не зсували глобальну випадковість гри
+        self._rng = random.Random(seed)
+        self._clear()
+
+    def _clear(self) -> None:
+        self._head = _Node(None, MAX_LEVEL)
+        self._level = 1
+        self._size = 0
+        self._scores: Dict[int, float] = {}
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, player_id: int) -> bool:
+        return player_id in self._scores
+
+    def score(self, player_id: int) -> Optional[float]:
+        return self._scores.get(player_id)
+
+    def _random_level(self) -> int:
+        level = 1
+        while level < MAX_LEVEL and self._rng.random() < LEVEL_PROBABILITY:
+            level += 1
+        return level
+
+    def _insert(self, key: Tuple[float, int]) -> None:
+        update: List[_Node] = [self._head] * MAX_LEVEL
+        rank = [0] * MAX_LEVEL
+        node = self._head
+
+        for i in range(self._level - 1, -1, -1):
+            rank[i] = rank[i + 1] if i < self._level - 1 else 0
+            while node.next[i] is not None and node.next[i].key < key:
+                rank[i] += node.span[i]
+                node = node.next[i]
+            update[i] = node
+
+        level = self._random_level()
+        if level > self._level:
+            for i in range(self._level, level):
+                rank[i] = 0
+                update[i] = self._head
+                self._head.span[i] = self._size
+            self._level = level
+
+        new = _Node(key, level)
+        for i in range(level):
+            new.next[i] = update[i].next[i]
+            update[i].next[i] = new
+            new.span[i] = update[i].span[i] - (rank[0] - rank[i])
+            update[i].span[i] = rank[0] - rank[i] + 1
+
+        for i in range(level, self._level):
+            update[i].span[i] += 1
+        self._size += 1
+
+    def _delete(self, key: Tuple[float, int]) -> None:
+        update: List[_Node] = [self._head] * MAX_LEVEL
+        node = self._head
+        for i in range(self._level - 1, -1, -1):
+            while node.next[i] is not None and node.next[i].key < key:
+                node = node.next[i]
+            update[i] = node
+
+        target = update[0].next[0]
+        if target is None or target.key != key:
+            return
+
+        for i in range(self._level):
+            if update[i].next[i] is target:
+                update[i].span[i] += target.span[i] - 1
+                update[i].next[i] = target.next[i]
+            else:
+                update[i].span[i] -= 1
+
+        while self._level > 1 and self._head.next[self._level - 1] is None:
+            self._level -= 1
+        self._size -= 1
+
+    def update(self, player_id: int, score: float) -> None:
+        """Нова оцінка вартості гравця"""
+        score = float(score)
+        previous = self._scores.get(player_id)
+        if previous == score:
+            return
+        if previous is not None:
+            self._delete((-previous, player_id))
+        self._scores[player_id] = score
+        self._insert((-score, player_id))
+
+    def remove(self, player_id: int) -> None:
+        previous = self._scores.pop(player_id, None)
+        if previous is not None:
+            self._delete((-previous, player_id))
+
+    def rank(self, player_id: int) -> Optional[int]:
+        """Місце гравця (з 1) або None, якщо його немає в рейтингу"""
+        score = self._scores.get(player_id)
+        if score is None:
+            return None
+
+        key = (-score, player_id)
+        rank = 0
+        node = self._head
+        for i in range(self._level - 1, -1, -1):
+            while node.next[i] is not None and node.next[i].key <= key:
+                rank += node.span[i]
+                node = node.next[i]
+            if node.key == key:
+                return rank
+        return None
+
+    def percentile(self, player_id: int) -> Optional[float]:
+        """Частка інших гравців (у відсотках), яких гравець випереджає"""
+        rank = self.rank(player_id)
+        if rank is None:
+            return None
+        if self._size == 1:
+            return 100.0
+        return (self._size - rank) / (self._size - 1) * 100
+
+    def at_rank(self, rank: int) -> Optional[Tuple[int, float]]:
+        """Гравець на заданому місці (з 1)"""
+        if not 1 <= rank <= self._size:
+            return None
+
+        traversed = 0
+        node = self._head
+        for i in range(self._level - 1, -1, -1):
+            while node.next[i] is not None and traversed + node.span[i] <= rank:
+                traversed += node.span[i]
+                node = node.next[i]
+            if traversed == rank:
+                return node.key[1], -node.key[0]
+        return None
+
+    def top(self, count: int) -> List[Tuple[int, float]]:
+        result = []
+        node = self._head.next[0]
+        while node is not None and len(result) < count:
+            result.append((node.key[1], -node.key[0]))
+            node = node.next[0]
+        return result
+
+    def __iter__(self) -> Iterator[Tuple[int, float]]:
+        node = self._head.next[0]
+        while node is not None:
+            yield node.key[1], -node.key[0]
+            node = node.next[0]
+
+    def __getstate__(self):
+        # Ланцюжок вузлів не серіалізується напряму (pickle пішов би в глибоку рекурсію) -
+        # зберігаються лише оцінки, а список перебудовується під час відновлення
+        return {"scores": self._scores, "rng": self._rng.getstate()}
+
+    def __setstate__(self, state) -> None:
+        self._rng = random.Random()
+        self._rng.setstate(state["rng"])
+        self._clear()
+        for player_id, score in state["scores"].items():
+            self.update(player_id, score)
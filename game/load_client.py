@@ -0,0 +1,144 @@
+"""
+Генератор навантаження для game.server.
+
+Відкриває багато одночасних з'єднань, прив'язує кожне до гравця в одній із сесій
+і надсилає торгові команди, вимірюючи пропускну здатність і затримку відповідей.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from typing import Dict, List, Optional
+
+
+class LoadClient:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.latencies: List[float] = []
+        self.errors = 0
+
+    async def request(self, message: Dict) -> Dict:
+        started = time.perf_counter()
+        self.writer.write(json.dumps(message, ensure_ascii=False).encode('utf-8') + b"\n")
+
+        while True:
+            line = await self.reader.readline()
+            if not line:
+                raise ConnectionError("Сервер закрив з'єднання")
+            response = json.loads(line)
+            # Розсилки сервера про новий день пропускаємо
+            if "event" not in response:
+                break
+
+        self.latencies.append(time.perf_counter() - started)
+        if not response.get("ok"):
+            self.errors += 1
+        return response
+
+    async def close(self) -> None:
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+async def run_client(host: str, port: int, session_id: str, actions: int,
+                     connect_limit: asyncio.Semaphore) -> Optional[LoadClient]:
+    async with connect_limit:
+        reader, writer = await asyncio.open_connection(host, port)
+    client = LoadClient(reader, writer)
+
+    try:
+        joined = await client.request({"cmd": "join", "session": session_id})
+        if not joined.get("ok"):
+            return client
+
+        market = await client.request({"cmd": "market"})
+        tickers = [asset["ticker"] for asset in market.get("assets", [])]
+
+        for i in range(actions):
+            ticker = random.choice(tickers)
+            if i % 10 == 9:
+                await client.request({"cmd": "info"})
+            elif i % 2 == 0:
+                await client.request({"cmd": "action", "action": "buy", "ticker": ticker, "quantity": 1})
+            else:
+                await client.request({"cmd": "action", "action": "sell", "ticker": ticker, "quantity": 1})
+
+        await client.request({"cmd": "quit"})
+    except ConnectionError:
+        client.errors += 1
+    finally:
+        await client.close()
+
+    return client
+
+
+async def run_load(host: str, port: int, clients: int = 100, sessions: int = 10,
+                   actions: int = 50, scenario: str = "default", connect_concurrency: int = 200) -> Dict:
+    reader, writer = await asyncio.open_connection(host, port)
+    control = LoadClient(reader, writer)
+    session_ids = []
+    for _ in range(sessions):
+        created = await control.request({"cmd": "create", "scenario": scenario})
+        session_ids.append(created["session"])
+    await control.close()
+
+    connect_limit = asyncio.Semaphore(connect_concurrency)
+    started = time.perf_counter()
+    results = await asyncio.gather(*[
+        run_client(host, port, session_ids[i % sessions], actions, connect_limit)
+        for i in range(clients)
+    ], return_exceptions=True)
+    elapsed = time.perf_counter() - started
+
+    latencies = []
+    errors = 0
+    for result in results:
+        if isinstance(result, LoadClient):
+            latencies.extend(result.latencies)
+            errors += result.errors
+        else:
+            errors += 1
+    latencies.sort()
+
+    return {
+        "clients": clients,
+        "sessions": sessions,
+        "requests": len(latencies),
+        "errors": errors,
+        "elapsed_sec": elapsed,
+        "requests_per_sec": len(latencies) / elapsed if elapsed > 0 else 0.0,
+        "latency_p50_ms": percentile(latencies, 0.50) * 1000,
+        "latency_p99_ms": percentile(latencies, 0.99) * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Генератор навантаження для сервера гри")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--actions", type=int, default=50, help="команд на одного клієнта")
+    parser.add_argument("--scenario", default="default")
+    args = parser.parse_args()
+
+    report = asyncio.run(run_load(args.host, args.port, args.clients, args.sessions,
+                                  args.actions, args.scenario))
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
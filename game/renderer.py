@@ -0,0 +1,66 @@
+import shutil
+import sys
+from typing import List, Optional, TextIO
+
+CLEAR_SCREEN = "\033[H\033[2J"
+CLEAR_LINE = "\033[K"
+CLEAR_BELOW = "\033[J"
+
+
+def move_cursor(row: int) -> str:
+    # Рядки термінала нумеруються з 1
+    return f"\033[{row};1H"
+
+
+class TerminalRenderer:
+    """Перемальовує лише змінені рядки кадру через ANSI-послідовності, без виклику clear"""
+
+    def __init__(self, stream: Optional[TextIO] = None, height: Optional[int] = None):
+        self.stream = stream
+        self.height = height  # None - визначається за розміром термінала
+        self.previous_frame: Optional[List[str]] = None  # Видима частина останнього кадру
+        self.previous_height: Optional[int] = None
+        self.lines_below = 0  # Скільки рядків виведено під кадром після останнього малювання
+
+    def invalidate(self) -> None:
+        """Наступний кадр буде намальовано повністю"""
+        self.previous_frame = None
+
+    def note_output(self, text: str) -> None:
+        self.lines_below += text.count("\n")
+
+    def terminal_height(self) -> int:
+        if self.height is not None:
+            return self.height
+        return shutil.get_terminal_size().lines
+
+    def diff(self, lines: List[str]) -> str:
+        height = self.terminal_height()
+        # Кадр, вищий за екран, все одно видно лише знизу: малюються останні рядки, а під ними лишається
+        # місце для курсора і стільки рядків, скільки меню вивело минулого разу (не більше половини екрана)
+        reserved = min(self.lines_below, height // 2)
+        visible = max(1, height - 1 - reserved)
+        window = lines[-visible:]
+        previous = self.previous_frame
+
+        # Після зміни розміру термінала або прокручування виводом під кадром старі рядки вже не на своїх місцях
+        if (previous is None or height != self.previous_height
+                or len(previous) + self.lines_below >= height):
+            output = [CLEAR_SCREEN, "\n".join(window), "\n"]
+        else:
+            output = []
+            for row, line in enumerate(window):
+                if row >= len(previous) or previous[row] != line:
+                    output.append(f"{move_cursor(row + 1)}{line}{CLEAR_LINE}")
+            # Курсор під кадр і очищення старого меню та залишків довшого кадру
+            output.append(f"{move_cursor(len(window) + 1)}{CLEAR_BELOW}")
+
+        self.previous_frame = window
+        self.previous_height = height
+        self.lines_below = 0
+        return "".join(output)
+
+    def render(self, lines: List[str]) -> None:
+        stream = self.stream or sys.stdout
+        stream.write(self.diff(lines))
+        stream.flush()
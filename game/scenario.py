@@ -1,6 +1,25 @@
+import math
+import random
+from typing import Optional
+
 from patterns.builder import ScenarioBuilder
 from utils.enums import AssetType, EventType
 
+# Параметри генератора для кожного типу активу: префікс тікера та медіана ціни
+SYNTHETIC_ASSET_PROFILES = {
+    AssetType.STOCK: ("Компанія", "S", 120.0),
+    AssetType.CRYPTO: ("Токен", "C", 15.0),
+    AssetType.FOREX: ("Валютна пара", "FX", 30.0),
+    AssetType.COMMODITY: ("Сировина", "CM", 400.0),
+}
+
+SYNTHETIC_EVENT_TITLES = {
+    EventType.POLITICAL: ["Вибори", "Санкції", "Торговельна угода"],
+    EventType.ECONOMIC: ["Зміна ставки", "Звіт про ВВП", "Інфляційний шок"],
+    EventType.TECHNOLOGICAL: ["Технологічний прорив", "Кібератака", "Нове регулювання"],
+    EventType.COMPANY: ["Звіт про прибутки", "Злиття", "Відставка CEO"],
+}
+
 
 def create_default_scenario() -> ScenarioBuilder:
     """Створення стандартного сценарію гри"""
@@ -69,7 +88,11 @@ def create_default_scenario() -> ScenarioBuilder:
             "affected_assets": [assets_data[0]["ticker"], assets_data[8]["ticker"]]
         }
     ]
-    builder.add_events(events_data)
+    builder.add_events_by_ticker(events_data)
+
+    # Криптовалюти й гривневі пари рухаються разом
+    builder.set_correlation(market=0.2, asset_type=0.4,
+                            pairs=[("BTC", "ETH", 0.85), ("EUR/UAH", "USD/UAH", 0.9)])
 
     return builder
 
@@ -112,7 +135,7 @@ def create_hard_scenario() -> ScenarioBuilder:
             "affected_assets": [assets_data[4]["ticker"], assets_data[5]["ticker"]]
         }
     ]
-    builder.add_events(events_data)
+    builder.add_events_by_ticker(events_data)
 
     return builder
 
@@ -155,6 +178,61 @@ def create_multiplayer_scenario() -> ScenarioBuilder:
             "affected_assets": [assets_data[1]["ticker"]]
         }
     ]
+    builder.add_events_by_ticker(events_data)
+
+    return builder
+
+
+def create_synthetic_scenario(num_assets: int = 100_000, num_players: int = 10_000,
+                              num_investors: int = 1_000, num_events: int = 5_000,
+                              seed: Optional[int] = None) -> ScenarioBuilder:
+    """Генерація великого світу для навантажувальних тестів і бенчмарків"""
+    rng = random.Random(seed)
+    asset_types = list(AssetType)
+    event_types = list(EventType)
+
+    builder = ScenarioBuilder()
+    builder.create_market()
+
+    # Без явних ID: сутності отримують компактні цілі ID, псевдоніми uuid створюються лише на вимогу
+    assets_data = []
+    for i in range(num_assets):
+        asset_type = asset_types[i % len(asset_types)]
+        name, ticker_prefix, median_price = SYNTHETIC_ASSET_PROFILES[asset_type]
+        assets_data.append({
+            "type": asset_type,
+            "name": f"{name} {i}",
+            "ticker": f"{ticker_prefix}{i}",
+            "price": round(median_price * math.exp(rng.gauss(0.0, 1.0)), 4)
+        })
+    builder.add_assets(assets_data)
+
+    builder.add_players([
+        {"name": f"Трейдер {i}",
+         "capital": round(10000.0 * math.exp(rng.gauss(0.0, 0.5)), 2)}
+        for i in range(num_players)
+    ])
+
+    builder.add_investors([
+        {"name": f"Інвестор {i}",
+         "capital": round(rng.uniform(20000.0, 200000.0), 2), "risk_tolerance": round(rng.random(), 3)}
+        for i in range(num_investors)
+    ])
+
+    asset_ids = builder.market.asset_ids()
+    events_data = []
+    for i in range(num_events if num_assets else 0):
+        event_type = rng.choice(event_types)
+        title = rng.choice(SYNTHETIC_EVENT_TITLES[event_type])
+        affected = rng.sample(range(num_assets), min(num_assets, rng.randint(1, 5)))
+        events_data.append({
+            "type": event_type,
+            "title": title,
+            "description": f"{title}: подія згенерованого сценарію.",
+            "impact": round(rng.gauss(0.0, 5.0), 2),
+            "duration": rng.randint(1, 10),
+            "affected_assets": [asset_ids[index] for index in affected]
+        })
     builder.add_events(events_data)
 
     return builder
@@ -0,0 +1,292 @@
+"""
+Декларативні сценарії у файлах JSON/TOML.
+
+Файл перевіряється один раз і компілюється у бінарний знімок готового світу
+(pickle зібраного ScenarioBuilder), ключем якого є хеш вмісту файлу. Повторні
+запуски гри завантажують знімок замість розбору й побудови сценарію заново.
+Індекс метаданих дозволяє показати список сценаріїв, не розбираючи файли.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+from typing import Dict, List, Optional
+
+from patterns.builder import ScenarioBuilder
+from utils.enums import AssetType, EventType
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    tomllib = None
+
+SCENARIOS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scenarios")
+CACHE_DIR_NAME = ".cache"
+INDEX_FILE = "index.json"
+COMPILED_FORMAT = 2  # Збільшується при зміні формату знімка, щоб старий кеш не використовувався
+SCENARIO_EXTENSIONS = (".json", ".toml")
+
+
+class ScenarioError(ValueError):
+    pass
+
+
+def _require(data: Dict, field: str, types, where: str):
+    if field not in data:
+        raise ScenarioError(f"{where}: відсутнє поле '{field}'")
+    if not isinstance(data[field], types) or isinstance(data[field], bool):
+        raise ScenarioError(f"{where}: поле '{field}' має невірний тип")
+    return data[field]
+
+
+def _entries(spec: Dict, section: str, where: str) -> List[Dict]:
+    """Записи розділу-списку; кожен має бути об'єктом, інакше _require не зможе його перевірити"""
+    entries = spec.get(section, [])
+    if not isinstance(entries, list):
+        raise ScenarioError(f"Поле '{section}' має бути списком")
+    for i, entry in enumerate(entries):
+        if not isinstance(entry, dict):
+            raise ScenarioError(f"{where} {i + 1}: має бути об'єктом")
+    return entries
+
+
+def validate_spec(spec: Dict) -> None:
+    if not isinstance(spec, dict):
+        raise ScenarioError("Сценарій має бути об'єктом")
+
+    _require(spec, 'title', str, "Сценарій")
+
+    for i, player in enumerate(_entries(spec, 'players', "Гравець")):
+        _require(player, 'name', str, f"Гравець {i + 1}")
+        if _require(player, 'capital', (int, float), f"Гравець {i + 1}") <= 0:
+            raise ScenarioError(f"Гравець {i + 1}: капітал має бути додатним")
+
+    tickers = set()
+    for i, asset in enumerate(_entries(spec, 'assets', "Актив")):
+        where = f"Актив {i + 1}"
+        if _require(asset, 'type', str, where) not in AssetType.__members__:
+            raise ScenarioError(f"{where}: невідомий тип активу '{asset['type']}'")
+        _require(asset, 'name', str, where)
+        ticker = _require(asset, 'ticker', str, where)
+        if ticker in tickers:
+            raise ScenarioError(f"{where}: тікер '{ticker}' повторюється")
+        tickers.add(ticker)
+        if _require(asset, 'price', (int, float), where) <= 0:
+            raise ScenarioError(f"{where}: ціна має бути додатною")
+
+    if not tickers:
+        raise ScenarioError("Сценарій має містити хоча б один актив")
+
+    for i, investor in enumerate(_entries(spec, 'investors', "Інвестор")):
+        where = f"Інвестор {i + 1}"
+        _require(investor, 'name', str, where)
+        _require(investor, 'capital', (int, float), where)
+        if not 0.0 <= _require(investor, 'risk_tolerance', (int, float), where) <= 1.0:
+            raise ScenarioError(f"{where}: толерантність до ризику має бути від 0 до 1")
+
+    for i, event in enumerate(_entries(spec, 'events', "Подія")):
+        where = f"Подія {i + 1}"
+        if _require(event, 'type', str, where) not in EventType.__members__:
+            raise ScenarioError(f"{where}: невідомий тип події '{event['type']}'")
+        _require(event, 'title', str, where)
+        _require(event, 'description', str, where)
+        _require(event, 'impact', (int, float), where)
+        _require(event, 'duration', int, where)
+        for ticker in _require(event, 'affected_assets', list, where):
+            if not isinstance(ticker, str) or ticker not in tickers:
+                raise ScenarioError(f"{where}: невідомий тікер '{ticker}'")
+
+    if 'correlation' in spec:
+        _validate_correlation(spec['correlation'], tickers)
+
+    if 'social' in spec:
+        _validate_social(spec['social'])
+
+
+def _known_tickers(values: List, tickers: set) -> bool:
+    return all(isinstance(ticker, str) and ticker in tickers for ticker in values)
+
+
+def _validate_correlation(correlation: Dict, tickers: set) -> None:
+    where = "Кореляції"
+    if not isinstance(correlation, dict):
+        raise ScenarioError(f"{where}: мають бути об'єктом")
+    unknown = set(correlation) - {'market', 'asset_type', 'pairs', 'matrix'}
+    if unknown:
+        raise ScenarioError(f"{where}: невідомі поля {sorted(unknown)}")
+
+    for field in ('market', 'asset_type'):
+        if field in correlation and not 0.0 <= _require(correlation, field, (int, float), where) <= 1.0:
+            raise ScenarioError(f"{where}: '{field}' має бути від 0 до 1")
+
+    for pair in correlation.get('pairs', []):
+        if (not isinstance(pair, list) or len(pair) != 3 or not _known_tickers(pair[:2], tickers)
+                or not isinstance(pair[2], (int, float)) or not -1.0 <= pair[2] <= 1.0):
+            raise ScenarioError(f"{where}: пара має бути [тікер, тікер, кореляція від -1 до 1]")
+
+    if 'matrix' in correlation:
+        matrix = correlation['matrix']
+        if not isinstance(matrix, dict):
+            raise ScenarioError(f"{where}: матриця має бути об'єктом")
+        matrix_tickers = _require(matrix, 'tickers', list, where)
+        values = _require(matrix, 'values', list, where)
+        if not _known_tickers(matrix_tickers, tickers):
+            raise ScenarioError(f"{where}: матриця містить невідомий тікер")
+        size = len(matrix_tickers)
+        if len(values) != size or any(not isinstance(row, list) or len(row) != size for row in values):
+            raise ScenarioError(f"{where}: матриця має бути квадратною {size}x{size}")
+        for i in range(size):
+            for j in range(size):
+                if values[i][j] != values[j][i] or (i == j and values[i][j] != 1):
+                    raise ScenarioError(f"{where}: матриця має бути симетричною з одиницями на діагоналі")
+
+
+def _validate_social(social: Dict) -> None:
+    where = "Соціальна мережа"
+    if not isinstance(social, dict):
+        raise ScenarioError(f"{where}: має бути об'єктом")
+    unknown = set(social) - {'npcs', 'degree', 'seed', 'hop_decay'}
+    if unknown:
+        raise ScenarioError(f"{where}: невідомі поля {sorted(unknown)}")
+
+    if 'npcs' in social and _require(social, 'npcs', int, where) < 0:
+        raise ScenarioError(f"{where}: кількість NPC не може бути від'ємною")
+    if 'degree' in social and _require(social, 'degree', int, where) < 1:
+        raise ScenarioError(f"{where}: кожен вузол має мати хоча б одного слухача")
+    if 'seed' in social:
+        _require(social, 'seed', int, where)
+    if 'hop_decay' in social and not 0.0 < _require(social, 'hop_decay', (int, float), where) <= 1.0:
+        raise ScenarioError(f"{where}: 'hop_decay' має бути в межах (0, 1]")
+
+
+def parse_scenario(content: bytes, filename: str) -> Dict:
+    if filename.endswith(".toml"):
+        if tomllib is None:
+            raise ScenarioError("TOML-сценарії потребують Python 3.11+")
+        return tomllib.loads(content.decode('utf-8'))
+    return json.loads(content.decode('utf-8'))
+
+
+def scenario_metadata(spec: Dict) -> Dict:
+    return {
+        "title": spec['title'],
+        "description": spec.get('description', ""),
+        "players": len(spec.get('players', [])),
+        "assets": len(spec.get('assets', [])),
+        "events": len(spec.get('events', [])),
+    }
+
+
+class ScenarioLibrary:
+    def __init__(self, directory: str = SCENARIOS_DIR, cache_dir: Optional[str] = None):
+        self.directory = directory
+        self.cache_dir = cache_dir or os.path.join(directory, CACHE_DIR_NAME)
+        self._index: Optional[Dict[str, Dict]] = None
+
+    def _index_path(self) -> str:
+        return os.path.join(self.cache_dir, INDEX_FILE)
+
+    def _compiled_path(self, content_hash: str) -> str:
+        return os.path.join(self.cache_dir, f"{content_hash}.pickle")
+
+    @property
+    def index(self) -> Dict[str, Dict]:
+        if self._index is None:
+            try:
+                with open(self._index_path(), 'r', encoding='utf-8') as f:
+                    self._index = json.load(f)
+            except (OSError, ValueError):
+                self._index = {}
+        return self._index
+
+    def _save_index(self) -> None:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with open(self._index_path(), 'w', encoding='utf-8') as f:
+            json.dump(self.index, f, ensure_ascii=False, indent=2)
+
+    def compile(self, filename: str) -> Dict:
+        """Розбір, перевірка і компіляція файлу; повертає запис індексу"""
+        path = os.path.join(self.directory, filename)
+        with open(path, 'rb') as f:
+            content = f.read()
+
+        content_hash = hashlib.sha256(content + f"|{COMPILED_FORMAT}".encode()).hexdigest()
+        compiled_path = self._compiled_path(content_hash)
+
+        cached = self.index.get(filename)
+        if cached and cached["hash"] == content_hash and os.path.exists(compiled_path):
+            metadata = cached
+        else:
+            try:
+                spec = parse_scenario(content, filename)
+            except ValueError as e:
+                raise ScenarioError(f"{filename}: не вдалося розібрати файл ({e})")
+            validate_spec(spec)
+
+            builder = ScenarioBuilder()
+            builder.create_market()
+            try:
+                builder.load_spec(spec)
+            except ValueError as e:
+                raise ScenarioError(f"{filename}: {e}")
+
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(compiled_path, 'wb') as f:
+                pickle.dump(builder, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+            metadata = dict(scenario_metadata(spec), hash=content_hash)
+
+        stat = os.stat(path)
+        metadata = dict(metadata, mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+        self.index[filename] = metadata
+        self._save_index()
+        return metadata
+
+    def list_scenarios(self) -> List[Dict]:
+        """Список сценаріїв; файли, що не змінилися (розмір і час зміни), не розбираються"""
+        if not os.path.isdir(self.directory):
+            return []
+
+        scenarios = []
+        seen = set()
+        for entry in sorted(os.scandir(self.directory), key=lambda e: e.name):
+            if not entry.is_file() or not entry.name.endswith(SCENARIO_EXTENSIONS):
+                continue
+            seen.add(entry.name)
+
+            stat = entry.stat()
+            metadata = self.index.get(entry.name)
+            if not metadata or metadata["mtime_ns"] != stat.st_mtime_ns or metadata["size"] != stat.st_size:
+                try:
+                    metadata = self.compile(entry.name)
+                except ScenarioError:
+                    continue
+            scenarios.append(dict(metadata, file=entry.name))
+
+        # Записи про видалені файли прибираються з індексу
+        stale = [name for name in self.index if name not in seen]
+        if stale:
+            for name in stale:
+                del self.index[name]
+            self._save_index()
+
+        return scenarios
+
+    def load(self, filename: str) -> ScenarioBuilder:
+        """Будівельник зі світом сценарію: кожен виклик дає нові незалежні об'єкти"""
+        metadata = self.index.get(filename)
+        path = os.path.join(self.directory, filename)
+        stat = os.stat(path)
+
+        if not metadata or metadata["mtime_ns"] != stat.st_mtime_ns or metadata["size"] != stat.st_size:
+            metadata = self.compile(filename)
+
+        try:
+            with open(self._compiled_path(metadata["hash"]), 'rb') as f:
+                return pickle.load(f)
+        except OSError:
+            # Кеш видалено - компілюємо заново
+            metadata = self.compile(filename)
+            with open(self._compiled_path(metadata["hash"]), 'rb') as f:
+                return pickle.load(f)
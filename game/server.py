@@ -0,0 +1,473 @@
+"""
+Мережевий сервер гри: багато одночасних сесій TradingGame в одному процесі.
+
+Протокол - JSON-об'єкт на рядок (line-delimited JSON) поверх TCP.
+Запит: {"cmd": "...", ...}; відповідь: {"ok": true/false, ...}.
+Дні в усіх сесіях просуває серверний годинник, а не гравці.
+"""
+
+import argparse
+import asyncio
+from itertools import chain
+import json
+import math
+import secrets
+import uuid
+from typing import Callable, Dict, List, Optional
+
+from game.trading_game import TradingGame
+from game.session_pool import SessionPool
+from game.scenario import create_default_scenario, create_hard_scenario, create_multiplayer_scenario
+from patterns.builder import ScenarioBuilder
+from utils.enums import RumorType
+from utils.ids import alias_index
+from utils.instrumentation import Instrumentation
+from utils.metrics import MetricsRegistry, MetricsSink, REGISTRY
+
+SCENARIOS: Dict[str, Callable[[], ScenarioBuilder]] = {
+    "default": create_default_scenario,
+    "hard": create_hard_scenario,
+    "multiplayer": create_multiplayer_scenario,
+}
+
+TRADE_ACTIONS = ("buy", "sell", "short", "cover")
+MAX_LINE_LENGTH = 64 * 1024
+MAX_PENDING_WRITE = 256 * 1024  # Повільним клієнтам не шлемо розсилки, поки буфер не спорожніє
+MAX_LEADERBOARD_TOP = 100
+GAUGE_INTERVAL = 1.0  # Секунд між знімками датчиків для потоку HTTP-метрик
+
+
+class GameSession:
+    def __init__(self, session_id: str, scenario: str, game: TradingGame, pool: SessionPool):
+        self.id = session_id
+        self.scenario = scenario
+        self.pool = pool
+        self.connections: Dict[int, 'ClientConnection'] = {}  # Індекс гравця до з'єднання
+        self.tokens: Dict[int, str] = {}  # Індекс гравця до токена клієнта, який його зайняв
+        self.tickers = {asset.ticker: asset.id for asset in game.market.assets.values()}
+        self.aliases: Dict[str, int] = {}  # Зовнішній псевдонім активу або інвестора до цілого ID
+        game.market.clock.enable_wall_time()  # Для журналу сесії: коли в реальному часі настав кожен ігровий день
+        pool.put(session_id, game)
+
+    @property
+    def game(self) -> TradingGame:
+        # Гра може бути витіснена на диск - пул відновить її прозоро
+        return self.pool.get(self.id)
+
+    def resolve(self, game: TradingGame, alias) -> Optional[int]:
+        """Цілий ID активу або інвестора за псевдонімом, який клієнт отримав від сервера"""
+        if alias is None:
+            return None
+        entity_id = self.aliases.get(alias)
+        if entity_id is None:
+            # Псевдоніми з'являються на вимогу - індекс перебудовується, коли трапляється невідомий
+            self.aliases = alias_index(chain(game.market.assets.values(), game.investors))
+            entity_id = self.aliases.get(alias)
+        return entity_id
+
+    def free_player_index(self, game: TradingGame) -> Optional[int]:
+        for index, player in enumerate(game.players):
+            if index not in self.connections and index not in self.tokens and not player.game_over:
+                return index
+        return None
+
+
+class ClientConnection:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.session: Optional[GameSession] = None
+        self.player_index: Optional[int] = None
+
+    def send(self, message: Dict) -> None:
+        self.writer.write(json.dumps(message, ensure_ascii=False).encode('utf-8') + b"\n")
+
+    def unbind(self) -> None:
+        if self.session is not None and self.player_index is not None:
+            self.session.connections.pop(self.player_index, None)
+            if not self.session.connections:
+                self.session.pool.unpin(self.session.id)
+        self.session = None
+        self.player_index = None
+
+
+class GameServer:
+    def __init__(self, host: str = "127.0.0.1", port: int = 8765, day_interval: float = 5.0,
+                 default_capital: float = 10000.0, session_pool: Optional[SessionPool] = None,
+                 metrics: Optional[MetricsRegistry] = None):
+        self.host = host
+        self.port = port
+        self.day_interval = day_interval  # Секунд реального часу на один ігровий день
+        self.default_capital = default_capital
+        self.sessions: Dict[str, GameSession] = {}
+        self.pool = session_pool if session_pool is not None else SessionPool()
+        self.connections: List[ClientConnection] = []
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._clock_task: Optional[asyncio.Task] = None
+        self._gauge_task: Optional[asyncio.Task] = None
+        self._gauge_values: Dict[str, float] = {}  # Знімок стану сервера, зроблений у потоці циклу подій
+
+        self.metrics = metrics
+        if metrics is not None:
+            self._register_gauges(metrics)
+
+    def _register_gauges(self, metrics: MetricsRegistry) -> None:
+        # Датчики читає потік HTTP-сервера метрик, тому вони бачать лише готовий знімок,
+        # а не словники, які паралельно змінює цикл подій
+        for name, help_text in (
+            ("sessions", "Усі сесії на сервері."),
+            ("active_sessions", "Сесії з підключеними гравцями."),
+            ("connections", "Відкриті з'єднання."),
+            ("resident_sessions", "Ігри в пам'яті."),
+            ("memory_per_game_bytes", "Оцінка пам'яті на одну гру в пам'яті."),
+            ("pool_hits", "Звернення до гри, що була в пам'яті."),
+            ("pool_misses", "Відновлення гри з диска."),
+            ("pool_evictions", "Витіснення гри на диск."),
+        ):
+            metrics.gauge(name, lambda name=name: self._gauge_values.get(name, 0.0), help_text)
+
+    def refresh_gauges(self) -> None:
+        """Знімок значень датчиків; викликається лише з потоку циклу подій"""
+        stats = self.pool.stats()
+        # Новий словник підміняється одним присвоєнням - потік метрик не бачить його напівзаповненим
+        self._gauge_values = {
+            "sessions": len(self.sessions),
+            "active_sessions": sum(1 for s in self.sessions.values() if s.connections),
+            "connections": len(self.connections),
+            "resident_sessions": stats["resident"],
+            "memory_per_game_bytes": stats["resident_bytes"] / max(1, stats["resident"]),
+            "pool_hits": stats["hits"],
+            "pool_misses": stats["misses"],
+            "pool_evictions": stats["evictions"],
+        }
+
+    async def _run_gauges(self) -> None:
+        while True:
+            self.refresh_gauges()
+            await asyncio.sleep(GAUGE_INTERVAL)
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(
+            self._handle_client, self.host, self.port, backlog=4096, limit=MAX_LINE_LENGTH
+        )
+        # Порт 0 означає вибір вільного порту системою
+        self.port = self._server.sockets[0].getsockname()[1]
+        if self.day_interval > 0:
+            self._clock_task = asyncio.create_task(self._run_clock())
+        if self.metrics is not None:
+            self._gauge_task = asyncio.create_task(self._run_gauges())
+
+    async def stop(self) -> None:
+        for task in (self._clock_task, self._gauge_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._clock_task = None
+        self._gauge_task = None
+
+        if self._server:
+            self._server.close()
+            for connection in list(self.connections):
+                connection.writer.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def serve_forever(self) -> None:
+        await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.stop()
+
+    def create_session(self, scenario: str = "default") -> GameSession:
+        if scenario not in SCENARIOS:
+            raise ValueError(f"Невідомий сценарій: {scenario}")
+
+        game = TradingGame(SCENARIOS[scenario]())
+        if self.metrics is not None:
+            game.set_instrumentation(Instrumentation(MetricsSink(self.metrics)))
+        game.start_game()
+
+        session = GameSession(uuid.uuid4().hex, scenario, game, self.pool)
+        self.sessions[session.id] = session
+        return session
+
+    def advance_session(self, session: GameSession) -> None:
+        # Сесії без підключених гравців стоять на паузі і можуть лежати на диску
+        if not session.connections:
+            return
+
+        game = session.game
+        if game.game_over:
+            return
+
+        game.next_day()
+        self.pool.refresh_size(session.id)
+
+        message = {"event": "day", "session": session.id, "day": game.market.day,
+                   "market_state": game.market.current_state.get_name(), "game_over": game.game_over}
+        for connection in session.connections.values():
+            if connection.writer.transport.get_write_buffer_size() < MAX_PENDING_WRITE:
+                connection.send(message)
+
+    async def advance_all(self) -> None:
+        for index, session in enumerate(list(self.sessions.values())):
+            self.advance_session(session)
+            # Віддаємо керування циклу подій, щоб не блокувати обробку команд
+            if index % 16 == 15:
+                await asyncio.sleep(0)
+
+    async def _run_clock(self) -> None:
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time() + self.day_interval
+        while True:
+            await asyncio.sleep(max(0.0, next_tick - loop.time()))
+            next_tick += self.day_interval
+            await self.advance_all()
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        connection = ClientConnection(reader, writer)
+        self.connections.append(connection)
+
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (asyncio.LimitOverrunError, ValueError):
+                    connection.send({"ok": False, "error": "Занадто довгий запит"})
+                    break
+
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+
+                request = {}
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        request = {}
+                        raise ValueError("Запит має бути JSON-об'єктом")
+                    response = self.handle_request(connection, request)
+                except (ValueError, KeyError, TypeError) as e:
+                    response = {"ok": False, "error": str(e)}
+
+                # Клієнт може передати id запиту, щоб зіставляти відповіді
+                if "id" in request:
+                    response["id"] = request["id"]
+                connection.send(response)
+
+                if response.get("bye"):
+                    break
+
+                if writer.transport.get_write_buffer_size() > MAX_PENDING_WRITE:
+                    await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            connection.unbind()
+            self.connections.remove(connection)
+            writer.close()
+
+    def handle_request(self, connection: ClientConnection, request: Dict) -> Dict:
+        cmd = request.get("cmd")
+
+        if cmd == "create":
+            session = self.create_session(request.get("scenario", "default"))
+            return {"ok": True, "session": session.id, "players": len(session.game.players)}
+
+        elif cmd == "pool":
+            return {"ok": True, **self.pool.stats()}
+
+        elif cmd == "sessions":
+            # Витіснені сесії не відновлюємо заради списку
+            return {"ok": True, "sessions": [
+                {"session": s.id, "scenario": s.scenario, "connected": len(s.connections),
+                 "resident": self.pool.is_resident(s.id)}
+                for s in self.sessions.values()
+            ]}
+
+        elif cmd == "join":
+            return self._join(connection, request)
+
+        elif cmd == "quit":
+            connection.unbind()
+            return {"ok": True, "bye": True}
+
+        # Решта команд потребує прив'язаного гравця
+        if connection.session is None:
+            return {"ok": False, "error": "Спочатку приєднайтеся до сесії"}
+
+        game = connection.session.game
+
+        if cmd == "market":
+            return {
+                "ok": True,
+                "day": game.market.day,
+                "market_state": game.market.current_state.get_name(),
+                "assets": [{"id": a.alias, "ticker": a.ticker, "name": a.name, "price": a.current_price}
+                           for a in game.market.assets.values()]
+            }
+
+        elif cmd == "info":
+            player = game.players[connection.player_index]
+            notifications = player.notifications
+            player.notifications = []
+            return {
+                "ok": True,
+                "name": player.name,
+                "capital": player.capital,
+                "net_worth": player.calculate_net_worth(game.market),
+                "reputation": player.reputation,
+                "portfolio": {game.market.assets[asset_id].alias: quantity
+                              for asset_id, quantity in player.portfolio.items() if asset_id in game.market.assets},
+                "investor_funds": {game.get_investor(investor_id).alias: amount
+                                   for investor_id, amount in player.investor_funds.items()
+                                   if game.get_investor(investor_id) is not None},
+                "game_over": player.game_over,
+                "notifications": notifications
+            }
+
+        elif cmd == "risk":
+            # Показники ризику всіх гравців сесії одним запитом
+            names = {player.id: player.name for player in game.players}
+            return {"ok": True, "day": game.market.day, "players": [
+                dict(snapshot, name=names.get(player_id)) for player_id, snapshot in game.analytics.summary().items()
+            ]}
+
+        elif cmd == "leaderboard":
+            leaderboard = game.leaderboard
+            player = game.players[connection.player_index]
+            names = {p.id: p.name for p in game.players}
+            try:
+                count = int(request.get("top", 10))
+            except (TypeError, ValueError, OverflowError):
+                return {"ok": False, "error": "Параметр top має бути цілим числом"}
+            top = leaderboard.top(max(1, min(count, MAX_LEADERBOARD_TOP)))
+            return {
+                "ok": True,
+                "top": [{"name": names.get(player_id), "net_worth": score} for player_id, score in top],
+                "rank": leaderboard.rank(player.id),
+                "percentile": leaderboard.percentile(player.id),
+                "players": len(leaderboard)
+            }
+
+        elif cmd == "action":
+            return self._action(connection, game, request)
+
+        return {"ok": False, "error": f"Невідома команда: {cmd}"}
+
+    def _join(self, connection: ClientConnection, request: Dict) -> Dict:
+        session = self.sessions.get(request.get("session"))
+        if session is None:
+            return {"ok": False, "error": "Сесію не знайдено"}
+
+        player_index = request.get("player")
+        if player_index is not None and (not isinstance(player_index, int) or isinstance(player_index, bool)):
+            return {"ok": False, "error": "Індекс гравця має бути цілим числом"}
+
+        game = session.game
+        if player_index is not None:
+            # Перевірки до будь-яких змін стану: невдалий запит не відв'язує з'єднання
+            if not 0 <= player_index < len(game.players):
+                return {"ok": False, "error": "Невірний індекс гравця"}
+            if session.connections.get(player_index, connection) is not connection:
+                return {"ok": False, "error": "Гравець вже зайнятий іншим з'єднанням"}
+            token = session.tokens.get(player_index)
+            if token is not None and not secrets.compare_digest(str(request.get("token", "")), token):
+                return {"ok": False, "error": "Гравця вже зайняв інший клієнт"}
+
+        connection.unbind()
+        if player_index is None:
+            player_index = session.free_player_index(game)
+        if player_index is None:
+            # Стартовий капітал задає сервер, а не клієнт
+            player_index = game.add_player(request.get("name", f"Гравець {len(game.players) + 1}"),
+                                           self.default_capital)
+
+        # Токен підтверджує право повернутися до гравця після розриву з'єднання
+        token = session.tokens.setdefault(player_index, secrets.token_hex(16))
+        session.connections[player_index] = connection
+        self.pool.pin(session.id)
+        connection.session = session
+        connection.player_index = player_index
+
+        player = game.players[player_index]
+        return {"ok": True, "session": session.id, "player": player_index, "name": player.name, "token": token}
+
+    def _action(self, connection: ClientConnection, game: TradingGame, request: Dict) -> Dict:
+        # Гру передає handle_request: кожне звернення до session.game - це звернення до пулу
+        session = connection.session
+        action = request.get("action")
+        kwargs = {}
+
+        if action in TRADE_ACTIONS or action == "spread_rumor":
+            asset_id = session.resolve(game, request.get("asset_id"))
+            if asset_id is None:
+                asset_id = session.tickers.get(request.get("ticker"))
+            kwargs["asset_id"] = asset_id
+
+        if action in TRADE_ACTIONS:
+            kwargs["quantity"] = float(request.get("quantity", 0))
+            if not _is_positive(kwargs["quantity"]):
+                return {"ok": False, "error": "Кількість має бути додатною"}
+
+        elif action == "spread_rumor":
+            kwargs["rumor_type"] = RumorType[request.get("rumor_type", RumorType.MARKET_SENTIMENT.name)]
+            kwargs["content"] = str(request.get("content", ""))
+            kwargs["is_true"] = bool(request.get("is_true", False))
+
+        elif action in ("get_investment", "return_investment"):
+            kwargs["investor_id"] = session.resolve(game, request.get("investor_id"))
+            kwargs["amount"] = float(request.get("amount", 0))
+            if not _is_positive(kwargs["amount"]):
+                return {"ok": False, "error": "Сума має бути додатною"}
+
+        else:
+            return {"ok": False, "error": f"Невідома дія: {action}"}
+
+        result = game.player_turn(connection.player_index, action, **kwargs)
+        player = game.players[connection.player_index]
+        return {"ok": True, "result": result, "capital": player.capital}
+
+
+def _is_positive(value: float) -> bool:
+    # JSON допускає NaN та Infinity, а float() - рядки на кшталт "1e999"
+    return math.isfinite(value) and value > 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Сервер біржового симулятора")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--day-interval", type=float, default=5.0,
+                        help="секунд між ігровими днями (0 - вимкнути годинник)")
+    parser.add_argument("--memory-budget", type=int, default=None,
+                        help="бюджет пам'яті для ігор у байтах; неактивні ігри витісняються на диск")
+    parser.add_argument("--storage-dir", default=None, help="каталог для знімків витіснених ігор")
+    parser.add_argument("--metrics-port", type=int, default=None,
+                        help="порт HTTP-ендпоінта /metrics у форматі Prometheus")
+    args = parser.parse_args()
+
+    pool = SessionPool(args.memory_budget, args.storage_dir)
+    metrics = REGISTRY if args.metrics_port is not None else None
+    server = GameServer(args.host, args.port, args.day_interval, session_pool=pool, metrics=metrics)
+
+    if metrics is not None:
+        from game.metrics_server import MetricsServer
+
+        MetricsServer(metrics, args.host, args.metrics_port).start()
+        print(f"Метрики: http://{args.host}:{args.metrics_port}/metrics")
+
+    print(f"Сервер запущено на {args.host}:{args.port}")
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        print("\nСервер зупинено.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""
+Пул ігрових сесій з бюджетом пам'яті.
+
+Неактивні ігри витісняються на диск за принципом LRU (найдавніше використана - першою)
+і прозоро відновлюються при наступному зверненні.
+"""
+
+import os
+import pickle
+import tempfile
+from collections import OrderedDict
+from typing import Dict, Optional, Set, TYPE_CHECKING
+
+from utils.instrumentation import NULL_INSTRUMENTATION
+
+if TYPE_CHECKING:
+    from game.trading_game import TradingGame
+    from utils.instrumentation import Instrumentation
+
+# Приблизна вартість об'єктів у байтах для оцінки розміру гри без обходу графа об'єктів
+BASE_GAME_BYTES = 4096
+ASSET_BYTES = 800
+PRICE_POINT_BYTES = 120
+CANDLE_BYTES = 100
+EVENT_BYTES = 700
+RUMOR_BYTES = 900
+PLAYER_BYTES = 1500
+POSITION_BYTES = 150
+TRADE_BYTES = 200
+NOTIFICATION_BYTES = 150
+RISK_POINT_BYTES = 40
+
+
+def estimate_game_size(game: 'TradingGame') -> int:
+    """Оцінка обсягу пам'яті, який займає гра"""
+    market = game.market
+    size = BASE_GAME_BYTES
+
+    for asset in market.assets.values():
+        size += ASSET_BYTES + len(asset.price_history) * PRICE_POINT_BYTES
+        size += asset.history.bar_count() * CANDLE_BYTES
+
+    # Завершені події й чутки вже лежать у масивах сховищ, об'єктами лишаються лише живі
+    size += market.events.nbytes() + market.events.live_count * EVENT_BYTES + len(game.story_events) * EVENT_BYTES
+    size += market.rumors.nbytes() + market.rumors.live_count * RUMOR_BYTES
+
+    for player in game.players:
+        size += PLAYER_BYTES
+        size += (len(player.portfolio) + len(player.short_positions) + len(player.investor_funds)) * POSITION_BYTES
+        size += len(player.trade_history) * TRADE_BYTES
+        size += len(player.notifications) * NOTIFICATION_BYTES
+
+    for tracker in game.analytics.trackers.values():
+        size += (len(tracker.equity_curve) + 2 * tracker.samples) * RISK_POINT_BYTES
+
+    return size
+
+
+class SessionPool:
+    def __init__(self, memory_budget: Optional[int] = None, storage_dir: Optional[str] = None):
+        self.memory_budget = memory_budget  # None - без обмеження, ігри не витісняються
+        self._storage_dir = storage_dir
+        self._resident: 'OrderedDict[str, TradingGame]' = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._evicted: Set[str] = set()
+        self._pinned: Set[str] = set()
+        # Інструментування витіснених ігор: сінки тримають реєстр метрик сервера і в знімок не потрапляють
+        self._instrumentation: Dict[str, 'Instrumentation'] = {}
+        self.resident_bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def storage_dir(self) -> str:
+        if self._storage_dir is None:
+            self._storage_dir = tempfile.mkdtemp(prefix="trading_sessions_")
+        os.makedirs(self._storage_dir, exist_ok=True)
+        return self._storage_dir
+
+    def _snapshot_path(self, session_id: str) -> str:
+        return os.path.join(self.storage_dir, f"{session_id}.pickle")
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._resident or session_id in self._evicted
+
+    def __len__(self) -> int:
+        return len(self._resident) + len(self._evicted)
+
+    def is_resident(self, session_id: str) -> bool:
+        return session_id in self._resident
+
+    def put(self, session_id: str, game: 'TradingGame') -> None:
+        if session_id in self._evicted:
+            self._evicted.discard(session_id)
+            os.remove(self._snapshot_path(session_id))
+
+        self._resident[session_id] = game
+        self._resident.move_to_end(session_id)
+        self._update_size(session_id)
+        self._enforce_budget()
+
+    def get(self, session_id: str) -> 'TradingGame':
+        if session_id in self._resident:
+            self.hits += 1
+            self._resident.move_to_end(session_id)
+            return self._resident[session_id]
+
+        if session_id not in self._evicted:
+            raise KeyError(session_id)
+
+        # Промах: відновлення гри зі знімка на диску
+        self.misses += 1
+        path = self._snapshot_path(session_id)
+        with open(path, 'rb') as f:
+            game = pickle.load(f)
+        os.remove(path)
+        self._evicted.discard(session_id)
+        instrumentation = self._instrumentation.pop(session_id, None)
+        if instrumentation is not None:
+            game.set_instrumentation(instrumentation)
+
+        self._resident[session_id] = game
+        self._update_size(session_id)
+        self._enforce_budget()
+        return game
+
+    def remove(self, session_id: str) -> None:
+        if session_id in self._resident:
+            del self._resident[session_id]
+            self.resident_bytes -= self._sizes.pop(session_id, 0)
+        elif session_id in self._evicted:
+            self._evicted.discard(session_id)
+            os.remove(self._snapshot_path(session_id))
+        self._instrumentation.pop(session_id, None)
+        self._pinned.discard(session_id)
+
+    def pin(self, session_id: str) -> None:
+        """Закріплені сесії (з активними гравцями) не витісняються"""
+        self._pinned.add(session_id)
+
+    def unpin(self, session_id: str) -> None:
+        self._pinned.discard(session_id)
+
+    def refresh_size(self, session_id: str) -> None:
+        """Переоцінка розміру гри після змін (наприклад, нового дня)"""
+        if session_id in self._resident:
+            self._update_size(session_id)
+            self._enforce_budget()
+
+    def evict(self, session_id: str) -> None:
+        game = self._resident[session_id]
+        path = self._snapshot_path(session_id)
+
+        # Знімок пишеться в тимчасовий файл і атомарно підміняє старий: обірваний запис
+        # не залишає битого файлу, а гра лишається в пам'яті, доки знімок не збережено
+        fd, temp_path = tempfile.mkstemp(prefix=f"{session_id}.", suffix=".tmp", dir=self.storage_dir)
+        instrumentation = game.instrumentation
+        game.set_instrumentation(NULL_INSTRUMENTATION)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(game, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, path)
+        except BaseException:
+            game.set_instrumentation(instrumentation)
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        if instrumentation is not NULL_INSTRUMENTATION:
+            self._instrumentation[session_id] = instrumentation
+
+        del self._resident[session_id]
+        self.resident_bytes -= self._sizes.pop(session_id, 0)
+        self._evicted.add(session_id)
+        self.evictions += 1
+
+    def stats(self) -> Dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "resident": len(self._resident),
+            "evicted": len(self._evicted),
+            "resident_bytes": self.resident_bytes,
+            "memory_budget": self.memory_budget,
+        }
+
+    def _update_size(self, session_id: str) -> None:
+        size = estimate_game_size(self._resident[session_id])
+        self.resident_bytes += size - self._sizes.get(session_id, 0)
+        self._sizes[session_id] = size
+
+    def _enforce_budget(self) -> None:
+        if self.memory_budget is None or self.resident_bytes <= self.memory_budget:
+            return
+
+        # Обхід від найдавніше використаних; остання використана гра лишається в пам'яті завжди
+        for session_id in list(self._resident.keys())[:-1]:
+            if self.resident_bytes <= self.memory_budget:
+                break
+            if session_id not in self._pinned:
+                try:
+                    self.evict(session_id)
+                except (OSError, pickle.PicklingError, TypeError, AttributeError):
+                    continue  # Гру не вдалося зберегти - вона лишається в пам'яті
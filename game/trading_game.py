@@ -1,6 +1,17 @@
 import random
-from typing import Dict
+from typing import Dict, List, Optional, TextIO, TYPE_CHECKING
+from game.analytics import RiskAnalytics
+from game.investors import InvestorEvaluator
+from game.leaderboard import Leaderboard
 from patterns.builder import ScenarioBuilder
+from patterns.command import CommandBus, TradeCommand
+from utils.enums import TradeType
+from utils.instrumentation import Instrumentation, NULL_INSTRUMENTATION
+
+if TYPE_CHECKING:
+    from models.player import Investor
+
+TRADE_ACTIONS = {"buy": TradeType.BUY, "sell": TradeType.SELL, "short": TradeType.SHORT, "cover": TradeType.COVER}
 
 
 class TradingGame:
@@ -17,34 +28,155 @@ class TradingGame:
 
         self.current_player_index = 0
         self.game_over = False
+        self.instrumentation = NULL_INSTRUMENTATION
+        self.analytics = RiskAnalytics()
+        self.leaderboard = Leaderboard()
+        self.investor_evaluator = InvestorEvaluator()
+        self.command_bus = CommandBus()
+
+    @property
+    def investors(self) -> List['Investor']:
+        return self._investors
+
+    @investors.setter
+    def investors(self, investors: List['Investor']) -> None:
+        # Новий список інвесторів (сценарій, тести, завантаження гри) одразу отримує свій індекс
+        self._investors = investors
+        self.index_investors()
+
+    def index_investors(self) -> None:
+        self.investor_index: Dict[int, 'Investor'] = {investor.id: investor for investor in self.investors}
+
+    def get_investor(self, investor_id: int) -> Optional['Investor']:
+        investor = self.investor_index.get(investor_id)
+        if investor is None and len(self.investor_index) != len(self.investors):
+            # До списку додали інвестора напряму - індекс перебудовується
+            self.index_investors()
+            investor = self.investor_index.get(investor_id)
+        return investor
+
+    def set_settlement(self, settlement_days: Optional[int]) -> None:
+        """
+        Режим розрахунку угод гравців: None - одразу, 0 - нетування в кінці дня (T+0),
+        N - готівка й позиції змінюються через N днів (T+N)
+        """
+        self.command_bus.settlement_days = settlement_days
+
+    def set_instrumentation(self, instrumentation: Instrumentation) -> None:
+        """Увімкнення таймерів фаз і лічильників для гри та її ринку"""
+        self.instrumentation = instrumentation
+        self.market.instrumentation = instrumentation
+
+    def add_player(self, name: str, initial_capital: float) -> int:
+        """Додавання гравця під час гри, повертає його індекс"""
+        from models.player import Player
+
+        player = Player(name, initial_capital)
+        self.players.append(player)
+        self.market.attach(player)
+        if self.market.social is not None:
+            self.market.social.add_player(player)
+        self.leaderboard.update(player.id, player.calculate_net_worth(self.market))
+        return len(self.players) - 1
 
     def start_game(self) -> None:
         for event in self.story_events[:2]:  # Додаємо перші 2 події для початку гри
             self.market.add_event(event)
             self.story_events.remove(event)
+        self.refresh_leaderboard()
+
+    def refresh_leaderboard(self) -> None:
+        """Переоцінка всіх гравців у рейтингу за поточними цінами"""
+        for player in self.players:
+            self.leaderboard.update(player.id, player.calculate_net_worth(self.market))
 
     def next_day(self) -> None:
-        self.market.update()
-        self.market.generate_random_event()
+        instrumentation = self.instrumentation
+
+        # Кінець дня: ордери стратегій ботів і відкладені угоди гравців нетуються одним пакетом
+        with instrumentation.phase("strategies"):
+            for player in self.players:
+                if player.strategy is not None and not player.game_over:
+                    player.execute_strategy(self.market, self.command_bus)
+
+        command_bus = self.command_bus
+        if command_bus.books or command_bus.unsettled:
+            with instrumentation.phase("settlement"):
+                batch = command_bus.settle(self.market.day)
+                settled = command_bus.apply_due(self.market.day)
+            instrumentation.count("orders", batch.accepted + batch.rejected)
+            instrumentation.count("trades", len(batch.ledger))
+            instrumentation.count("settlements", settled)
+
+        with instrumentation.phase("market.update"):
+            self.market.update()
+        # Реальний час фіксується раз на ігровий день і лише якщо його ввімкнула сесія
+        self.market.clock.sample_wall_time()
+
+        with instrumentation.phase("random_event"):
+            self.market.generate_random_event()
 
         # Додавання запланованих сюжетних подій з певною ймовірністю
-        if self.story_events and random.random() < 0.2:  # 20% шанс
-            event = random.choice(self.story_events)
-            self.market.add_event(event)
-            self.story_events.remove(event)
+        with instrumentation.phase("story_events"):
+            if self.story_events and random.random() < 0.2:  # 20% шанс
+                event = random.choice(self.story_events)
+                self.market.add_event(event)
+                self.story_events.remove(event)
 
         # Перевірка маржин-колів для всіх гравців
-        for player in self.players:
-            player.check_margin_call(self.market)
-
-        self.check_game_over()
+        with instrumentation.phase("margin_checks"):
+            liquidations = 0
+            for player in self.players:
+                if player.check_margin_call(self.market, command_bus):
+                    liquidations += 1
+            if command_bus.books:
+                # Ліквідації з відкладеним розрахунком розраховуються як звичайні ордери дня
+                command_bus.settle(self.market.day)
+        instrumentation.count("liquidations", liquidations)
+
+        # Одна переоцінка гравців за цінами дня для кривих вартості, ризику і рейтингу
+        with instrumentation.phase("analytics"):
+            for player in self.players:
+                net_worth = player.calculate_net_worth(self.market)
+                self.analytics.record(player.id, net_worth)
+                self.leaderboard.update(player.id, net_worth)
+
+        # Періодична оцінка інвесторів за кривими вартості гравців
+        if self.investor_evaluator.is_due(self.market.day):
+            with instrumentation.phase("investors"):
+                withdrawals = self.investor_evaluator.evaluate(self)
+            instrumentation.count("withdrawals", len(withdrawals))
+
+        with instrumentation.phase("game_over"):
+            self.check_game_over()
+
+        instrumentation.count("days_simulated")
+        instrumentation.flush(self.market.day)
 
     def player_turn(self, player_index: int, action_type: str, **kwargs) -> bool:
+        with self.instrumentation.phase("player_turn"):
+            result = self._player_turn(player_index, action_type, **kwargs)
+            if result:
+                player = self.players[player_index]
+                self.leaderboard.update(player.id, player.calculate_net_worth(self.market))
+        self.instrumentation.count("actions")
+        return result
+
+    def _player_turn(self, player_index: int, action_type: str, **kwargs) -> bool:
         player = self.players[player_index]
 
         if player.game_over:
             return False
 
+        if action_type in TRADE_ACTIONS and self.command_bus.deferred:
+            # Угода виконується за поточною ціною, а готівка й позиції змінюються під час розрахунку
+            asset = self.market.assets.get(kwargs.get("asset_id"))
+            if asset is None:
+                return False
+            return self.command_bus.submit(TradeCommand(
+                player, asset, TRADE_ACTIONS[action_type], kwargs.get("quantity", 0), asset.current_price
+            ))
+
         if action_type == "buy":
             asset_id = kwargs.get("asset_id")
             quantity = kwargs.get("quantity", 0)
@@ -108,17 +240,16 @@ class TradingGame:
             investor_id = kwargs.get("investor_id")
             amount = kwargs.get("amount", 0)
 
-            for investor in self.investors:
-                if investor.id == investor_id:
-                    return investor.invest(player, amount)
+            investor = self.get_investor(investor_id)
+            if investor is not None:
+                return investor.invest(player, amount)
 
         elif action_type == "return_investment":
             investor_id = kwargs.get("investor_id")
             amount = kwargs.get("amount", 0)
 
-            for investor in self.investors:
-                if investor.id == investor_id:
-                    return player.return_investment(investor_id, amount)
+            if self.get_investor(investor_id) is not None:
+                return player.return_investment(investor_id, amount)
 
         return False
 
@@ -134,33 +265,36 @@ class TradingGame:
 
         self.game_over = all_game_over
 
-    def save_game(self, filename: str) -> bool:
+    def save_game(self, filename: str, output: Optional[TextIO] = None) -> bool:
         from patterns.adapter import GameStateAdapter
 
         try:
-            game_state = GameStateAdapter.serialize_game(self)
+            with self.instrumentation.phase("save"):
+                game_state = GameStateAdapter.serialize_game(self)
 
-            with open(filename, 'w', encoding='utf-8') as f:
-                import json
-                json.dump(game_state, f, ensure_ascii=False, indent=2) # noqa
+                with open(filename, 'w', encoding='utf-8') as f:
+                    import json
+                    json.dump(game_state, f, ensure_ascii=False, indent=2) # noqa
 
+            self.instrumentation.count("saves")
             return True
         except Exception as e:
-            print(f"Помилка збереження гри: {e}")
+            print(f"Помилка збереження гри: {e}", file=output)
             return False
 
-    def load_game(self, filename: str) -> bool:
+    def load_game(self, filename: str, output: Optional[TextIO] = None) -> bool:
         from patterns.adapter import GameStateAdapter
 
         try:
             import json
-            with open(filename, 'r', encoding='utf-8') as f:
-                game_state = json.load(f)
+            with self.instrumentation.phase("load"):
+                with open(filename, 'r', encoding='utf-8') as f:
+                    game_state = json.load(f)
 
-            GameStateAdapter.deserialize_game(game_state, self)
+                GameStateAdapter.deserialize_game(game_state, self)
             return True
         except Exception as e:
-            print(f"Помилка завантаження гри: {e}")
+            print(f"Помилка завантаження гри: {e}", file=output)
             return False
 
     def modify_game_based_on_feedback(self, feedback_data: Dict) -> None:
@@ -180,7 +314,7 @@ class TradingGame:
                 # Збільшення волатильності ринку
                 self.market.market_volatility *= 1.5
                 # Зменшення шансу виявлення неправдивих чуток
-                for rumor in self.market.rumors:
+                for rumor in self.market.rumors.active():
                     if not rumor.is_true:
                         rumor.discovered_chance *= 0.7
 
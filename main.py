@@ -2,111 +2,205 @@
 Біржовий Симулятор - Інтерактивна гра про торгівлю на фінансових ринках
 """
 
+import argparse
 import os
+import sys
+from typing import Optional, TextIO
+
 from game.trading_game import TradingGame
 from game.interface import TextInterface
+from game.input_source import InputSource, ConsoleInput, ScriptedInput, prompt
+from game.renderer import CLEAR_SCREEN
 from game.scenario import create_default_scenario, create_hard_scenario, create_multiplayer_scenario
-
-
-def clear_screen():
-    os.system('cls' if os.name == 'nt' else 'clear')
-
-
-def main():
-    clear_screen()
-    print("=== БІРЖОВИЙ СИМУЛЯТОР ===")
-    print("Ласкаво просимо до гри!")
-
-    print("\n1. Нова гра (стандартний режим)")
-    print("2. Нова гра (складний режим)")
-    print("3. Нова гра (мультиплеєр)")
-    print("4. Завантажити збережену гру")
-    print("0. Вийти")
-
-    choice = input("\nВаш вибір: ")
-
-    if choice == "1":
-        # Стандартний режим
-        scenario_builder = create_default_scenario()
-        game = TradingGame(scenario_builder)
-        interface = TextInterface(game)
-        interface.run_game()
-
-    elif choice == "2":
-        # Складний режим
-        scenario_builder = create_hard_scenario()
-        game = TradingGame(scenario_builder)
-        interface = TextInterface(game)
-        interface.run_game()
-
-    elif choice == "3":
-        # Мультиплеєр
-        scenario_builder = create_multiplayer_scenario()
-        game = TradingGame(scenario_builder)
-        interface = TextInterface(game)
+from game.scenario_loader import ScenarioLibrary, ScenarioError
+from models.price_model import HistoricalPriceModel, TickPriceModel
+from utils.price_store import PriceStore, PriceStoreError
+
+
+def clear_screen(output: Optional[TextIO] = None):
+    print(CLEAR_SCREEN, end="", flush=True, file=output or sys.stdout)
+
+
+def main(input_source: Optional[InputSource] = None, output: Optional[TextIO] = None,
+         price_store: Optional[PriceStore] = None, ticks_per_day: Optional[int] = None,
+         settlement_days: Optional[int] = None):
+    input_source = input_source or ConsoleInput()
+    output = output or sys.stdout
+
+    def say(*args):
+        print(*args, file=output)
+
+    def ask(text: str) -> str:
+        return prompt(input_source, text, output)
+
+    def back_to_menu():
+        ask("Натисніть Enter для повернення в головне меню...")
+
+    def play(game: TradingGame):
+        if price_store is not None:
+            # Режим історичних даних: ціни активів з однаковими тікерами відтворюють історію.
+            # Завантажена гра вже має модель з курсором зі збереження і свої ціни - їх не вирівнюємо
+            if game.market.price_model is None:
+                game.market.price_model = HistoricalPriceModel(price_store)
+                game.market.price_model.align_prices(game.market)
+        elif ticks_per_day:
+            # Внутрішньоденний режим: кожен день складається з ticks_per_day тіків
+            game.market.price_model = TickPriceModel(ticks_per_day)
+        if settlement_days is not None:
+            # Угоди нетуються в кінці дня, готівка й позиції змінюються через settlement_days днів
+            game.set_settlement(settlement_days)
+        interface = TextInterface(game, input_source, output)
         interface.run_game()
 
-    elif choice == "4":
-        # Завантаження гри
-        saves_dir = "saves"
-
-        # Створення директорії для збережень, якщо вона не існує
-        if not os.path.exists(saves_dir):
-            os.makedirs(saves_dir)
-
-        save_files = [f for f in os.listdir(saves_dir) if f.endswith('.json')]
-
-        if not save_files:
-            print("Немає доступних збережених ігор!")
-            input("Натисніть Enter для повернення в головне меню...")
-            main()
+    # Повернення в головне меню - новий прохід циклу, а не рекурсивний виклик
+    while True:
+        clear_screen(output)
+        say("=== БІРЖОВИЙ СИМУЛЯТОР ===")
+        say("Ласкаво просимо до гри!")
+
+        say("\n1. Нова гра (стандартний режим)")
+        say("2. Нова гра (складний режим)")
+        say("3. Нова гра (мультиплеєр)")
+        say("4. Завантажити збережену гру")
+        say("5. Нова гра (сценарій з файлу)")
+        say("0. Вийти")
+
+        choice = ask("\nВаш вибір: ")
+
+        if choice == "1":
+            # Стандартний режим
+            scenario_builder = create_default_scenario()
+            game = TradingGame(scenario_builder)
+            play(game)
             return
 
-        print("\nДоступні збережені ігри:")
-        for i, save_file in enumerate(save_files):
-            print(f"{i+1}. {save_file}")
-
-        save_choice = input("\nВиберіть файл для завантаження (або 0 для скасування): ")
-
-        if save_choice == "0":
-            main()
+        elif choice == "2":
+            # Складний режим
+            scenario_builder = create_hard_scenario()
+            game = TradingGame(scenario_builder)
+            play(game)
             return
 
-        if not save_choice.isdigit() or int(save_choice) < 1 or int(save_choice) > len(save_files):
-            print("Невірний вибір!")
-            input("Натисніть Enter для повернення в головне меню...")
-            main()
+        elif choice == "3":
+            # Мультиплеєр
+            scenario_builder = create_multiplayer_scenario()
+            game = TradingGame(scenario_builder)
+            play(game)
             return
 
-        save_file = save_files[int(save_choice) - 1]
-        save_path = os.path.join(saves_dir, save_file)
+        elif choice == "4":
+            # Завантаження гри
+            saves_dir = "saves"
+
+            # Створення директорії для збережень, якщо вона не існує
+            if not os.path.exists(saves_dir):
+                os.makedirs(saves_dir)
+
+            save_files = [f for f in os.listdir(saves_dir) if f.endswith('.json')]
+
+            if not save_files:
+                say("Немає доступних збережених ігор!")
+                back_to_menu()
+                continue
+
+            say("\nДоступні збережені ігри:")
+            for i, save_file in enumerate(save_files):
+                say(f"{i+1}. {save_file}")
+
+            save_choice = ask("\nВиберіть файл для завантаження (або 0 для скасування): ")
+
+            if save_choice == "0":
+                continue
+
+            if not save_choice.isdigit() or int(save_choice) < 1 or int(save_choice) > len(save_files):
+                say("Невірний вибір!")
+                back_to_menu()
+                continue
+
+            save_file = save_files[int(save_choice) - 1]
+            save_path = os.path.join(saves_dir, save_file)
+
+            game = TradingGame()
+            if price_store is not None:
+                # Модель створюється до завантаження, щоб збереження відновило її курсор дня
+                game.market.price_model = HistoricalPriceModel(price_store)
+            success = game.load_game(save_path, output)
+
+            if success:
+                say(f"Гра успішно завантажена з файлу {save_file}")
+                play(game)
+                return
+            else:
+                say("Не вдалося завантажити гру!")
+                back_to_menu()
+
+        elif choice == "5":
+            # Сценарії з каталогу scenarios/; список береться з індексу метаданих
+            library = ScenarioLibrary()
+            scenarios = library.list_scenarios()
+
+            if not scenarios:
+                say("Немає доступних файлів сценаріїв!")
+                back_to_menu()
+                continue
+
+            say("\nДоступні сценарії:")
+            for i, scenario in enumerate(scenarios):
+                say(f"{i+1}. {scenario['title']} - {scenario['description']} "
+                    f"(активів: {scenario['assets']}, гравців: {scenario['players']})")
+
+            scenario_choice = ask("\nВиберіть сценарій (або 0 для скасування): ")
+
+            if scenario_choice == "0":
+                continue
+
+            if not scenario_choice.isdigit() or int(scenario_choice) < 1 or int(scenario_choice) > len(scenarios):
+                say("Невірний вибір!")
+                back_to_menu()
+                continue
+
+            try:
+                scenario_builder = library.load(scenarios[int(scenario_choice) - 1]['file'])
+            except (OSError, ScenarioError) as e:
+                say(f"Не вдалося завантажити сценарій: {e}")
+                back_to_menu()
+                continue
+
+            game = TradingGame(scenario_builder)
+            play(game)
+            return
 
-        game = TradingGame()
-        success = game.load_game(save_path)
+        elif choice == "0":
+            say("До побачення!")
+            return
 
-        if success:
-            print(f"Гра успішно завантажена з файлу {save_file}")
-            interface = TextInterface(game)
-            interface.run_game()
         else:
-            print("Не вдалося завантажити гру!")
-            input("Натисніть Enter для повернення в головне меню...")
-            main()
-
-    elif choice == "0":
-        print("До побачення!")
-
-    else:
-        print("Невідомий вибір!")
-        input("Натисніть Enter для повернення в головне меню...")
-        main()
+            say("Невідомий вибір!")
+            back_to_menu()
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Біржовий симулятор")
+    parser.add_argument("--script", help="файл зі сценарієм вводу, по одній відповіді на рядок")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--prices", help="каталог сховища історичних цін (python -m utils.price_store)")
+    group.add_argument("--ticks", type=int, help="внутрішньоденний режим: кількість тіків на день")
+    parser.add_argument("--settlement", type=int, metavar="N",
+                        help="відкладений розрахунок угод T+N (0 - нетування в кінці дня)")
+    args = parser.parse_args()
+    if args.settlement is not None and args.settlement < 0:
+        parser.error("--settlement не може бути від'ємним")
+
+    source = ScriptedInput.from_file(args.script) if args.script else None
+    try:
+        store = PriceStore(args.prices) if args.prices else None
+    except PriceStoreError as e:
+        parser.error(str(e))
     try:
-        main()
-    except KeyboardInterrupt:
+        main(source, price_store=store, ticks_per_day=args.ticks, settlement_days=args.settlement)
+    except (KeyboardInterrupt, EOFError):
         print("\nГра перервана. До побачення!")
     except Exception as e:
         print(f"\nСталася помилка: {e}")
-        input("Натисніть Enter для закриття...")
+        if source is None:
+            input("Натисніть Enter для закриття...")
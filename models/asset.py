@@ -1,22 +1,47 @@
 from abc import ABC
-import uuid
 import random
-from datetime import datetime
+from typing import Optional
 
+from models.candles import PriceHistory
+from utils.ids import Entity
 
-class Asset(ABC):
-    def __init__(self, name: str, ticker: str, initial_price: float):
-        self.id = str(uuid.uuid4())
+
+class Asset(ABC, Entity):
+    # Без __dict__: великі симуляції тримають сотні тисяч сутностей
+    __slots__ = ("name", "ticker", "current_price", "initial_price", "history", "price_history", "price_version")
+
+    def __init__(self, name: str, ticker: str, initial_price: float, asset_id: Optional[str] = None):
+        self._assign_id(asset_id)  # Переданий рядковий ID стає зовнішнім псевдонімом
         self.name = name
         self.ticker = ticker
         self.current_price = initial_price
         self.initial_price = initial_price
-        self.price_history = [(datetime.now(), initial_price)]
+        self.history = PriceHistory(initial_price)
+        self.price_history = self.history.points  # Сирі точки за останні дні, старші стиснуті у свічки
+        self.price_version = 0  # Зростає з кожною зміною ціни, для кешування відображення
+
+    def price_multiplier(self) -> float:
+        """Наскільки сильно тип активу реагує на зміни ринку"""
+        return 1.0
 
     def update_price(self, percent_change: float) -> None:
+        self.apply_return(percent_change * self.price_multiplier())
+
+    def apply_return(self, percent_change: float) -> None:
+        """Зміна ціни на відсоток без модифікаторів типу активу"""
         change_factor = 1 + (percent_change / 100)
-        self.current_price *= change_factor
-        self.price_history.append((datetime.now(), self.current_price))
+        self.set_price(self.current_price * change_factor)
+
+    def set_price(self, price: float) -> None:
+        self.current_price = price
+        self.history.record(price)
+        self.price_version += 1
+
+    def set_tick_price(self, price: float) -> None:
+        """Внутрішньоденна ціна: оновлює свічки, але не зберігає сиру точку історії"""
+        self.current_price = price
+        self.history.record_tick(price)
+        self.price_version += 1
 
     def apply_event_impact(self, impact: float) -> None:
         self.update_price(impact)
@@ -26,44 +51,48 @@ class Asset(ABC):
 
 
 class Stock(Asset):
-    def __init__(self, name: str, ticker: str, initial_price: float):
-        super().__init__(name, ticker, initial_price)
+    __slots__ = ("company_health",)
+
+    def __init__(self, name: str, ticker: str, initial_price: float, asset_id: Optional[str] = None):
+        super().__init__(name, ticker, initial_price, asset_id)
         self.company_health = random.uniform(0.5, 1.0)  # Фактор здоров'я компанії
 
-    def update_price(self, percent_change: float) -> None:
+    def price_multiplier(self) -> float:
         # На акції впливає здоров'я компанії
-        modified_change = percent_change * self.company_health
-        super().update_price(modified_change)
+        return self.company_health
 
 
 class Cryptocurrency(Asset):
-    def __init__(self, name: str, ticker: str, initial_price: float):
-        super().__init__(name, ticker, initial_price)
+    __slots__ = ("volatility",)
+
+    def __init__(self, name: str, ticker: str, initial_price: float, asset_id: Optional[str] = None):
+        super().__init__(name, ticker, initial_price, asset_id)
         self.volatility = random.uniform(1.5, 3.0)  # Крипто більш волатильна
 
-    def update_price(self, percent_change: float) -> None:
+    def price_multiplier(self) -> float:
         # Криптовалюти більш волатильні
-        modified_change = percent_change * self.volatility
-        super().update_price(modified_change)
+        return self.volatility
 
 
 class ForexPair(Asset):
-    def __init__(self, name: str, ticker: str, initial_price: float):
-        super().__init__(name, ticker, initial_price)
+    __slots__ = ("stability",)
+
+    def __init__(self, name: str, ticker: str, initial_price: float, asset_id: Optional[str] = None):
+        super().__init__(name, ticker, initial_price, asset_id)
         self.stability = random.uniform(0.5, 1.0)  # Фактор стабільності форекса
 
-    def update_price(self, percent_change: float) -> None:
+    def price_multiplier(self) -> float:
         # Валютні пари менш волатильні
-        modified_change = percent_change * self.stability
-        super().update_price(modified_change)
+        return self.stability
 
 
 class Commodity(Asset):
-    def __init__(self, name: str, ticker: str, initial_price: float):
-        super().__init__(name, ticker, initial_price)
+    __slots__ = ("supply_elasticity",)
+
+    def __init__(self, name: str, ticker: str, initial_price: float, asset_id: Optional[str] = None):
+        super().__init__(name, ticker, initial_price, asset_id)
         self.supply_elasticity = random.uniform(0.3, 0.8)  # Як швидко пристосовується постачання
 
-    def update_price(self, percent_change: float) -> None:
+    def price_multiplier(self) -> float:
         # На товари впливає еластичність постачання
-        modified_change = percent_change * (1 - self.supply_elasticity)
-        super().update_price(modified_change)
+        return 1 - self.supply_elasticity
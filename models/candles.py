@@ -0,0 +1,117 @@
+"""
+Свічки OHLC кількох роздільностей, що оновлюються інкрементно.
+
+Кожна зміна ціни оновлює поточну свічку дня, тижня і місяця за O(1).
+Сирі точки старші за горизонт відкидаються - вони вже агреговані у свічки,
+а кількість свічок кожної роздільності обмежена, тож пам'ять активу
+не росте необмежено навіть у грі на 100 000 днів.
+"""
+
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+from utils.clock import make_stamp, stamp_day
+
+# Тривалість свічки в ігрових днях
+RESOLUTIONS: Dict[str, int] = {"day": 1, "week": 7, "month": 30}
+# Скільки свічок кожної роздільності зберігається (~5 років днів, ~38 років тижнів, ~410 років місяців)
+MAX_BARS: Dict[str, int] = {"day": 1825, "week": 2000, "month": 5000}
+RAW_HISTORY_DAYS = 30  # Сирі точки за стільки останніх днів не стискаються
+
+
+class Candle:
+    def __init__(self, start_day: int, price: float):
+        self.start_day = start_day
+        self.open = price
+        self.high = price
+        self.low = price
+        self.close = price
+
+    def update(self, price: float) -> None:
+        if price > self.high:
+            self.high = price
+        elif price < self.low:
+            self.low = price
+        self.close = price
+
+    def as_tuple(self) -> Tuple[int, float, float, float, float]:
+        return self.start_day, self.open, self.high, self.low, self.close
+
+    def __repr__(self) -> str:
+        return f"Candle(day={self.start_day}, o={self.open:.2f}, h={self.high:.2f}, l={self.low:.2f}, c={self.close:.2f})"
+
+
+class CandleSeries:
+    def __init__(self, period: int, max_bars: Optional[int] = None):
+        self.period = period
+        self.bars: Deque[Candle] = deque(maxlen=max_bars)
+
+    def bucket_start(self, day: int) -> int:
+        # Дні рахуються з 1: перший тиждень - дні 1-7
+        return (day - 1) // self.period * self.period + 1
+
+    def roll(self, day: int, price: float) -> None:
+        """Відкриття нової свічки, якщо день виходить за межі поточної"""
+        start = self.bucket_start(day)
+        if not self.bars or self.bars[-1].start_day != start:
+            self.bars.append(Candle(start, price))
+
+    def update(self, price: float) -> None:
+        self.bars[-1].update(price)
+
+    def last(self, count: Optional[int] = None) -> List[Candle]:
+        if count is None or count >= len(self.bars):
+            return list(self.bars)
+        return [self.bars[i] for i in range(len(self.bars) - count, len(self.bars))]
+
+
+class PriceHistory:
+    """Сирі точки ціни за останні дні плюс свічки всіх роздільностей"""
+
+    def __init__(self, initial_price: float, day: int = 1, raw_days: int = RAW_HISTORY_DAYS):
+        self.day = day
+        self.raw_days = raw_days
+        self.last_price = initial_price
+        # (мітка ігрового годинника, ціна); мітка несе день, тож окремий список днів не потрібен
+        self.points: Deque[Tuple[int, float]] = deque([(make_stamp(day), initial_price)])
+        self.series: Dict[str, CandleSeries] = {
+            name: CandleSeries(period, MAX_BARS.get(name)) for name, period in RESOLUTIONS.items()
+        }
+        for series in self.series.values():
+            series.roll(day, initial_price)
+
+    def record(self, price: float) -> None:
+        self.last_price = price
+        self.points.append((make_stamp(self.day), price))
+        for series in self.series.values():
+            series.update(price)
+
+    def record_tick(self, price: float) -> None:
+        """Внутрішньоденна ціна потрапляє лише у свічки - тисячі тіків на день не роздувають історію"""
+        self.last_price = price
+        for series in self.series.values():
+            series.update(price)
+
+    def roll(self, day: int) -> None:
+        """Перехід до нового ігрового дня: нові свічки відкриваються за ціною закриття попереднього"""
+        if day <= self.day:
+            return
+        self.day = day
+
+        price = self.last_price
+        for series in self.series.values():
+            series.roll(day, price)
+
+        # Стиснення: сирі точки старші за горизонт уже є у свічках
+        cutoff = day - self.raw_days
+        while len(self.points) > 1 and stamp_day(self.points[0][0]) < cutoff:
+            self.points.popleft()
+
+    def candles(self, resolution: str = "day", count: Optional[int] = None) -> List[Candle]:
+        """Останні count свічок (або всі збережені) заданої роздільності"""
+        if resolution not in self.series:
+            raise ValueError(f"Невідома роздільність '{resolution}'")
+        return self.series[resolution].last(count)
+
+    def bar_count(self) -> int:
+        return sum(len(series.bars) for series in self.series.values())
@@ -1,17 +1,18 @@
-import uuid
 import random
-from datetime import datetime
-from typing import List, TYPE_CHECKING
+from typing import List, Optional, TYPE_CHECKING
 from utils.enums import EventType, RumorType
+from utils.ids import Entity
 
 if TYPE_CHECKING:
     from models.market import Market
 
 
-class Event:
+class Event(Entity):
+    __slots__ = ("event_type", "title", "description", "impact", "duration", "affected_assets", "remaining_duration")
+
     def __init__(self, event_type: EventType, title: str, description: str,
-                 impact: float, duration: int, affected_assets: List[str]):
-        self.id = str(uuid.uuid4())
+                 impact: float, duration: int, affected_assets: List[int], event_id: Optional[str] = None):
+        self._assign_id(event_id)
         self.event_type = event_type
         self.title = title
         self.description = description
@@ -31,19 +32,23 @@ class Event:
             self.remaining_duration -= 1
 
 
-class Rumor:
-    def __init__(self, creator_id: str, asset_id: str, rumor_type: RumorType,
-                 content: str, is_true: bool, discovered_chance: float = 0.1):
-        self.id = str(uuid.uuid4())
+class Rumor(Entity):
+    __slots__ = ("creator_id", "asset_id", "rumor_type", "content", "is_true", "created_at", "credibility",
+                 "discovered_chance", "is_discovered", "reach")
+
+    def __init__(self, creator_id: int, asset_id: int, rumor_type: RumorType,
+                 content: str, is_true: bool, discovered_chance: float = 0.1, created_at: int = 0):
+        self._assign_id()
         self.creator_id = creator_id
         self.asset_id = asset_id
         self.rumor_type = rumor_type
         self.content = content
         self.is_true = is_true
-        self.created_at = datetime.now()
+        self.created_at = created_at  # Мітка ігрового годинника (utils.clock)
         self.credibility = random.uniform(0.2, 0.8)  # Наскільки правдоподібна чутка
         self.discovered_chance = discovered_chance  # Шанс бути викритим, якщо неправда
         self.is_discovered = False
+        self.reach = 1.0  # Частка ринку, до якої чутка дійшла цього разу (соціальна мережа)
 
     def get_impact(self) -> float:
         # Вплив залежить від типу та достовірності
@@ -51,9 +56,9 @@ class Rumor:
 
         # Неправдиві чутки можуть мати протилежний ефект, якщо розкриті
         if not self.is_true and self.is_discovered:
-            return -base_impact * self.credibility
+            return -base_impact * self.credibility * self.reach
         else:
-            return base_impact * self.credibility
+            return base_impact * self.credibility * self.reach
 
     def check_discovery(self) -> bool:
         # Перевірка, чи розкрита неправдива чутка
@@ -0,0 +1,355 @@
+"""
+Компактне зберігання подій і чуток ринку.
+
+За довгу симуляцію ринок накопичує сотні тисяч подій і чуток, але живими
+лишаються лише кілька: подія, що ще діє, і неправдива чутка, яку ще не
+викрито. Сховище тримає поля всіх записів у типізованих масивах (структура
+масивів), а повноцінні об'єкти - тільки для живих записів. Після того як
+запис перестає змінюватися, compact() переносить його змінні поля в масиви
+й відпускає об'єкт. Доступ за індексом повертає живий об'єкт або легкий
+перегляд запису з тими самими полями лише для читання.
+
+Повторювані рядки (заголовки шаблонних подій, тексти чуток) зберігаються
+один раз у таблиці рядків, а в масивах лежать їхні номери.
+"""
+
+from abc import ABC, abstractmethod
+from array import array
+import uuid
+from typing import Container, Dict, Generic, Iterator, List, TypeVar, Union, TYPE_CHECKING
+
+from models.event import Event, Rumor
+from utils.enums import EventType, RumorType
+from utils.ids import reserve_ids
+
+if TYPE_CHECKING:
+    from models.market import Market
+
+T = TypeVar("T")
+
+EVENT_TYPES = list(EventType)
+EVENT_TYPE_INDEX = {event_type: i for i, event_type in enumerate(EVENT_TYPES)}
+RUMOR_TYPES = list(RumorType)
+RUMOR_TYPE_INDEX = {rumor_type: i for i, rumor_type in enumerate(RUMOR_TYPES)}
+
+RUMOR_TRUE = 1
+RUMOR_DISCOVERED = 2
+
+
+class _StringTable:
+    """Кожен різний рядок зберігається один раз"""
+
+    def __init__(self):
+        self.strings: List[str] = []
+        self._index: Dict[str, int] = {}
+
+    def add(self, value: str) -> int:
+        index = self._index.get(value)
+        if index is None:
+            index = self._index[value] = len(self.strings)
+            self.strings.append(value)
+        return index
+
+    def __getitem__(self, index: int) -> str:
+        return self.strings[index]
+
+    def nbytes(self) -> int:
+        return sum(len(value.encode("utf-8")) for value in self.strings)
+
+    def __getstate__(self):
+        return self.strings
+
+    def __setstate__(self, strings) -> None:
+        self.strings = strings
+        self._index = {value: i for i, value in enumerate(strings)}
+
+
+class _RecordStore(ABC, Generic[T]):
+    """Спільна частина сховищ: живі об'єкти за номером рядка і масиви полів усіх рядків"""
+
+    def __init__(self):
+        self._live: Dict[int, T] = {}  # Номер рядка -> об'єкт, що ще може змінитися
+        self._aliases: Dict[int, str] = {}  # Лише для записів, чий псевдонім уже створено
+        self.ids = array("q")
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return [self[row] for row in range(*index.indices(len(self)))]
+        row = index + len(self) if index < 0 else index
+        if not 0 <= row < len(self):
+            raise IndexError("Номер запису поза межами сховища")
+        live = self._live.get(row)
+        return live if live is not None else self._record(row)
+
+    def __iter__(self) -> Iterator:
+        for row in range(len(self)):
+            yield self[row]
+
+    @property
+    def live_count(self) -> int:
+        return len(self._live)
+
+    def append(self, item: T) -> None:
+        row = len(self.ids)
+        self.ids.append(item.id)
+        self._append_fields(item)
+        self._live[row] = item
+
+    def extend(self, items) -> None:
+        for item in items:
+            self.append(item)
+
+    def compact(self, pinned: Container[int] = ()) -> int:
+        """
+        Перенесення записів, що більше не змінюються, в масиви; повертає кількість відпущених об'єктів.
+        Записи з ID у pinned лишаються живими, навіть якщо вже завершені.
+        """
+        # Словник будується заново: після видалення ключів dict не зменшує свою таблицю
+        live = {}
+        released = 0
+        for row, item in self._live.items():
+            if item.id not in pinned and self._is_settled(item):
+                self._sync_fields(row, item)
+                if item._alias is not None:
+                    self._aliases[row] = item._alias
+                released += 1
+            else:
+                live[row] = item
+        self._live = live
+        return released
+
+    def __setstate__(self, state) -> None:
+        self.__dict__.update(state)
+        # ID відпущених записів лишаються зайнятими і після відновлення зі знімка
+        if self.ids:
+            reserve_ids(max(self.ids))
+
+    def alias(self, row: int) -> str:
+        alias = self._aliases.get(row)
+        if alias is None:
+            alias = self._aliases[row] = str(uuid.uuid4())
+        return alias
+
+    @abstractmethod
+    def nbytes(self) -> int:
+        """Обсяг масивів і таблиць рядків (без живих об'єктів)"""
+        pass
+
+    @abstractmethod
+    def _append_fields(self, item: T) -> None:
+        pass
+
+    @abstractmethod
+    def _sync_fields(self, row: int, item: T) -> None:
+        pass
+
+    @abstractmethod
+    def _is_settled(self, item: T) -> bool:
+        pass
+
+    @abstractmethod
+    def _record(self, row: int):
+        pass
+
+
+class EventRecord:
+    """Перегляд завершеної події у сховищі"""
+
+    __slots__ = ("_store", "_row")
+
+    def __init__(self, store: 'EventStore', row: int):
+        self._store = store
+        self._row = row
+
+    @property
+    def id(self) -> int:
+        return self._store.ids[self._row]
+
+    @property
+    def alias(self) -> str:
+        return self._store.alias(self._row)
+
+    @property
+    def event_type(self) -> EventType:
+        return EVENT_TYPES[self._store.types[self._row]]
+
+    @property
+    def title(self) -> str:
+        return self._store.strings[self._store.titles[self._row]]
+
+    @property
+    def description(self) -> str:
+        return self._store.strings[self._store.descriptions[self._row]]
+
+    @property
+    def impact(self) -> float:
+        return self._store.impacts[self._row]
+
+    @property
+    def duration(self) -> int:
+        return self._store.durations[self._row]
+
+    @property
+    def remaining_duration(self) -> int:
+        return self._store.remaining[self._row]
+
+    @property
+    def affected_assets(self) -> List[int]:
+        offsets = self._store.asset_offsets
+        return self._store.asset_ids[offsets[self._row]:offsets[self._row + 1]].tolist()
+
+    def is_active(self) -> bool:
+        return self.remaining_duration > 0
+
+    def apply_effect(self, market: 'Market') -> None:
+        pass  # До сховища потрапляють лише події, що вже завершилися
+
+
+class EventStore(_RecordStore[Event]):
+    def __init__(self):
+        super().__init__()
+        self.strings = _StringTable()
+        self.types = array("B")
+        self.titles = array("i")
+        self.descriptions = array("i")
+        self.impacts = array("d")
+        self.durations = array("i")
+        self.remaining = array("i")
+        # Активи подій у форматі CSR: активи рядка row - asset_ids[asset_offsets[row]:asset_offsets[row + 1]]
+        self.asset_offsets = array("q", [0])
+        self.asset_ids = array("q")
+
+    def active(self) -> List[Event]:
+        return [event for event in self._live.values() if event.is_active()]
+
+    def nbytes(self) -> int:
+        arrays = (self.ids, self.types, self.titles, self.descriptions, self.impacts, self.durations,
+                  self.remaining, self.asset_offsets, self.asset_ids)
+        return sum(len(values) * values.itemsize for values in arrays) + self.strings.nbytes()
+
+    def _append_fields(self, event: Event) -> None:
+        self.types.append(EVENT_TYPE_INDEX[event.event_type])
+        self.titles.append(self.strings.add(event.title))
+        self.descriptions.append(self.strings.add(event.description))
+        self.impacts.append(event.impact)
+        self.durations.append(event.duration)
+        self.remaining.append(event.remaining_duration)
+        self.asset_ids.extend(event.affected_assets)
+        self.asset_offsets.append(len(self.asset_ids))
+
+    def _sync_fields(self, row: int, event: Event) -> None:
+        self.remaining[row] = event.remaining_duration
+
+    def _is_settled(self, event: Event) -> bool:
+        return not event.is_active()
+
+    def _record(self, row: int) -> EventRecord:
+        return EventRecord(self, row)
+
+
+class RumorRecord:
+    """Перегляд чутки, що вже не може бути викрита (правдива або спростована)"""
+
+    __slots__ = ("_store", "_row")
+
+    def __init__(self, store: 'RumorStore', row: int):
+        self._store = store
+        self._row = row
+
+    @property
+    def id(self) -> int:
+        return self._store.ids[self._row]
+
+    @property
+    def alias(self) -> str:
+        return self._store.alias(self._row)
+
+    @property
+    def creator_id(self) -> int:
+        return self._store.creators[self._row]
+
+    @property
+    def asset_id(self) -> int:
+        return self._store.assets[self._row]
+
+    @property
+    def rumor_type(self) -> RumorType:
+        return RUMOR_TYPES[self._store.types[self._row]]
+
+    @property
+    def content(self) -> str:
+        return self._store.strings[self._store.contents[self._row]]
+
+    @property
+    def is_true(self) -> bool:
+        return bool(self._store.flags[self._row] & RUMOR_TRUE)
+
+    @property
+    def is_discovered(self) -> bool:
+        return bool(self._store.flags[self._row] & RUMOR_DISCOVERED)
+
+    @property
+    def created_at(self) -> int:
+        return self._store.created[self._row]
+
+    @property
+    def credibility(self) -> float:
+        return self._store.credibility[self._row]
+
+    @property
+    def discovered_chance(self) -> float:
+        return self._store.discovered_chance[self._row]
+
+    def check_discovery(self) -> bool:
+        return False
+
+
+class RumorStore(_RecordStore[Rumor]):
+    def __init__(self):
+        super().__init__()
+        self.strings = _StringTable()
+        self.creators = array("q")
+        self.assets = array("q")
+        self.types = array("B")
+        self.contents = array("i")
+        self.flags = array("B")
+        self.created = array("q")
+        self.credibility = array("d")
+        self.discovered_chance = array("d")
+
+    def active(self) -> List[Rumor]:
+        """Чутки, які ще можуть бути викриті"""
+        return [rumor for rumor in self._live.values() if not self._is_settled(rumor)]
+
+    def nbytes(self) -> int:
+        arrays = (self.ids, self.creators, self.assets, self.types, self.contents, self.flags,
+                  self.created, self.credibility, self.discovered_chance)
+        return sum(len(values) * values.itemsize for values in arrays) + self.strings.nbytes()
+
+    def _append_fields(self, rumor: Rumor) -> None:
+        self.creators.append(rumor.creator_id)
+        self.assets.append(rumor.asset_id)
+        self.types.append(RUMOR_TYPE_INDEX[rumor.rumor_type])
+        self.contents.append(self.strings.add(rumor.content))
+        self.flags.append(self._flags(rumor))
+        self.created.append(rumor.created_at)
+        self.credibility.append(rumor.credibility)
+        self.discovered_chance.append(rumor.discovered_chance)
+
+    def _sync_fields(self, row: int, rumor: Rumor) -> None:
+        self.flags[row] = self._flags(rumor)
+        self.credibility[row] = rumor.credibility
+        self.discovered_chance[row] = rumor.discovered_chance
+
+    @staticmethod
+    def _flags(rumor: Rumor) -> int:
+        return (RUMOR_TRUE if rumor.is_true else 0) | (RUMOR_DISCOVERED if rumor.is_discovered else 0)
+
+    def _is_settled(self, rumor: Rumor) -> bool:
+        return rumor.is_true or rumor.is_discovered
+
+    def _record(self, row: int) -> RumorRecord:
+        return RumorRecord(self, row)
@@ -1,12 +1,21 @@
-import random
-from typing import Dict, List, Optional, TYPE_CHECKING
-from patterns.observer import Subject
-from patterns.state import MarketState, BullMarketState, BearMarketState, VolatileMarketState
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Optional, Tuple, TYPE_CHECKING
+from patterns.observer import Observer, Subject
+from patterns.state import MarketState, BullMarketState, state_instance
 from utils.enums import RumorType
+from utils.clock import GameClock
+from utils.instrumentation import NULL_INSTRUMENTATION
 from models.asset import Asset
 from models.event import Rumor
+from models.event_store import EventStore, RumorStore
+from models.regime import RegimeEngine
+from models.social_graph import RumorNetwork
+
+EVENT_BLOCK_DAYS = 30  # На скільки днів уперед генеруються випадкові події
 
 if TYPE_CHECKING:
+    from models.market_snapshot import MarketSnapshotWriter
+    from models.price_model import PriceModel
     from models.player import Player
     from models.event import Event
 
@@ -14,15 +23,79 @@ if TYPE_CHECKING:
 class Market(Subject):
     def __init__(self):
         super().__init__()
-        self.assets: Dict[str, Asset] = {}
-        self.events: List['Event'] = []
-        self.rumors: List[Rumor] = []
-        self.day = 1
-        self.current_state: MarketState = BullMarketState()
+        self._assets_version = 0  # Зростає з кожною зміною набору активів
+        self.assets = {}
+        # Завершені події й чутки зберігаються в типізованих масивах, об'єктами лишаються лише живі
+        self.events = EventStore()
+        self.rumors = RumorStore()
+        self.clock = GameClock()  # Джерело всіх міток часу ринку, його гравців і чуток
+        self.current_state: MarketState = state_instance(BullMarketState)
+        self.regime = RegimeEngine()
         self.market_volatility = 0.5  # 0.0 (стабільний) до 1.0 (дуже волатильний)
+        self.instrumentation = NULL_INSTRUMENTATION
+        self.price_model: Optional['PriceModel'] = None
+        self.snapshot_writer: Optional['MarketSnapshotWriter'] = None  # Знімок для ботів в інших процесах
+        self.social: Optional[RumorNetwork] = None  # Без мережі чутку одразу чує весь ринок
+        self._asset_ids: List[int] = []
+        self._asset_ids_version = -1
+        # Заздалегідь згенеровані випадкові події: (день, подія), дні покриті до scheduled_until
+        self.scheduled_events: Deque[Tuple[int, 'Event']] = deque()
+        self.scheduled_until = 0
+
+    @property
+    def assets(self) -> Dict[int, Asset]:
+        return self._assets
+
+    @assets.setter
+    def assets(self, assets: Dict[int, Asset]) -> None:
+        # Заміна словника цілком (наприклад, під час завантаження гри) - теж зміна набору активів
+        self._assets = assets
+        self._assets_version += 1
+
+    @property
+    def assets_version(self) -> int:
+        """Лічильник змін набору активів: add_asset і заміна словника assets"""
+        return self._assets_version
+
+    @property
+    def day(self) -> int:
+        return self.clock.day
+
+    @day.setter
+    def day(self, day: int) -> None:
+        self.clock.day = day
+        self.clock.tick = 0
+
+    def attach(self, observer: Observer) -> None:
+        super().attach(observer)
+        self._share_clock([observer])
+
+    def attach_many(self, observers: Iterable[Observer]) -> None:
+        observers = list(observers)
+        super().attach_many(observers)
+        self._share_clock(observers)
+
+    def _share_clock(self, observers: List[Observer]) -> None:
+        # Гравці ставлять мітки своїх угод за годинником ринку, на який підписані
+        for observer in observers:
+            if hasattr(observer, "clock"):
+                observer.clock = self.clock
+
+    def notify(self, **kwargs) -> None:
+        self.instrumentation.count("notifications_sent", len(self._observers))
+        super().notify(**kwargs)
 
     def add_asset(self, asset: Asset) -> None:
-        self.assets[asset.id] = asset
+        self._assets[asset.id] = asset
+        self._assets_version += 1
+        asset.history.roll(self.day)
+
+    def asset_ids(self) -> List[int]:
+        """Кешований список ID активів; перебудовується лише після зміни набору активів"""
+        if self._asset_ids_version != self._assets_version:
+            self._asset_ids = list(self._assets)
+            self._asset_ids_version = self._assets_version
+        return self._asset_ids
 
     def create_rumor(self, player: 'Player', asset: Asset, rumor_type: RumorType,
                      content: str, is_true: bool) -> Optional[Rumor]:
@@ -40,10 +113,16 @@ class Market(Subject):
             rumor_type=rumor_type,
             content=content,
             is_true=is_true,
-            discovered_chance=discovery_chance
+            discovered_chance=discovery_chance,
+            created_at=self.clock.now()
         )
 
         self.rumors.append(rumor)
+        self.instrumentation.count("rumors_created")
+
+        # У соціальній мережі чутка поширюється поступово і впливає на ціну в міру охоплення
+        if self.social is not None and self.social.start(self, rumor):
+            return rumor
 
         # Обробка впливу чутки через поточний стан ринку
         self.current_state.process_rumor(self, rumor)
@@ -54,6 +133,7 @@ class Market(Subject):
 
     def add_event(self, event: 'Event') -> None:
         self.events.append(event)
+        self.instrumentation.count("events_created")
 
         # Обробка впливу події через поточний стан ринку
         self.current_state.process_event(self, event)
@@ -66,31 +146,65 @@ class Market(Subject):
         self.notify(market_state=self.current_state.get_name())
 
     def update(self) -> None:
-        self.day += 1
-
-        for event in [e for e in self.events if e.is_active()]:
-            event.apply_effect(self)
-
-        # Перевірка розкриття чуток
-        for rumor in self.rumors:
-            if rumor.check_discovery():
-                self.notify(rumor=rumor, discovered=True)
-
-        # Оновлення цін через поточний стан ринку
-        self.current_state.update_prices(self)
-
-        # Випадкова зміна стану ринку
-        if random.random() < 0.05:  # 5% шанс зміни стану ринку щодня
-            states = [BullMarketState(), BearMarketState(), VolatileMarketState()]
-            new_state = random.choice([s for s in states if not isinstance(s, type(self.current_state))])
-            self.change_state(new_state)
+        instrumentation = self.instrumentation
+        self.clock.advance_day()
+
+        # Нові денні (і за потреби тижневі та місячні) свічки до будь-яких змін цін цього дня
+        with instrumentation.phase("market.candles"):
+            for asset in self.assets.values():
+                asset.history.roll(self.day)
+
+        with instrumentation.phase("market.events"):
+            active_events = self.events.active()
+            for event in active_events:
+                event.apply_effect(self)
+            self.events.compact()
+        instrumentation.count("events_applied", len(active_events))
+
+        # Перевірка розкриття чуток; правдиві й уже викриті чутки не перевіряються
+        with instrumentation.phase("market.rumors"):
+            active_rumors = self.rumors.active()
+            for rumor in active_rumors:
+                if rumor.check_discovery():
+                    self.notify(rumor=rumor, discovered=True)
+        instrumentation.count("rumors_checked", len(active_rumors))
+
+        spreading = ()
+        if self.social is not None:
+            with instrumentation.phase("market.rumor_spread"):
+                instrumentation.count("rumor_reach", self.social.step(self))
+            spreading = self.social.spreads
+        self.rumors.compact(spreading)
+
+        # Оновлення цін через модель цін або поточний стан ринку
+        with instrumentation.phase("market.prices"):
+            if self.price_model is not None:
+                self.price_model.update_prices(self)
+            else:
+                self.current_state.update_prices(self)
+
+        # Зміна режиму ринку за матрицею переходів
+        with instrumentation.phase("market.state"):
+            self.regime.step(self)
+
+        if self.snapshot_writer is not None:
+            with instrumentation.phase("market.snapshot"):
+                self.snapshot_writer.publish(self)
 
         # Повідомлення про оновлення ринку
-        self.notify(day=self.day)
+        with instrumentation.phase("market.notify"):
+            self.notify(day=self.day)
 
     def generate_random_event(self) -> None:
         from patterns.factory import EventFactory
 
-        if random.random() < 0.3:  # 30% шанс нової події щодня
-            event = EventFactory.create_random_event(self)
-            self.add_event(event)
+        # Події генеруються пакетом на EVENT_BLOCK_DAYS днів уперед і видаються у свій день
+        if self.day > self.scheduled_until:
+            self.scheduled_events.extend(EventFactory.create_random_events(self, self.day, EVENT_BLOCK_DAYS))
+            self.scheduled_until = self.day + EVENT_BLOCK_DAYS - 1
+
+        scheduled = self.scheduled_events
+        while scheduled and scheduled[0][0] <= self.day:
+            day, event = scheduled.popleft()
+            if day == self.day:
+                self.add_event(event)
@@ -0,0 +1,230 @@
+"""
+Знімок ринку в спільній пам'яті для ботів в інших процесах.
+
+Головний процес публікує ціни, день, стан ринку і поканальні індикатори
+активів у блок multiprocessing.shared_memory. Процеси-боти читають його без
+копіювання через memoryview. Узгодженість забезпечує лічильник у стилі
+seqlock: під час запису він непарний, після запису - парний і більший,
+тож читач, який побачив однакове парне значення до і після читання,
+отримав цілісний знімок.
+
+Розмітка блоку: заголовок з HEADER_SLOTS цілих int64, потім ID активів
+(int64[capacity]) і по одній колонці float64[capacity] на кожне поле FIELDS.
+"""
+
+from array import array
+from multiprocessing import resource_tracker, shared_memory
+import time
+from typing import Callable, Dict, List, Optional, TypeVar, TYPE_CHECKING
+
+from patterns.state import BullMarketState, BearMarketState, VolatileMarketState
+
+if TYPE_CHECKING:
+    from models.market import Market
+
+# Номери станів ринку в знімку
+STATE_IDS = {BullMarketState: 0, BearMarketState: 1, VolatileMarketState: 2}
+# Колонки індикаторів активів: ціна, відкриття/максимум/мінімум дня, сумарний вплив активних подій
+FIELDS = ("price", "open", "high", "low", "event_impact")
+
+HEADER_SLOTS = 8
+SEQ, DAY, STATE, TICK, COUNT, CAPACITY = range(6)
+SLOT_BYTES = 8
+
+T = TypeVar("T")
+
+
+def _segment_size(capacity: int) -> int:
+    return (HEADER_SLOTS + capacity * (1 + len(FIELDS))) * SLOT_BYTES
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Під'єднання до чужого блоку без реєстрації в resource_tracker цього процесу"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # До Python 3.13 читач реєструє блок і видаляє його при виході - реєстрація скасовується
+        shm = shared_memory.SharedMemory(name=name)
+        resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
+
+
+class _Layout:
+    """Типізовані перегляди заголовка, ID активів і колонок блоку спільної пам'яті"""
+
+    def __init__(self, shm: shared_memory.SharedMemory, capacity: int):
+        buffer = shm.buf
+        ids_start = HEADER_SLOTS * SLOT_BYTES
+        columns_start = ids_start + capacity * SLOT_BYTES
+        column_bytes = capacity * SLOT_BYTES
+
+        self.header = buffer[:ids_start].cast("q")
+        self.asset_ids = buffer[ids_start:columns_start].cast("q")
+        self.columns: Dict[str, memoryview] = {
+            field: buffer[columns_start + i * column_bytes:columns_start + (i + 1) * column_bytes].cast("d")
+            for i, field in enumerate(FIELDS)
+        }
+
+    def release(self) -> None:
+        for view in self.columns.values():
+            view.release()
+        self.asset_ids.release()
+        self.header.release()
+
+
+class MarketSnapshotWriter:
+    """Публікація знімка ринку; створює блок спільної пам'яті і володіє ним"""
+
+    def __init__(self, capacity: int, name: Optional[str] = None):
+        if capacity < 1:
+            raise ValueError("Місткість знімка має бути додатною")
+        self.capacity = capacity
+        self.shm = shared_memory.SharedMemory(name=name, create=True, size=_segment_size(capacity))
+        self._open()
+
+    def _open(self) -> None:
+        capacity = self.capacity
+        self._layout = _Layout(self.shm, capacity)
+        self._layout.header[CAPACITY] = capacity
+        self._asset_ids: List[int] = []  # Список ID, уже записаний у знімок
+        self._index: Dict[int, int] = {}
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    @property
+    def version(self) -> int:
+        return self._layout.header[SEQ]
+
+    def publish(self, market: 'Market', tick: int = -1) -> None:
+        asset_ids = market.asset_ids()
+        count = len(asset_ids)
+        if count > self.capacity:
+            raise ValueError(f"Активів ({count}) більше, ніж місткість знімка ({self.capacity})")
+
+        # Порівняння самого списку ID - O(n), як і збір колонок нижче, але не залежить від id() об'єктів
+        ids_changed = asset_ids != self._asset_ids
+        if ids_changed:
+            self._index = {asset_id: i for i, asset_id in enumerate(asset_ids)}
+            self._asset_ids = list(asset_ids)
+
+        # Колонки збираються до початку запису, щоб вікно непарного лічильника було коротким
+        assets = market.assets
+        histories = [assets[asset_id].history.series["day"].bars[-1] for asset_id in asset_ids]
+        columns = {
+            "price": array("d", (assets[asset_id].current_price for asset_id in asset_ids)),
+            "open": array("d", (bar.open for bar in histories)),
+            "high": array("d", (bar.high for bar in histories)),
+            "low": array("d", (bar.low for bar in histories)),
+            "event_impact": self._event_impacts(market, count),
+        }
+
+        layout = self._layout
+        header = layout.header
+        header[SEQ] += 1  # Непарне значення: запис триває
+        if ids_changed:
+            layout.asset_ids[:count] = array("q", asset_ids)
+        for field, values in columns.items():
+            layout.columns[field][:count] = values
+        header[DAY] = market.day
+        header[STATE] = STATE_IDS.get(type(market.current_state), -1)
+        header[TICK] = tick
+        header[COUNT] = count
+        header[SEQ] += 1  # Парне значення: знімок цілісний
+
+    def _event_impacts(self, market: 'Market', count: int) -> array:
+        impacts = array("d", bytes(count * SLOT_BYTES))
+        index = self._index
+        # Лише живі події: завершені, відпущені в масиви сховища, не обходяться
+        for event in market.events.active():
+            for asset_id in event.affected_assets:
+                position = index.get(asset_id)
+                if position is not None:
+                    impacts[position] += event.impact
+        return impacts
+
+    def close(self, unlink: bool = True) -> None:
+        self._layout.release()
+        try:
+            self.shm.close()
+        except BufferError:
+            pass  # Перегляди колонок ще використовуються - блок закриється разом з ними
+        if unlink:
+            self.shm.unlink()
+
+    def __getstate__(self):
+        # Зберігається лише ім'я блоку: гра, витіснена на диск, після відновлення пише в той самий блок
+        return {"capacity": self.capacity, "name": self.name}
+
+    def __setstate__(self, state) -> None:
+        self.capacity = state["capacity"]
+        try:
+            self.shm = shared_memory.SharedMemory(name=state["name"])
+        except FileNotFoundError:
+            self.shm = shared_memory.SharedMemory(name=state["name"], create=True,
+                                                  size=_segment_size(self.capacity))
+        self._open()
+
+
+class MarketSnapshotReader:
+    """Читання знімка в процесі-боті без копіювання даних"""
+
+    def __init__(self, name: str):
+        self.shm = _attach(name)
+        capacity = self.shm.buf[CAPACITY * SLOT_BYTES:(CAPACITY + 1) * SLOT_BYTES].cast("q")[0]
+        self._layout = _Layout(self.shm, capacity)
+
+    @property
+    def version(self) -> int:
+        return self._layout.header[SEQ]
+
+    @property
+    def day(self) -> int:
+        return self._layout.header[DAY]
+
+    @property
+    def state_id(self) -> int:
+        return self._layout.header[STATE]
+
+    @property
+    def tick(self) -> int:
+        return self._layout.header[TICK]
+
+    @property
+    def count(self) -> int:
+        return self._layout.header[COUNT]
+
+    @property
+    def asset_ids(self) -> memoryview:
+        return self._layout.asset_ids[:self.count]
+
+    def column(self, field: str) -> memoryview:
+        """Колонка індикатора без копіювання; читати її слід усередині read()"""
+        if field not in self._layout.columns:
+            raise ValueError(f"Невідоме поле знімка '{field}'")
+        return self._layout.columns[field][:self.count]
+
+    def read(self, func: Callable[['MarketSnapshotReader'], T], timeout: float = 1.0) -> T:
+        """Виклик func над цілісним знімком: повторюється, якщо під час читання відбувся запис"""
+        header = self._layout.header
+        deadline = time.monotonic() + timeout
+        while True:
+            start = header[SEQ]
+            if not start & 1:
+                result = func(self)
+                if header[SEQ] == start:
+                    return result
+            if time.monotonic() > deadline:
+                raise TimeoutError("Не вдалося прочитати цілісний знімок ринку")
+
+    def prices(self) -> Dict[int, float]:
+        """Копія цін цілісного знімка: ID активу -> ціна"""
+        return self.read(lambda reader: dict(zip(reader.asset_ids, reader.column("price"))))
+
+    def close(self) -> None:
+        self._layout.release()
+        try:
+            self.shm.close()
+        except BufferError:
+            pass
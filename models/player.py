@@ -1,19 +1,22 @@
-import uuid
-from datetime import datetime
-from typing import Dict, Tuple, TYPE_CHECKING
+from typing import Dict, Optional, Tuple, TYPE_CHECKING
 from patterns.observer import Observer, Subject
 from utils.enums import RumorType, TradeType
-from patterns.command import SpreadRumorCommand
+from patterns.command import SpreadRumorCommand, TradeCommand
 from patterns.strategy import TradingStrategy
+from utils.clock import DETACHED_CLOCK
+from utils.ids import Entity
 
 if TYPE_CHECKING:
     from models.asset import Asset
     from models.market import Market
+    from patterns.command import CommandBus
 
 
-class Investor:
-    def __init__(self, name: str, capital: float, risk_tolerance: float):
-        self.id = str(uuid.uuid4())
+class Investor(Entity):
+    __slots__ = ("name", "capital", "risk_tolerance", "investment_history", "satisfaction")
+
+    def __init__(self, name: str, capital: float, risk_tolerance: float, investor_id: Optional[str] = None):
+        self._assign_id(investor_id)  # Переданий рядковий ID стає зовнішнім псевдонімом
         self.name = name
         self.capital = capital
         self.risk_tolerance = risk_tolerance  # 0.0 (консервативний) до 1.0 (агресивний)
@@ -26,13 +29,13 @@ class Investor:
 
         self.capital -= amount
         player.receive_investment(self.id, amount)
-        self.investment_history.append((datetime.now(), amount, player.id))
+        self.investment_history.append((player.clock.now(), amount, player.id))
         return True
 
     def withdraw(self, player: 'Player', amount: float) -> bool:
         if player.return_investment(self.id, amount):
             self.capital += amount
-            self.investment_history.append((datetime.now(), -amount, player.id))
+            self.investment_history.append((player.clock.now(), -amount, player.id))
             return True
         return False
 
@@ -46,20 +49,25 @@ class Investor:
             self.satisfaction = max(0.0, self.satisfaction - 0.2)
 
 
-class Player(Observer):
-    def __init__(self, name: str, initial_capital: float):
-        self.id = str(uuid.uuid4())
+class Player(Observer, Entity):
+    __slots__ = ("name", "capital", "portfolio", "short_positions", "trade_history", "reputation",
+                 "investor_funds", "strategy", "game_over", "prison", "notifications", "clock", "committed_cash")
+
+    def __init__(self, name: str, initial_capital: float, player_id: Optional[str] = None):
+        self._assign_id(player_id)
         self.name = name
         self.capital = initial_capital
-        self.portfolio: Dict[str, float] = {}  # ID активу до кількості
-        self.short_positions: Dict[str, Tuple[float, float]] = {}  # ID активу до (кількість, ціна)
+        self.portfolio: Dict[int, float] = {}  # ID активу до кількості
+        self.short_positions: Dict[int, Tuple[float, float]] = {}  # ID активу до (кількість, ціна)
         self.trade_history = []
         self.reputation = 0.5  # 0.0 (кримінальний) до 1.0 (довірений)
-        self.investor_funds: Dict[str, float] = {}  # ID інвестора до інвестованої суми
+        self.investor_funds: Dict[int, float] = {}  # ID інвестора до інвестованої суми
         self.strategy = None
         self.game_over = False
         self.prison = False
         self.notifications = []
+        self.clock = DETACHED_CLOCK  # Ринок підставляє свій годинник, коли гравець на нього підписується
+        self.committed_cash = 0.0  # Готівка під прийняті, але ще не розраховані ордери шини команд
 
     def update(self, subject: Subject, **kwargs) -> None:
         # Реагування на оновлення ринку
@@ -76,10 +84,14 @@ class Player(Observer):
     def set_strategy(self, strategy: TradingStrategy) -> None:
         self.strategy = strategy
 
-    def execute_strategy(self, market: 'Market') -> None:
+    def execute_strategy(self, market: 'Market', bus: Optional['CommandBus'] = None) -> None:
+        """Команди стратегії виконуються одразу або стають у чергу шини команд"""
         if self.strategy:
             assets = list(market.assets.values())
             commands = self.strategy.execute(market, self, assets)
+            if bus is not None:
+                bus.submit_many(commands)
+                return
             for command in commands:
                 command.execute()
 
@@ -96,7 +108,7 @@ class Player(Observer):
             self.portfolio[asset.id] = quantity
 
         self.trade_history.append((
-            datetime.now(),
+            self.clock.now(),
             TradeType.BUY,
             asset.id,
             quantity,
@@ -116,7 +128,7 @@ class Player(Observer):
         self.capital += quantity * price
 
         self.trade_history.append((
-            datetime.now(),
+            self.clock.now(),
             TradeType.SELL,
             asset.id,
             quantity,
@@ -143,7 +155,7 @@ class Player(Observer):
             self.short_positions[asset.id] = (quantity, price)
 
         self.trade_history.append((
-            datetime.now(),
+            self.clock.now(),
             TradeType.SHORT,
             asset.id,
             quantity,
@@ -174,7 +186,7 @@ class Player(Observer):
             self.short_positions[asset.id] = (current_qty - quantity, short_price)
 
         self.trade_history.append((
-            datetime.now(),
+            self.clock.now(),
             TradeType.COVER,
             asset.id,
             quantity,
@@ -183,7 +195,7 @@ class Player(Observer):
 
         return True
 
-    def receive_investment(self, investor_id: str, amount: float) -> bool:
+    def receive_investment(self, investor_id: int, amount: float) -> bool:
         self.capital += amount
 
         if investor_id in self.investor_funds:
@@ -193,11 +205,11 @@ class Player(Observer):
 
         return True
 
-    def return_investment(self, investor_id: str, amount: float) -> bool:
+    def return_investment(self, investor_id: int, amount: float) -> bool:
         if investor_id not in self.investor_funds or self.investor_funds[investor_id] < amount:
             return False
 
-        if amount > self.capital:
+        if amount > self.capital - self.committed_cash:
             return False
 
         self.capital -= amount
@@ -247,22 +259,34 @@ class Player(Observer):
 
         return net_worth
 
-    def check_margin_call(self, market: 'Market') -> bool:
-        # Перевірка, чи не впав капітал нижче мінімальної застави для коротких позицій
-        required_margin = 0
+    def check_margin_call(self, market: 'Market', command_bus: Optional['CommandBus'] = None) -> bool:
+        """
+        Перевірка, чи не впав капітал нижче мінімальної застави для коротких позицій.
+        З відкладеним розрахунком позиції й готівка беруться з урахуванням нерозрахованих записів шини,
+        а ліквідація йде через шину: пряме закриття позиції, яку вже закриває запис, оплатилося б двічі.
+        """
+        deferred = command_bus is not None and command_bus.deferred
+        short_positions = command_bus.short_positions(self) if deferred else self.short_positions
+        capital = self.capital + command_bus.pending_cash(self) if deferred else self.capital
 
-        for asset_id, (quantity, _) in self.short_positions.items():
+        required_margin = 0
+        for asset_id, (quantity, _) in short_positions.items():
             if asset_id in market.assets:
                 required_margin += quantity * market.assets[asset_id].current_price * 0.4
 
-        if required_margin > 0 and self.capital < required_margin:
+        if required_margin > 0 and capital < required_margin:
             # Автоматична ліквідація коротких позицій
-            for asset_id, (quantity, _) in list(self.short_positions.items()):
+            for asset_id, (quantity, _) in list(short_positions.items()):
                 if asset_id in market.assets:
-                    self.cover_asset(market.assets[asset_id], quantity, market.assets[asset_id].current_price)
+                    asset = market.assets[asset_id]
+                    if deferred:
+                        command_bus.submit(TradeCommand(self, asset, TradeType.COVER, quantity, asset.current_price))
+                    else:
+                        self.cover_asset(asset, quantity, asset.current_price)
 
             # Перевірка банкрутства
-            if self.capital <= 0:
+            capital = self.capital + command_bus.pending_cash(self) if deferred else self.capital
+            if capital <= 0:
                 self.game_over = True
 
             return True
@@ -0,0 +1,308 @@
+from abc import ABC, abstractmethod
+from itertools import accumulate
+import math
+from operator import mul
+import random
+from typing import Dict, List, Optional, Sequence, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from models.market import Market
+    from utils.price_store import PriceStore
+
+
+class PriceModel(ABC):
+    """Джерело щоденного руху цін; без моделі ціни рухає поточний стан ринку"""
+
+    @abstractmethod
+    def update_prices(self, market: 'Market') -> None:
+        pass
+
+
+class HistoricalPriceModel(PriceModel):
+    """
+    Відтворення історичних цін закриття зі сховища PriceStore.
+
+    Щодня до ціни активу застосовується історична дохідність close[d] / close[d-1],
+    тому вплив подій і чуток накладається на історичний ряд і зберігається в ньому.
+    Активи, яких немає у сховищі, не рухаються. Коли дані закінчуються,
+    ціни знову рухає стан ринку.
+    """
+
+    def __init__(self, store: 'PriceStore', start_day: int = 0):
+        self.store = store
+        self.day = start_day
+        self._series: Dict[int, Optional[memoryview]] = {}
+        self._last_close: Dict[int, float] = {}
+
+    @property
+    def exhausted(self) -> bool:
+        return self.day + 1 >= self.store.num_days
+
+    def _lookup(self, asset) -> Optional[memoryview]:
+        if asset.id not in self._series:
+            self._series[asset.id] = self.store.series(asset.ticker) if asset.ticker in self.store else None
+        return self._series[asset.id]
+
+    def _close(self, series: memoryview, day: int) -> float:
+        # Останнє відоме значення до дня включно (пропуски в даних - NaN)
+        while day >= 0:
+            value = series[day]
+            if not math.isnan(value):
+                return value
+            day -= 1
+        return math.nan
+
+    def align_prices(self, market: 'Market') -> None:
+        """Встановлення поточних цін активів у історичні значення стартового дня"""
+        for asset in market.assets.values():
+            series = self._lookup(asset)
+            if series is not None:
+                close = self._close(series, self.day)
+                if not math.isnan(close):
+                    asset.set_price(close)
+                    self._last_close[asset.id] = close
+
+    def update_prices(self, market: 'Market') -> None:
+        if self.exhausted:
+            market.current_state.update_prices(market)
+            return
+
+        self.day += 1
+        for asset in market.assets.values():
+            series = self._lookup(asset)
+            if series is None:
+                continue
+
+            close = series[self.day]
+            if math.isnan(close):
+                continue
+
+            previous = self._last_close.get(asset.id)
+            if previous is None:
+                previous = self._close(series, self.day - 1)
+            self._last_close[asset.id] = close
+            if not math.isnan(previous):
+                asset.apply_return((close / previous - 1) * 100)
+
+    def __getstate__(self):
+        # Переглядів mmap у знімку немає - вони відновлюються з відкритого заново сховища
+        state = self.__dict__.copy()
+        state["_series"] = {}
+        return state
+
+
+class TickPriceModel(PriceModel):
+    """
+    Внутрішньоденний режим: кожен день розбивається на ticks_per_day тіків.
+
+    Шляхи цін на весь день генеруються пакетом - геометричний броунівський рух
+    з дрейфом і волатильністю поточного стану ринку, помноженими на чутливість
+    типу активу. Потім шляхи відтворюються тік за тіком, і після кожного тіку
+    спостерігачі ринку отримують повідомлення tick=<номер тіку>.
+    """
+
+    def __init__(self, ticks_per_day: int = 100):
+        if ticks_per_day < 1:
+            raise ValueError("Кількість тіків на день має бути додатною")
+        self.ticks_per_day = ticks_per_day
+        self.tick = 0
+
+    def generate_paths(self, market: 'Market') -> List[List[float]]:
+        """Ціни кожного активу на всі тіки дня (у порядку market.assets)"""
+        state = market.current_state
+        ticks = self.ticks_per_day
+        dt = 1.0 / ticks
+        gauss = random.gauss
+        paths = []
+
+        for asset in market.assets.values():
+            multiplier = asset.price_multiplier()
+            mu = state.drift / 100 * multiplier
+            sigma = state.volatility / 100 * multiplier
+            step_drift = (mu - sigma * sigma / 2) * dt
+            step_sigma = sigma * math.sqrt(dt)
+
+            price = asset.current_price
+            log_path = accumulate(step_drift + step_sigma * gauss(0.0, 1.0) for _ in range(ticks))
+            paths.append([price * math.exp(x) for x in log_path])
+
+        return paths
+
+    def update_prices(self, market: 'Market') -> None:
+        paths = self.generate_paths(market)
+        assets = list(market.assets.values())
+        last_tick = self.ticks_per_day - 1
+        snapshot_writer = market.snapshot_writer
+        clock = market.clock
+
+        for tick in range(self.ticks_per_day):
+            self.tick = clock.tick = tick
+            if tick == last_tick:
+                # Ціна закриття дня зберігається в історії як звичайна точка
+                for asset, path in zip(assets, paths):
+                    asset.set_price(path[tick])
+            else:
+                for asset, path in zip(assets, paths):
+                    asset.set_tick_price(path[tick])
+            if snapshot_writer is not None:
+                snapshot_writer.publish(market, tick)
+            market.notify(tick=tick, ticks=self.ticks_per_day)
+
+
+# Рядок розкладу: індекси незалежних нормальних величин і ваги, з якими вони входять у рух активу
+LoadingRow = Tuple[Tuple[int, ...], Tuple[float, ...]]
+
+
+def cholesky(matrix: Sequence[Sequence[float]]) -> List[List[float]]:
+    """Розклад Холецького; рядок i містить лише i + 1 ненульових елементів"""
+    lower: List[List[float]] = []
+    for i, row in enumerate(matrix):
+        current: List[float] = []
+        for j in range(i):
+            previous = lower[j]
+            current.append((row[j] - sum(map(mul, current, previous))) / previous[j])
+        pivot = row[i] - sum(map(mul, current, current))
+        if pivot <= 1e-12:
+            raise ValueError("Кореляційна матриця не є додатно визначеною")
+        current.append(math.sqrt(pivot))
+        lower.append(current)
+    return lower
+
+
+class CorrelatedPriceModel(PriceModel):
+    """
+    Корельовані щоденні зміни цін.
+
+    Структура кореляцій задається факторами (загальний ринок і тип активу) та,
+    за потреби, явними кореляціями пар тікерів або матрицею. Рух кожного активу -
+    факторний розклад (O(активів) на день). Для активів з явними кореляціями
+    власна складова замінюється блоком Холецького: розкладається лише різниця між
+    заданими кореляціями блоку і факторними, тож ціна - O(k^3) для k таких активів,
+    а кореляції з рештою ринку лишаються факторними. Якщо задані кореляції
+    несумісні з факторами, розкладається повна матриця - лише для ринків до
+    DENSE_LIMIT активів, більші отримують ValueError. Розклад кешується і
+    перераховується лише тоді, коли змінюється набір активів або структура
+    кореляцій. Дрейф і волатильність бере поточний стан ринку, чутливість - тип активу.
+    """
+
+    DENSE_LIMIT = 200  # Найбільший ринок, для якого допустимий розклад повної матриці O(N^3)
+
+    def __init__(self, market_correlation: float = 0.0, type_correlation: float = 0.0,
+                 pairs: Optional[Dict[Tuple[str, str], float]] = None,
+                 matrix: Optional[Tuple[List[str], List[List[float]]]] = None):
+        self.set_structure(market_correlation, type_correlation, pairs, matrix)
+
+    def set_structure(self, market_correlation: float = 0.0, type_correlation: float = 0.0,
+                      pairs: Optional[Dict[Tuple[str, str], float]] = None,
+                      matrix: Optional[Tuple[List[str], List[List[float]]]] = None) -> None:
+        if market_correlation < 0 or type_correlation < 0 or market_correlation + type_correlation > 1:
+            raise ValueError("Факторні кореляції мають бути невід'ємними і в сумі не більше 1")
+
+        overrides: Dict[Tuple[str, str], float] = {}
+        if matrix is not None:
+            tickers, values = matrix
+            for i, first in enumerate(tickers):
+                for j, second in enumerate(tickers):
+                    if i != j:
+                        overrides[first, second] = values[i][j]
+        for (first, second), value in (pairs or {}).items():
+            overrides[first, second] = overrides[second, first] = value
+        if any(not -1.0 <= value <= 1.0 for value in overrides.values()):
+            raise ValueError("Кореляції мають бути в межах від -1 до 1")
+
+        self.market_correlation = market_correlation
+        self.type_correlation = type_correlation
+        self.overrides = overrides
+        self._key = None
+        self._rows: List[LoadingRow] = []
+        self._factors = 0
+
+    def _correlation(self, first, second) -> float:
+        if first is second:
+            return 1.0
+        override = self.overrides.get((first.ticker, second.ticker))
+        if override is not None:
+            return override
+        same_type = type(first) is type(second)
+        return self.market_correlation + (self.type_correlation if same_type else 0.0)
+
+    def decompose(self, market: 'Market') -> List[LoadingRow]:
+        """Кешований розклад для поточного набору активів ринку"""
+        assets = list(market.assets.values())
+        key = tuple(asset.id for asset in assets)
+        if key == self._key:
+            return self._rows
+
+        tickers = {asset.ticker for asset in assets}
+        linked = {ticker for pair in self.overrides if pair[0] in tickers and pair[1] in tickers for ticker in pair}
+        block = [asset for asset in assets if asset.ticker in linked]
+        try:
+            rows, factors = self._factor_rows(assets, block)
+        except ValueError:
+            if len(assets) > self.DENSE_LIMIT:
+                raise ValueError(f"Явні кореляції несумісні з факторною структурою, а повний розклад "
+                                 f"допустимий лише для ринків до {self.DENSE_LIMIT} активів")
+            lower = cholesky([[self._correlation(a, b) for b in assets] for a in assets])
+            rows = [(tuple(range(len(row))), tuple(row)) for row in lower]
+            factors = len(assets)
+
+        self._key = key
+        self._rows = rows
+        self._factors = factors
+        return rows
+
+    def _factor_rows(self, assets: List, block: List) -> Tuple[List[LoadingRow], int]:
+        """
+        Незалежні величини: [ринок, тип 1..K, власні активів поза блоком, блок 1..k].
+        Власна складова активів блоку - рядок розкладу Холецького залишкових кореляцій
+        (задана кореляція мінус факторна), тож факторні кореляції з рештою ринку не змінюються.
+        """
+        types = {asset_type: 1 + i for i, asset_type in enumerate(dict.fromkeys(type(a) for a in assets))}
+        market_weight = math.sqrt(self.market_correlation)
+        type_weight = math.sqrt(self.type_correlation)
+        own_weight = math.sqrt(1.0 - self.market_correlation - self.type_correlation)
+
+        lower = []
+        if block:
+            own_variance = own_weight * own_weight
+            residual = [[self._correlation(a, b) - self.market_correlation
+                         - (self.type_correlation if type(a) is type(b) else 0.0) if a is not b else own_variance
+                         for b in block] for a in block]
+            lower = cholesky(residual)
+
+        block_rows = {asset.id: row for asset, row in zip(block, lower)}
+        offset = 1 + len(types)
+        block_offset = offset + len(assets) - len(block)
+        rows = []
+        own = offset
+        for asset in assets:
+            common = (0, types[type(asset)])
+            row = block_rows.get(asset.id)
+            if row is None:
+                rows.append((common + (own,), (market_weight, type_weight, own_weight)))
+                own += 1
+            else:
+                rows.append((common + tuple(range(block_offset, block_offset + len(row))),
+                             (market_weight, type_weight) + tuple(row)))
+        return rows, block_offset + len(block)
+
+    def draw(self, market: 'Market') -> List[float]:
+        """Корельовані стандартні нормальні величини для всіх активів (одне множення матриці на вектор)"""
+        rows = self.decompose(market)
+        gauss = random.gauss
+        normals = [gauss(0.0, 1.0) for _ in range(self._factors)]
+        pick = normals.__getitem__
+        return [sum(map(mul, weights, map(pick, indices))) for indices, weights in rows]
+
+    def update_prices(self, market: 'Market') -> None:
+        state = market.current_state
+        drift, volatility = state.drift, state.volatility
+        for asset, shock in zip(market.assets.values(), self.draw(market)):
+            asset.update_price(drift + volatility * shock)
+
+    def __getstate__(self):
+        # Розклад не зберігається у знімку - його дешевше перерахувати, ніж серіалізувати
+        state = self.__dict__.copy()
+        state["_key"] = None
+        state["_rows"] = []
+        return state
@@ -0,0 +1,165 @@
+"""
+Марковське перемикання режимів ринку.
+
+Режим (стан ринку) щодня змінюється за матрицею переходів: рядок i задає
+ймовірності перейти з режиму i в кожен режим наступного дня. Екземпляри
+станів - легковаговики (спільні для всіх ринків), двигун лише вибирає
+наступний. Для аналізу збираються статистики тривалості перебування в режимах,
+а для Монте-Карло двигун будує шляхи режимів для багатьох ринків наперед.
+"""
+
+from array import array
+from bisect import bisect_right
+from collections import deque
+from itertools import accumulate
+import random
+from typing import Deque, Dict, List, Optional, Sequence, Type, TYPE_CHECKING
+
+from patterns.state import MarketState, BullMarketState, BearMarketState, VolatileMarketState, state_instance
+
+if TYPE_CHECKING:
+    from models.market import Market
+
+DEFAULT_STATES = (BullMarketState, BearMarketState, VolatileMarketState)
+DEFAULT_SWITCH_CHANCE = 0.05  # Шанс щоденної зміни режиму за замовчуванням
+PROBABILITY_TOLERANCE = 1e-6
+
+
+def uniform_matrix(size: int, switch_chance: float = DEFAULT_SWITCH_CHANCE) -> List[List[float]]:
+    """Матриця, у якій режим зберігається з імовірністю 1 - switch_chance, а інші рівноймовірні"""
+    if size == 1:
+        return [[1.0]]
+    other = switch_chance / (size - 1)
+    return [[1.0 - switch_chance if i == j else other for j in range(size)] for i in range(size)]
+
+
+class RegimeEngine:
+    def __init__(self, states: Sequence[Type[MarketState]] = DEFAULT_STATES,
+                 matrix: Optional[Sequence[Sequence[float]]] = None):
+        states = tuple(states)
+        if not states:
+            raise ValueError("Потрібен хоча б один режим ринку")
+        if len(set(states)) != len(states):
+            raise ValueError("Режими ринку не мають повторюватися")
+        matrix = [list(map(float, row)) for row in (matrix if matrix is not None else uniform_matrix(len(states)))]
+        if len(matrix) != len(states) or any(len(row) != len(states) for row in matrix):
+            raise ValueError("Матриця переходів має бути квадратною за кількістю режимів")
+        for row in matrix:
+            if any(p < 0 for p in row) or abs(sum(row) - 1.0) > PROBABILITY_TOLERANCE:
+                raise ValueError("Рядки матриці переходів мають бути невід'ємними і в сумі давати 1")
+
+        self.states = states
+        self.matrix = matrix
+        self._index = {state: i for i, state in enumerate(states)}
+        # Накопичені ймовірності рядків: наступний режим - bisect рівномірного числа
+        self._cumulative = [list(accumulate(row)) for row in matrix]
+        for row in self._cumulative:
+            row[-1] = 1.0
+
+        self.scheduled: Deque[int] = deque()  # Заздалегідь змодельований шлях режимів
+        self._current: Optional[int] = None
+        self._dwell = 0
+        self.spells = [0] * len(states)  # Завершені періоди перебування в кожному режимі
+        self.spell_days = [0] * len(states)
+        self.transitions = [[0] * len(states) for _ in states]
+
+    def state(self, index: int) -> MarketState:
+        return state_instance(self.states[index])
+
+    def state_by_name(self, name: str) -> Optional[MarketState]:
+        for state_class in self.states:
+            state = state_instance(state_class)
+            if state.get_name() == name:
+                return state
+        return None
+
+    def index_of(self, state: MarketState) -> Optional[int]:
+        return self._index.get(type(state))
+
+    def next_index(self, index: int, u: float) -> int:
+        return bisect_right(self._cumulative[index], u)
+
+    def step(self, market: 'Market') -> None:
+        """Режим наступного дня; ринок змінює стан лише тоді, коли режим справді інший"""
+        index = self.index_of(market.current_state)
+        if index is None:
+            return  # Стан, якого двигун не знає, встановили вручну - він не перемикається
+
+        if index != self._current:
+            # Перший крок або стан змінили в обхід двигуна
+            self._close_spell()
+            self._current = index
+
+        next_index = self.scheduled.popleft() if self.scheduled else self.next_index(index, random.random())
+        self.transitions[index][next_index] += 1
+        self._dwell += 1
+
+        if next_index != index:
+            self._close_spell()
+            self._current = next_index
+            market.change_state(self.state(next_index))
+
+    def _close_spell(self) -> None:
+        if self._current is not None and self._dwell:
+            self.spells[self._current] += 1
+            self.spell_days[self._current] += self._dwell
+        self._dwell = 0
+
+    def schedule(self, path: Sequence[int]) -> None:
+        """Наступні дні пройдуть заданим шляхом режимів (наприклад, з simulate)"""
+        if any(not 0 <= index < len(self.states) for index in path):
+            raise ValueError("Невідомий номер режиму в шляху")
+        self.scheduled.extend(path)
+
+    def simulate(self, markets: int, days: int, start: Optional[Sequence[int]] = None,
+                 seed: Optional[int] = None) -> List[array]:
+        """
+        Шляхи режимів для markets незалежних ринків на days днів уперед.
+        Крок дня виконується для всіх ринків одразу; повертає масив номерів режимів для кожного ринку.
+        """
+        rng = random.Random(seed)
+        uniform = rng.random
+        cumulative = self._cumulative
+        current = list(start) if start is not None else [0] * markets
+        if len(current) != markets:
+            raise ValueError("Кількість початкових режимів не збігається з кількістю ринків")
+
+        by_day = []
+        for _ in range(days):
+            current = [bisect_right(cumulative[index], uniform()) for index in current]
+            by_day.append(current)
+        if not by_day:
+            return [array("b") for _ in range(markets)]
+        return [array("b", path) for path in zip(*by_day)]
+
+    def expected_dwell(self) -> List[float]:
+        """Теоретична середня тривалість режиму: 1 / (1 - p_ii)"""
+        return [float("inf") if row[i] >= 1.0 else 1.0 / (1.0 - row[i]) for i, row in enumerate(self.matrix)]
+
+    def stationary_distribution(self, iterations: int = 1000) -> List[float]:
+        """Частка днів у кожному режимі в довгостроковій перспективі (степеневий метод)"""
+        size = len(self.states)
+        distribution = [1.0 / size] * size
+        for _ in range(iterations):
+            updated = [sum(distribution[i] * self.matrix[i][j] for i in range(size)) for j in range(size)]
+            if max(abs(a - b) for a, b in zip(updated, distribution)) < 1e-12:
+                return updated
+            distribution = updated
+        return distribution
+
+    def dwell_statistics(self) -> Dict[str, Dict[str, float]]:
+        """Фактична і теоретична тривалість перебування в кожному режимі"""
+        stationary = self.stationary_distribution()
+        statistics = {}
+        for i, (state, expected) in enumerate(zip(self.states, self.expected_dwell())):
+            spells, days = self.spells[i], self.spell_days[i]
+            if i == self._current:
+                spells, days = spells + (1 if self._dwell else 0), days + self._dwell
+            statistics[state_instance(state).get_name()] = {
+                "spells": spells,
+                "days": days,
+                "mean_dwell": days / spells if spells else 0.0,
+                "expected_dwell": expected,
+                "stationary_share": stationary[i],
+            }
+        return statistics
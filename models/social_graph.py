@@ -0,0 +1,255 @@
+"""
+Поширення чуток соціальною мережею гравців і NPC.
+
+Мережа - розріджена матриця довіри у форматі CSR: ребро i -> j з вагою w
+означає, що вузол j чує чутки від i і довіряє йому з коефіцієнтом w. Перші
+вузли - гравці, решта - NPC-трейдери. Чутка, яку створив гравець, щодня
+проходить ще один крок мережею: сила переказу в кожному вузлі - добуток
+розрідженої матриці на розріджений вектор сил фронту, зменшений на
+HOP_DECAY. Вузли, до яких дійшла досить сильна чутка, вже її знають і далі
+лише передають. Правдоподібність чутки (Rumor.credibility) з кожним кроком
+не зростає, а вплив на ціну накопичується пропорційно частці мережі, яку чутка
+охопила за день. Викрита чутка далі не поширюється.
+"""
+
+from array import array
+from itertools import chain
+import random
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from models.event import Rumor
+    from models.market import Market
+    from models.player import Player
+
+HOP_DECAY = 0.7  # У скільки разів слабшає чутка з кожним переказом
+MIN_STRENGTH = 0.05  # Слабший переказ вузол ігнорує
+DEFAULT_DEGREE = 8  # Скільки слухачів має кожен вузол випадкової мережі
+TRUST_RANGE = (0.3, 1.0)
+GROWTH_RATIO = 0.25  # На яку частку росте мережа, коли для нового гравця немає вільного вузла NPC
+
+
+class SocialGraph:
+    """Орієнтований зважений граф у форматі CSR: слухачі вузла i - targets[offsets[i]:offsets[i + 1]]"""
+
+    def __init__(self, size: int, offsets: array, targets: array, weights: array):
+        if len(offsets) != size + 1 or len(targets) != len(weights) or offsets[-1] != len(targets):
+            raise ValueError("Некоректна структура CSR соціальної мережі")
+        self.size = size
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+
+    @classmethod
+    def from_edges(cls, size: int, edges: Iterable[Tuple[int, int, float]]) -> 'SocialGraph':
+        """Граф з ребер (від, до, довіра); ребра сортуються за вузлом-джерелом підрахунком"""
+        edges = list(edges)
+        counts = [0] * (size + 1)
+        for source, target, weight in edges:
+            if not (0 <= source < size and 0 <= target < size) or source == target:
+                raise ValueError(f"Некоректне ребро соціальної мережі {source} -> {target}")
+            if not 0.0 < weight <= 1.0:
+                raise ValueError("Довіра ребра має бути в межах (0, 1]")
+            counts[source + 1] += 1
+
+        offsets = array("q", counts)
+        for i in range(size):
+            offsets[i + 1] += offsets[i]
+
+        position = list(offsets[:size])
+        targets = array("q", bytes(8 * len(edges)))
+        weights = array("d", bytes(8 * len(edges)))
+        for source, target, weight in edges:
+            targets[position[source]] = target
+            weights[position[source]] = weight
+            position[source] += 1
+        return cls(size, offsets, targets, weights)
+
+    @classmethod
+    def random(cls, size: int, degree: int = DEFAULT_DEGREE, seed: Optional[int] = None) -> 'SocialGraph':
+        """Кожен вузол має degree випадкових слухачів з випадковою довірою"""
+        rng = random.Random(seed)
+        degree = min(degree, size - 1) if size > 1 else 0
+        low, high = TRUST_RANGE
+
+        targets = array("q")
+        weights = array("d")
+        offsets = array("q", [0])
+        for node in range(size):
+            # Вибірка з size - 1 вузлів зі зсувом, щоб не потрапити на себе
+            targets.extend(target + (target >= node) for target in rng.sample(range(size - 1), degree))
+            weights.extend(rng.uniform(low, high) for _ in range(degree))
+            offsets.append(len(targets))
+        return cls(size, offsets, targets, weights)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.targets)
+
+    def edges(self) -> Iterable[Tuple[int, int, float]]:
+        offsets, targets, weights = self.offsets, self.targets, self.weights
+        for source in range(self.size):
+            for k in range(offsets[source], offsets[source + 1]):
+                yield source, targets[k], weights[k]
+
+    def add_node(self, edges: Iterable[Tuple[int, int, float]]) -> int:
+        """Новий вузол з ребрами (від, до, довіра), що його торкаються; CSR перебудовується за O(ребер)"""
+        return self.add_nodes(1, edges)
+
+    def add_nodes(self, count: int, edges: Iterable[Tuple[int, int, float]]) -> int:
+        """count нових вузлів за одну перебудову CSR; повертає номер першого з них"""
+        node = self.size
+        graph = SocialGraph.from_edges(node + count, chain(self.edges(), edges))
+        self.size, self.offsets, self.targets, self.weights = graph.size, graph.offsets, graph.targets, graph.weights
+        return node
+
+    def spmv(self, vector: Dict[int, float]) -> Dict[int, float]:
+        """
+        Добуток транспонованої матриці довіри на розріджений вектор: y[j] = sum(w[i -> j] * x[i]).
+        Обходяться лише рядки ненульових елементів вектора, тож крок коштує O(ребер фронту).
+        """
+        offsets, targets, weights = self.offsets, self.targets, self.weights
+        result: Dict[int, float] = {}
+        get = result.get
+        for node, value in vector.items():
+            for k in range(offsets[node], offsets[node + 1]):
+                target = targets[k]
+                result[target] = get(target, 0.0) + weights[k] * value
+        return result
+
+
+class _Spread:
+    """Стан поширення однієї чутки: хто вже знає і хто переказує її наступним кроком"""
+
+    def __init__(self, rumor: 'Rumor', size: int, origin: int):
+        self.rumor = rumor
+        self.known = bytearray(size)
+        self.known[origin] = 1
+        self.reached = 1
+        self.frontier: Dict[int, float] = {origin: rumor.credibility}
+        self.hops = 0
+
+
+class RumorNetwork:
+    """Соціальна мережа ринку: перші вузли - гравці в заданому порядку, решта - NPC"""
+
+    def __init__(self, graph: SocialGraph, players: Sequence['Player'] = (), hop_decay: float = HOP_DECAY,
+                 min_strength: float = MIN_STRENGTH, seed: Optional[int] = None):
+        if len(players) > graph.size:
+            raise ValueError("Гравців більше, ніж вузлів соціальної мережі")
+        if not 0.0 < hop_decay <= 1.0:
+            raise ValueError("Згасання чутки має бути в межах (0, 1]")
+        self.graph = graph
+        self.hop_decay = hop_decay
+        self.min_strength = min_strength
+        self.players: List[Optional['Player']] = list(players) + [None] * (graph.size - len(players))
+        self.node_of: Dict[int, int] = {player.id: node for node, player in enumerate(players)}
+        self.spreads: Dict[int, _Spread] = {}  # ID чутки -> її поширення
+        self.rng = random.Random(seed)  # Зв'язки гравців, що приєднуються під час гри
+
+    @classmethod
+    def random(cls, players: Sequence['Player'], npcs: int = 0, degree: int = DEFAULT_DEGREE,
+               seed: Optional[int] = None, hop_decay: float = HOP_DECAY) -> 'RumorNetwork':
+        return cls(SocialGraph.random(len(players) + npcs, degree, seed), players, hop_decay, seed=seed)
+
+    def add_player(self, player: 'Player', degree: int = DEFAULT_DEGREE) -> int:
+        """
+        Вузол гравця, що приєднався під час гри: він займає вільний вузол NPC разом з його зв'язками.
+        Якщо таких немає, мережа росте на GROWTH_RATIO за одну перебудову CSR: гравець отримує перший
+        новий вузол, решта лишаються вільними вузлами NPC для наступних гравців. Кожен новий вузол
+        має до degree слухачів і degree джерел
+        """
+        node = self.node_of.get(player.id)
+        if node is not None:
+            return node
+
+        try:
+            node = self.players.index(None)
+        except ValueError:
+            node = self._grow(degree)
+
+        self.players[node] = player
+        self.node_of[player.id] = node
+        return node
+
+    def _grow(self, degree: int) -> int:
+        size = self.graph.size
+        count = max(1, int(size * GROWTH_RATIO))
+        new_size = size + count
+        degree = min(degree, new_size - 1)
+        low, high = TRUST_RANGE
+        rng = self.rng
+
+        # Ребра між новими вузлами можуть випасти двічі (слухач одного і джерело іншого) - лишається одне
+        edges: Dict[Tuple[int, int], float] = {}
+        for node in range(size, new_size):
+            for other in rng.sample(range(new_size - 1), degree):
+                edges.setdefault((node, other + (other >= node)), rng.uniform(low, high))
+            for other in rng.sample(range(new_size - 1), degree):
+                edges.setdefault((other + (other >= node), node), rng.uniform(low, high))
+
+        node = self.graph.add_nodes(count, ((source, target, weight) for (source, target), weight in edges.items()))
+        self.players.extend([None] * count)
+        for spread in self.spreads.values():
+            spread.known.extend(bytes(count))
+        return node
+
+    def start(self, market: 'Market', rumor: 'Rumor') -> bool:
+        """Чутку спершу знає лише її автор; False, якщо автора немає в мережі"""
+        origin = self.node_of.get(rumor.creator_id)
+        if origin is None:
+            return False
+        self.spreads[rumor.id] = _Spread(rumor, self.graph.size, origin)
+        player = self.players[origin]
+        player.update(market, rumor=rumor)
+        return True
+
+    def step(self, market: 'Market') -> int:
+        """Один крок поширення всіх чуток; повертає кількість вузлів, що дізналися про чутки"""
+        reached = 0
+        for rumor_id, spread in list(self.spreads.items()):
+            rumor = spread.rumor
+            if rumor.is_discovered:
+                del self.spreads[rumor_id]
+                continue
+
+            reached += self._advance(market, spread)
+            if not spread.frontier:
+                del self.spreads[rumor_id]
+        return reached
+
+    def _advance(self, market: 'Market', spread: _Spread) -> int:
+        known = spread.known
+        decay = self.hop_decay
+        threshold = self.min_strength
+
+        frontier = {}
+        for node, strength in self.graph.spmv(spread.frontier).items():
+            strength = min(1.0, strength) * decay
+            if strength >= threshold and not known[node]:
+                known[node] = 1
+                frontier[node] = strength
+        spread.frontier = frontier
+        spread.hops += 1
+        if not frontier:
+            return 0
+
+        spread.reached += len(frontier)
+        rumor = spread.rumor
+        # Правдоподібність - середня сила, з якою чутку почули на цьому кроці, але не вища, ніж була
+        rumor.credibility = min(rumor.credibility, sum(frontier.values()) / len(frontier))
+        # Вплив на ціну - пропорційно частці мережі, яку чутка охопила за день
+        rumor.reach = len(frontier) / self.graph.size
+        market.current_state.process_rumor(market, rumor)
+
+        players = self.players
+        for node in frontier:
+            player = players[node]
+            if player is not None:
+                player.update(market, rumor=rumor)
+        return len(frontier)
+
+    def coverage(self, rumor_id: int) -> Optional[float]:
+        """Частка мережі, яка вже знає чутку (None, якщо чутка більше не поширюється)"""
+        spread = self.spreads.get(rumor_id)
+        return spread.reached / self.graph.size if spread is not None else None
@@ -17,9 +17,18 @@ class GameStateAdapter:
             'rumors': []
         }
 
-        for asset in game.market.assets.values():
+        # Назовні сутності видно лише під рядковими псевдонімами, цілі ID живуть тільки в процесі
+        assets = game.market.assets
+        asset_aliases = {asset_id: asset.alias for asset_id, asset in assets.items()}
+        player_aliases = {player.id: player.alias for player in game.players}
+        investor_aliases = {investor.id: investor.alias for investor in game.investors}
+
+        def aliased(mapping: Dict, aliases: Dict) -> Dict:
+            return {aliases.get(key, key): value for key, value in mapping.items()}
+
+        for asset in assets.values():
             asset_data = {
-                'id': asset.id,
+                'id': asset.alias,
                 'name': asset.name,
                 'ticker': asset.ticker,
                 'current_price': asset.current_price,
@@ -30,13 +39,13 @@ class GameStateAdapter:
 
         for player in game.players:
             player_data = {
-                'id': player.id,
+                'id': player.alias,
                 'name': player.name,
                 'capital': player.capital,
-                'portfolio': player.portfolio,
-                'short_positions': player.short_positions,
+                'portfolio': aliased(player.portfolio, asset_aliases),
+                'short_positions': aliased(player.short_positions, asset_aliases),
                 'reputation': player.reputation,
-                'investor_funds': player.investor_funds,
+                'investor_funds': aliased(player.investor_funds, investor_aliases),
                 'game_over': player.game_over,
                 'prison': player.prison
             }
@@ -44,7 +53,7 @@ class GameStateAdapter:
 
         for investor in game.investors:
             investor_data = {
-                'id': investor.id,
+                'id': investor.alias,
                 'name': investor.name,
                 'capital': investor.capital,
                 'risk_tolerance': investor.risk_tolerance,
@@ -52,25 +61,24 @@ class GameStateAdapter:
             }
             game_state['investors'].append(investor_data)
 
-        for event in game.market.events:
-            if event.is_active():
-                event_data = {
-                    'id': event.id,
-                    'type': event.event_type.name,
-                    'title': event.title,
-                    'description': event.description,
-                    'impact': event.impact,
-                    'duration': event.duration,
-                    'remaining_duration': event.remaining_duration,
-                    'affected_assets': event.affected_assets
-                }
-                game_state['events'].append(event_data)
+        for event in game.market.events.active():
+            event_data = {
+                'id': event.alias,
+                'type': event.event_type.name,
+                'title': event.title,
+                'description': event.description,
+                'impact': event.impact,
+                'duration': event.duration,
+                'remaining_duration': event.remaining_duration,
+                'affected_assets': [asset_aliases.get(asset_id, asset_id) for asset_id in event.affected_assets]
+            }
+            game_state['events'].append(event_data)
 
         for rumor in game.market.rumors:
             rumor_data = {
-                'id': rumor.id,
-                'creator_id': rumor.creator_id,
-                'asset_id': rumor.asset_id,
+                'id': rumor.alias,
+                'creator_id': player_aliases.get(rumor.creator_id, rumor.creator_id),
+                'asset_id': asset_aliases.get(rumor.asset_id, rumor.asset_id),
                 'type': rumor.rumor_type.name,
                 'content': rumor.content,
                 'is_true': rumor.is_true,
@@ -79,28 +87,32 @@ class GameStateAdapter:
             }
             game_state['rumors'].append(rumor_data)
 
+        # Курсор історичних даних: після завантаження ціни продовжують ряд з того самого дня
+        from models.price_model import HistoricalPriceModel
+
+        if isinstance(game.market.price_model, HistoricalPriceModel):
+            game_state['historical_day'] = game.market.price_model.day
+
         return game_state
 
     @staticmethod
     def deserialize_game(game_state: Dict, game: 'TradingGame') -> None:
         """Відновлює стан гри з серіалізованого формату"""
-        from patterns.state import MarketState
         from models.asset import Asset
+        from models.price_model import HistoricalPriceModel
 
         game.market.day = game_state['day']
+        if 'historical_day' in game_state and isinstance(game.market.price_model, HistoricalPriceModel):
+            game.market.price_model.day = game_state['historical_day']
 
-        market_states = {
-            cls.get_name(): cls for cls in [
-                cls() for cls in MarketState.__subclasses__()
-            ]
-        }
+        regime = game.market.regime
+        state = regime.state_by_name(game_state['market_state'])
+        game.market.current_state = state if state is not None else regime.state(0)
 
-        if game_state['market_state'] in market_states:
-            game.market.current_state = market_states[game_state['market_state']]
-        else:
-            game.market.current_state = next(iter(market_states.values()))
+        # Активи, що вже є в грі, зберігають свої цілі ID - на них посилаються портфелі гравців
+        existing_ids = {asset.alias: asset.id for asset in game.market.assets.values()}
 
-        game.market.assets = {}
+        assets = {}
         for asset_data in game_state['assets']:
             asset_classes = {
                 cls.__name__: cls for cls in Asset.__subclasses__()
@@ -114,6 +126,10 @@ class GameStateAdapter:
                     asset_data['initial_price']
                 )
 
-                asset.id = asset_data['id']
+                asset.alias = asset_data['id']
+                asset.id = existing_ids.get(asset.alias, asset.id)
                 asset.current_price = asset_data['current_price']
-                game.market.assets[asset.id] = asset
+                assets[asset.id] = asset
+
+        # Заміна словника цілком збільшує версію набору активів ринку
+        game.market.assets = assets
@@ -1,4 +1,4 @@
-from typing import List, Dict, Tuple, TYPE_CHECKING
+from typing import List, Dict, Optional, Tuple, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from models.market import Market
@@ -37,6 +37,15 @@ class ScenarioBuilder:
         self.market.attach(player)
         return self
 
+    def add_players(self, players_data: List[Dict]) -> 'ScenarioBuilder':
+        """Масове додавання гравців: один виклик attach_many замість attach на кожного"""
+        from models.player import Player
+
+        players = [Player(data['name'], data['capital'], data.get('id')) for data in players_data]
+        self.players.extend(players)
+        self.market.attach_many(players)
+        return self
+
     def add_investor(self, name: str, capital: float, risk_tolerance: float) -> 'ScenarioBuilder':
         from models.player import Investor
 
@@ -44,6 +53,15 @@ class ScenarioBuilder:
         self.investors.append(investor)
         return self
 
+    def add_investors(self, investors_data: List[Dict]) -> 'ScenarioBuilder':
+        from models.player import Investor
+
+        self.investors.extend(
+            Investor(data['name'], data['capital'], data['risk_tolerance'], data.get('id'))
+            for data in investors_data
+        )
+        return self
+
     def add_assets(self, assets_data: List[Dict]) -> 'ScenarioBuilder':
         from patterns.factory import AssetFactory
 
@@ -52,7 +70,8 @@ class ScenarioBuilder:
                 asset_type=data['type'],
                 name=data['name'],
                 ticker=data['ticker'],
-                initial_price=data['price']
+                initial_price=data['price'],
+                asset_id=data.get('id')  # Готовий ID дозволяє обійтися без uuid4 на кожен актив
             )
             self.market.add_asset(asset)
         return self
@@ -67,10 +86,62 @@ class ScenarioBuilder:
                 description=data['description'],
                 impact=data['impact'],
                 duration=data['duration'],
-                affected_assets=data['affected_assets']
+                affected_assets=data['affected_assets'],
+                event_id=data.get('id')
             )
             self.events.append(event)
         return self
 
+    def add_events_by_ticker(self, events_data: List[Dict]) -> 'ScenarioBuilder':
+        """Події, що посилаються на вже додані активи за тікером, а не за ID"""
+        tickers = {asset.ticker: asset.id for asset in self.market.assets.values()}
+        return self.add_events([
+            dict(data, affected_assets=[tickers[ticker] for ticker in data.get('affected_assets', [])])
+            for data in events_data
+        ])
+
+    def set_correlation(self, market: float = 0.0, asset_type: float = 0.0,
+                        pairs: Optional[List[Tuple[str, str, float]]] = None,
+                        matrix: Optional[Dict] = None) -> 'ScenarioBuilder':
+        """
+        Корельований рух цін: загальний ринковий фактор, фактор типу активу,
+        явні кореляції пар тікерів і/або матриця {"tickers": [...], "values": [[...]]}
+        """
+        from models.price_model import CorrelatedPriceModel
+
+        model = CorrelatedPriceModel(
+            market_correlation=market,
+            type_correlation=asset_type,
+            pairs={(first, second): value for first, second, value in pairs or []},
+            matrix=(matrix['tickers'], matrix['values']) if matrix else None
+        )
+        model.decompose(self.market)  # Некоректна структура кореляцій виявляється одразу
+        self.market.price_model = model
+        return self
+
+    def set_social_network(self, npcs: int = 0, degree: int = 8, seed: Optional[int] = None,
+                           hop_decay: float = 0.7) -> 'ScenarioBuilder':
+        """Випадкова мережа довіри між уже доданими гравцями і npcs NPC-трейдерами для поширення чуток"""
+        from models.social_graph import RumorNetwork
+
+        self.market.social = RumorNetwork.random(self.players, npcs, degree, seed, hop_decay)
+        return self
+
+    def load_spec(self, spec: Dict) -> 'ScenarioBuilder':
+        """Наповнення сценарію з декларативного опису (вміст JSON/TOML-файлу сценарію)"""
+        from utils.enums import AssetType, EventType
+
+        self.add_players(spec.get('players', []))
+        self.add_assets([dict(data, type=AssetType[data['type']]) for data in spec.get('assets', [])])
+        self.add_investors(spec.get('investors', []))
+
+        self.add_events_by_ticker([dict(data, type=EventType[data['type']]) for data in spec.get('events', [])])
+
+        if 'correlation' in spec:
+            self.set_correlation(**spec['correlation'])
+        if 'social' in spec:
+            self.set_social_network(**spec['social'])
+        return self
+
     def build(self) -> Tuple['Market', List['Player'], List['Investor'], List['Event']]:
         return self.market, self.players, self.investors, self.events
@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
+from collections import deque
 import uuid
-from typing import TYPE_CHECKING
+from typing import Deque, Dict, Iterable, List, Optional, Set, Tuple, TYPE_CHECKING
 
 from utils.enums import TradeType, RumorType
 
@@ -71,3 +72,303 @@ class SpreadRumorCommand(Command):
             self.executed = True
             return True
         return False
+
+
+# Запис журналу угод: (ID гравця, ID активу, тип угоди, кількість, ціна)
+LedgerEntry = Tuple[int, int, TradeType, float, float]
+NET_EPSILON = 1e-9  # Залишок нетування, менший за цей, вважається нулем
+
+
+class SettlementRecord:
+    """Нетований підсумок усіх угод гравця з одним активом до розрахунку"""
+
+    def __init__(self, player: 'Player', asset_id: int, long_delta: float, short_delta: float,
+                 short_price: float, cash_delta: float, price: float):
+        self.player = player
+        self.asset_id = asset_id
+        self.long_delta = long_delta
+        self.short_delta = short_delta
+        self.short_price = short_price  # Середня ціна короткої позиції після розрахунку
+        self.cash_delta = cash_delta
+        self.price = price  # Ціна останньої угоди
+
+    def ledger_entries(self) -> List[LedgerEntry]:
+        entries = []
+        if self.long_delta > NET_EPSILON:
+            entries.append((self.player.id, self.asset_id, TradeType.BUY, self.long_delta, self.price))
+        elif self.long_delta < -NET_EPSILON:
+            entries.append((self.player.id, self.asset_id, TradeType.SELL, -self.long_delta, self.price))
+        if self.short_delta > NET_EPSILON:
+            entries.append((self.player.id, self.asset_id, TradeType.SHORT, self.short_delta, self.price))
+        elif self.short_delta < -NET_EPSILON:
+            entries.append((self.player.id, self.asset_id, TradeType.COVER, -self.short_delta, self.price))
+        return entries
+
+
+class SettlementBatch:
+    """Результат одного розрахунку шини команд"""
+
+    def __init__(self):
+        self.ledger: List[LedgerEntry] = []
+        self.records: List[SettlementRecord] = []
+        self.notifications: Dict[int, str] = {}  # ID гравця до підсумкового повідомлення
+        self.accepted = 0
+        self.rejected = 0
+
+
+class _BookEntry:
+    def __init__(self, asset: 'Asset', long_qty: float, short_qty: float, short_price: float):
+        self.asset = asset
+        self.start_long = self.long = long_qty
+        self.start_short = self.short = short_qty
+        self.short_price = short_price
+        self.cash = 0.0
+        self.price = asset.current_price
+
+
+class _OrderBook:
+    """Позиції гравця з урахуванням нерозрахованих угод, на яких перевіряються його ордери до розрахунку"""
+
+    def __init__(self, player: 'Player', projected_cash: float):
+        self.player = player
+        self.projected_cash = projected_cash  # Зміна готівки від ще не розрахованих записів попередніх днів
+        self.cash = 0.0  # Зміна готівки від ордерів, прийнятих з останнього settle()
+        self.entries: Dict[int, _BookEntry] = {}
+        self.accepted = 0
+        self.rejected = 0
+
+    def validate(self, command: TradeCommand, entry: _BookEntry) -> bool:
+        quantity = command.quantity
+        price = command.asset.current_price
+        trade_type = command.trade_type
+        cash_change = None
+        # Жива готівка: гравець міг витратити її на дії поза шиною після подання попередніх ордерів
+        cash = self.player.capital + self.projected_cash + self.cash
+
+        if quantity <= 0:
+            pass
+        elif trade_type == TradeType.BUY:
+            if quantity * price <= cash:
+                cash_change = -quantity * price
+                entry.long += quantity
+        elif trade_type == TradeType.SELL:
+            if entry.long >= quantity:
+                cash_change = quantity * price
+                entry.long -= quantity
+        elif trade_type == TradeType.SHORT:
+            # Застава - 50% позиції, як у Player.short_asset
+            if quantity * price * 0.5 <= cash:
+                cash_change = -quantity * price * 0.5
+                total = entry.short + quantity
+                entry.short_price = (entry.short * entry.short_price + quantity * price) / total
+                entry.short = total
+        elif trade_type == TradeType.COVER:
+            if quantity <= entry.short:
+                cash_change = quantity * entry.short_price * 0.5 + quantity * (entry.short_price - price)
+                entry.short -= quantity
+
+        if cash_change is None:
+            self.rejected += 1
+            return False
+
+        self.cash += cash_change
+        entry.cash += cash_change
+        entry.price = price
+        self.accepted += 1
+        return True
+
+    def records(self) -> List[SettlementRecord]:
+        records = []
+        for asset_id, entry in self.entries.items():
+            long_delta = entry.long - entry.start_long
+            short_delta = entry.short - entry.start_short
+            if abs(long_delta) > NET_EPSILON or abs(short_delta) > NET_EPSILON or abs(entry.cash) > NET_EPSILON:
+                records.append(SettlementRecord(self.player, asset_id, long_delta, short_delta,
+                                                entry.short_price, entry.cash, entry.price))
+        return records
+
+
+class CommandBus:
+    """
+    Черги торгових ордерів гравців з пакетним нетуванням і розрахунком.
+
+    Ордер перевіряється одразу під час подання - на знімку готівки й позицій
+    гравця з урахуванням уже прийнятих, але ще не розрахованих ордерів, - і
+    виконується за поточною ціною активу. Під час settle() усі прийняті ордери
+    гравця з одним активом нетуються в один запис розрахунку; журнал угод і
+    повідомлення гравцям формуються одним пакетом.
+
+    settlement_days задає відкладений розрахунок T+N: записи дня day змінюють
+    готівку й позиції гравців лише в apply_due(day + N). None або 0 - записи
+    застосовуються одразу під час settle(). Поки запис не розраховано, його
+    позиції не входять у чисту вартість гравця, а готівка, яку він забрав,
+    зарезервована (Player.committed_cash) і недоступна для дій поза шиною.
+    """
+
+    def __init__(self, settlement_days: Optional[int] = None):
+        self.settlement_days = settlement_days
+        self.books: Dict[int, _OrderBook] = {}
+        self.unsettled: Deque[Tuple[int, List[SettlementRecord]]] = deque()  # (день розрахунку, записи)
+        self.last_batch = SettlementBatch()
+        # Очікуваний стан з урахуванням нерозрахованих записів
+        self._projected_cash: Dict[int, float] = {}
+        self._projected_positions: Dict[Tuple[int, int], Tuple[float, float, float]] = {}
+        self._unsettled_counts: Dict[Tuple[int, int], int] = {}
+        self._projected_assets: Dict[int, Set[int]] = {}  # ID гравця до активів з нерозрахованими записами
+
+    @property
+    def deferred(self) -> bool:
+        """Чи йдуть ручні угоди гравців через шину, а не виконуються одразу"""
+        return self.settlement_days is not None
+
+    def submit(self, command: TradeCommand) -> bool:
+        player = command.player
+        book = self.books.get(player.id)
+        if book is None:
+            book = self.books[player.id] = _OrderBook(player, self._projected_cash.get(player.id, 0.0))
+
+        asset = command.asset
+        entry = book.entries.get(asset.id)
+        if entry is None:
+            entry = book.entries[asset.id] = _BookEntry(asset, *self._position(player, asset.id))
+
+        command.executed = book.validate(command, entry)
+        self._reserve(player)
+        return command.executed
+
+    def submit_many(self, commands: Iterable[TradeCommand]) -> None:
+        for command in commands:
+            self.submit(command)
+
+    def _position(self, player: 'Player', asset_id: int) -> Tuple[float, float, float]:
+        projected = self._projected_positions.get((player.id, asset_id))
+        if projected is not None:
+            return projected
+        short_qty, short_price = player.short_positions.get(asset_id, (0, 0.0))
+        return player.portfolio.get(asset_id, 0), short_qty, short_price
+
+    def short_positions(self, player: 'Player') -> Dict[int, Tuple[float, float]]:
+        """Короткі позиції гравця з урахуванням прийнятих ордерів і ще не розрахованих записів"""
+        positions = dict(player.short_positions)
+        book = self.books.get(player.id)
+        asset_ids = set(self._projected_assets.get(player.id, ()))
+        if book is not None:
+            asset_ids.update(book.entries)
+        for asset_id in asset_ids:
+            entry = book.entries.get(asset_id) if book is not None else None
+            if entry is not None:
+                quantity, price = entry.short, entry.short_price
+            else:
+                _, quantity, price = self._projected_positions[player.id, asset_id]
+            if quantity > NET_EPSILON:
+                positions[asset_id] = (quantity, price)
+            else:
+                positions.pop(asset_id, None)
+        return positions
+
+    def pending_cash(self, player: 'Player') -> float:
+        """Зміна готівки гравця, яку ще внесуть прийняті ордери і нерозраховані записи"""
+        book = self.books.get(player.id)
+        return self._projected_cash.get(player.id, 0.0) + (book.cash if book is not None else 0.0)
+
+    def pending(self) -> int:
+        return sum(book.accepted + book.rejected for book in self.books.values())
+
+    def settle(self, day: int = 0) -> SettlementBatch:
+        """Нетування поданих ордерів; записи розраховуються в день day + settlement_days"""
+        batch = SettlementBatch()
+        books, self.books = self.books, {}
+
+        for player_id, book in books.items():
+            batch.accepted += book.accepted
+            batch.rejected += book.rejected
+            batch.records.extend(book.records())
+            message = f"ОРДЕРИ: виконано {book.accepted}"
+            if book.rejected:
+                message += f", відхилено {book.rejected}"
+            batch.notifications[player_id] = message
+
+        for record in batch.records:
+            batch.ledger.extend(record.ledger_entries())
+
+        if self.settlement_days:
+            self._defer(day + self.settlement_days, books, batch.records)
+        else:
+            self._apply(batch.records)
+
+        for player_id, message in batch.notifications.items():
+            player = books[player_id].player
+            player.notifications.append(message)
+            self._reserve(player)
+
+        self.last_batch = batch
+        return batch
+
+    def _defer(self, due_day: int, books: Dict[int, _OrderBook], records: List[SettlementRecord]) -> None:
+        if not records:
+            return
+        self.unsettled.append((due_day, records))
+        for record in records:
+            player_id = record.player.id
+            key = (player_id, record.asset_id)
+            entry = books[player_id].entries[record.asset_id]
+            self._projected_positions[key] = (entry.long, entry.short, entry.short_price)
+            self._unsettled_counts[key] = self._unsettled_counts.get(key, 0) + 1
+            self._projected_assets.setdefault(player_id, set()).add(record.asset_id)
+            self._projected_cash[player_id] = self._projected_cash.get(player_id, 0.0) + record.cash_delta
+
+    def apply_due(self, day: int) -> int:
+        """Розрахунок усіх записів, чий день настав; повертає їх кількість"""
+        applied = 0
+        while self.unsettled and self.unsettled[0][0] <= day:
+            _, records = self.unsettled.popleft()
+            self._apply(records)
+            applied += len(records)
+
+            for record in records:
+                player_id = record.player.id
+                key = (player_id, record.asset_id)
+                self._unsettled_counts[key] -= 1
+                if not self._unsettled_counts[key]:
+                    del self._unsettled_counts[key]
+                    del self._projected_positions[key]
+                    assets = self._projected_assets[player_id]
+                    assets.discard(record.asset_id)
+                    if not assets:
+                        del self._projected_assets[player_id]
+                remaining = self._projected_cash[player_id] - record.cash_delta
+                if abs(remaining) > NET_EPSILON:
+                    self._projected_cash[player_id] = remaining
+                else:
+                    del self._projected_cash[player_id]
+                self._reserve(record.player)
+        return applied
+
+    def _reserve(self, player: 'Player') -> None:
+        """Готівка, яку нерозраховані ордери гравця вже забрали, недоступна для дій поза шиною"""
+        player.committed_cash = max(0.0, -self.pending_cash(player))
+
+    @staticmethod
+    def _apply(records: List[SettlementRecord]) -> None:
+        """Один прохід по записах: готівка, позиції і рядок історії на кожну чисту угоду"""
+        for record in records:
+            player = record.player
+            asset_id = record.asset_id
+            player.capital += record.cash_delta
+
+            if abs(record.long_delta) > NET_EPSILON:
+                quantity = player.portfolio.get(asset_id, 0) + record.long_delta
+                if quantity > NET_EPSILON:
+                    player.portfolio[asset_id] = quantity
+                else:
+                    player.portfolio.pop(asset_id, None)
+
+            if abs(record.short_delta) > NET_EPSILON:
+                quantity = player.short_positions.get(asset_id, (0, 0.0))[0] + record.short_delta
+                if quantity > NET_EPSILON:
+                    player.short_positions[asset_id] = (quantity, record.short_price)
+                else:
+                    player.short_positions.pop(asset_id, None)
+
+            for _, _, trade_type, quantity, price in record.ledger_entries():
+                player.trade_history.append((player.clock.now(), trade_type, asset_id, quantity, price))
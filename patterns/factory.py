@@ -1,5 +1,5 @@
 import random
-from typing import TYPE_CHECKING
+from typing import List, Optional, Tuple, TYPE_CHECKING
 
 from utils.enums import AssetType, EventType
 
@@ -12,68 +12,79 @@ if TYPE_CHECKING:
 class AssetFactory:
     @staticmethod
     def create_asset(asset_type: AssetType, name: str, ticker: str,
-                     initial_price: float) -> 'Asset':
+                     initial_price: float, asset_id: Optional[str] = None) -> 'Asset':
         from models.asset import Stock, Cryptocurrency, ForexPair, Commodity
 
         if asset_type == AssetType.STOCK:
-            return Stock(name, ticker, initial_price)
+            return Stock(name, ticker, initial_price, asset_id)
         elif asset_type == AssetType.CRYPTO:
-            return Cryptocurrency(name, ticker, initial_price)
+            return Cryptocurrency(name, ticker, initial_price, asset_id)
         elif asset_type == AssetType.FOREX:
-            return ForexPair(name, ticker, initial_price)
+            return ForexPair(name, ticker, initial_price, asset_id)
         elif asset_type == AssetType.COMMODITY:
-            return Commodity(name, ticker, initial_price)
+            return Commodity(name, ticker, initial_price, asset_id)
         else:
             raise ValueError(f"Непідтримуваний тип активу: {asset_type}")
 
 
+# Заголовки випадкових подій кожного типу
+EVENT_TITLES = {
+    EventType.POLITICAL: (
+        "Оголошено результати виборів",
+        "Нова торгова політика",
+        "Політичні заворушення",
+        "Міжнародний конфлікт"
+    ),
+    EventType.ECONOMIC: (
+        "Зміна процентної ставки",
+        "Звіт про зростання ВВП",
+        "Дані про безробіття",
+        "Сплеск інфляції"
+    ),
+    EventType.TECHNOLOGICAL: (
+        "Оголошено про великі інновації",
+        "Порушення кібербезпеки",
+        "Нове технологічне регулювання",
+        "Запуск продукту"
+    ),
+    EventType.COMPANY: (
+        "Відставка CEO",
+        "Звіт про прибутки",
+        "Оголошення про злиття",
+        "Відкликання продукту"
+    ),
+}
+EVENT_TYPES = tuple(EventType)
+# Заздалегідь підготовлені шаблони (заголовок, опис) - не перебудовуються для кожної події
+EVENT_TEMPLATES = {
+    event_type: tuple((title, f"{title}: Ця подія суттєво впливає на ринки.") for title in titles)
+    for event_type, titles in EVENT_TITLES.items()
+}
+RANDOM_EVENT_CHANCE = 0.3  # Шанс нової випадкової події щодня
+MAX_AFFECTED_ASSETS = 5
+
+
 class EventFactory:
     @staticmethod
     def create_random_event(market: 'Market') -> 'Event':
+        return EventFactory._random_event(market.asset_ids())
+
+    @staticmethod
+    def _random_event(asset_ids: List[int]) -> 'Event':
         from models.event import Event
 
-        event_type = random.choice(list(EventType))
+        event_type = random.choice(EVENT_TYPES)
 
         severity = random.uniform(0.1, 1.0)
         duration = random.randint(1, 10)
 
-        asset_count = random.randint(1, min(5, len(market.assets)))
-        affected_assets = random.sample(list(market.assets.keys()), asset_count)
+        # Вибірка індексів з range не копіює список ID активів
+        asset_count = random.randint(1, min(MAX_AFFECTED_ASSETS, len(asset_ids)))
+        affected_assets = [asset_ids[i] for i in random.sample(range(len(asset_ids)), asset_count)]
 
         impact = severity * (-1 if random.random() < 0.5 else 1)
 
-        titles = []
-        if event_type == EventType.POLITICAL:
-            titles = [
-                "Оголошено результати виборів",
-                "Нова торгова політика",
-                "Політичні заворушення",
-                "Міжнародний конфлікт"
-            ]
-        elif event_type == EventType.ECONOMIC:
-            titles = [
-                "Зміна процентної ставки",
-                "Звіт про зростання ВВП",
-                "Дані про безробіття",
-                "Сплеск інфляції"
-            ]
-        elif event_type == EventType.TECHNOLOGICAL:
-            titles = [
-                "Оголошено про великі інновації",
-                "Порушення кібербезпеки",
-                "Нове технологічне регулювання",
-                "Запуск продукту"
-            ]
-        elif event_type == EventType.COMPANY:
-            titles = [
-                "Відставка CEO",
-                "Звіт про прибутки",
-                "Оголошення про злиття",
-                "Відкликання продукту"
-            ]
-
-        title = random.choice(titles)
-        description = f"{title}: Ця подія суттєво впливає на ринки."
+        title, description = random.choice(EVENT_TEMPLATES[event_type])
 
         return Event(
             event_type=event_type,
@@ -83,3 +94,14 @@ class EventFactory:
             duration=duration,
             affected_assets=affected_assets
         )
+
+    @staticmethod
+    def create_random_events(market: 'Market', start_day: int, days: int) -> List[Tuple[int, 'Event']]:
+        """Випадкові події для блоку днів [start_day, start_day + days) - по одній події в дні, коли вона сталася"""
+        asset_ids = market.asset_ids()
+        if not asset_ids:
+            return []
+
+        chance = random.random
+        event_days = [start_day + offset for offset in range(days) if chance() < RANDOM_EVENT_CHANCE]
+        return [(day, EventFactory._random_event(asset_ids)) for day in event_days]
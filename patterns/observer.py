@@ -1,8 +1,10 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Iterable, List
 
 
 class Observer(ABC):
+    __slots__ = ()
+
     @abstractmethod
     def update(self, subject: 'Subject', **kwargs) -> None:
         pass
@@ -16,6 +18,14 @@ class Subject(ABC):
         if observer not in self._observers:
             self._observers.append(observer)
 
+    def attach_many(self, observers: Iterable[Observer]) -> None:
+        # Одна перевірка на дублікати для всієї групи замість лінійного пошуку на кожного
+        attached = {id(observer) for observer in self._observers}
+        for observer in observers:
+            if id(observer) not in attached:
+                attached.add(id(observer))
+                self._observers.append(observer)
+
     def detach(self, observer: Observer) -> None:
         if observer in self._observers:
             self._observers.remove(observer)
@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
 import random
-from typing import TYPE_CHECKING
+from typing import Dict, Type, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from models.market import Market
@@ -8,6 +8,21 @@ if TYPE_CHECKING:
 
 
 class MarketState(ABC):
+    # Діапазон щоденної зміни ціни у відсотках (рівномірний розподіл)
+    CHANGE_RANGE = (-1.0, 1.0)
+
+    @property
+    def drift(self) -> float:
+        """Середня щоденна зміна ціни у відсотках"""
+        low, high = self.CHANGE_RANGE
+        return (low + high) / 2
+
+    @property
+    def volatility(self) -> float:
+        """Стандартне відхилення щоденної зміни ціни у відсотках"""
+        low, high = self.CHANGE_RANGE
+        return (high - low) / 12 ** 0.5
+
     @abstractmethod
     def update_prices(self, market: 'Market') -> None:
         pass
@@ -24,13 +39,19 @@ class MarketState(ABC):
     def get_name(self) -> str:
         pass
 
+    def __reduce__(self):
+        # Після відновлення з pickle ринок знову посилається на спільний екземпляр стану
+        return state_instance, (type(self),)
+
 
 class BullMarketState(MarketState):
+    CHANGE_RANGE = (-0.5, 1.5)
+
     def update_prices(self, market: 'Market') -> None:
         # У бичачому ринку ціни мають тенденцію до зростання
         for asset in market.assets.values():
             # Більше активів зростають, ніж падають, з більшою амплітудою
-            change = random.uniform(-0.5, 1.5)
+            change = random.uniform(*self.CHANGE_RANGE)
             asset.update_price(change)
 
     def process_event(self, market: 'Market', event: 'Event') -> None:
@@ -59,11 +80,13 @@ class BullMarketState(MarketState):
 
 
 class BearMarketState(MarketState):
+    CHANGE_RANGE = (-1.0, 4.0)
+
     def update_prices(self, market: 'Market') -> None:
         # У ведмежому ринку ціни мають тенденцію до падіння
         for asset in market.assets.values():
             # Більше активів падають, ніж зростають, з більшою амплітудою
-            change = random.uniform(-1.0, 4.0)
+            change = random.uniform(*self.CHANGE_RANGE)
             asset.update_price(change)
 
     def process_event(self, market: 'Market', event: 'Event') -> None:
@@ -92,11 +115,13 @@ class BearMarketState(MarketState):
 
 
 class VolatileMarketState(MarketState):
+    CHANGE_RANGE = (-2.0, 2.0)
+
     def update_prices(self, market: 'Market') -> None:
         # У волатильному ринку ціни змінюються драматично
         for asset in market.assets.values():
             # Значні коливання в обох напрямках
-            change = random.uniform(-2.0, 2.0)
+            change = random.uniform(*self.CHANGE_RANGE)
             asset.update_price(change)
 
     def process_event(self, market: 'Market', event: 'Event') -> None:
@@ -115,3 +140,14 @@ class VolatileMarketState(MarketState):
 
     def get_name(self) -> str:
         return "Волатильний"
+
+
+# Стани ринку не мають власних даних - один екземпляр кожного класу спільний для всіх ринків
+_FLYWEIGHTS: Dict[Type[MarketState], MarketState] = {}
+
+
+def state_instance(state_class: Type[MarketState]) -> MarketState:
+    state = _FLYWEIGHTS.get(state_class)
+    if state is None:
+        state = _FLYWEIGHTS[state_class] = state_class()
+    return state
@@ -0,0 +1,77 @@
+import math
+import random
+import statistics
+import unittest
+
+from game.analytics import RiskTracker, RiskAnalytics, VAR_Z_SCORE
+from game.interface import TextInterface
+from game.scenario import create_default_scenario
+from game.trading_game import TradingGame
+
+
+class TestRiskTracker(unittest.TestCase):
+    def setUp(self):
+        random.seed(3)
+        self.tracker = RiskTracker(window=20)
+        self.equity = [1000.0]
+        for _ in range(60):
+            self.equity.append(self.equity[-1] * (1 + random.gauss(0.001, 0.02)))
+        for value in self.equity:
+            self.tracker.record(value)
+        self.returns = [b / a - 1 for a, b in zip(self.equity, self.equity[1:])][-20:]
+
+    def test_rolling_statistics_match_window(self):
+        self.assertEqual(self.tracker.samples, 20)
+        self.assertAlmostEqual(self.tracker.mean_return(), statistics.mean(self.returns))
+        self.assertAlmostEqual(self.tracker.volatility(), statistics.stdev(self.returns))
+        expected_sharpe = statistics.mean(self.returns) / statistics.stdev(self.returns) * math.sqrt(252)
+        self.assertAlmostEqual(self.tracker.sharpe(), expected_sharpe)
+
+    def test_max_drawdown(self):
+        tracker = RiskTracker()
+        for value in (100.0, 120.0, 90.0, 110.0, 60.0, 130.0):
+            tracker.record(value)
+
+        self.assertAlmostEqual(tracker.max_drawdown, 0.5)
+        self.assertEqual(tracker.current_drawdown(), 0.0)
+
+    def test_value_at_risk(self):
+        worst = sorted(self.returns)[int(0.05 * 20)]
+        self.assertAlmostEqual(self.tracker.historical_var(), max(0.0, -worst))
+        expected = VAR_Z_SCORE * statistics.stdev(self.returns) - statistics.mean(self.returns)
+        self.assertAlmostEqual(self.tracker.parametric_var(), max(0.0, expected))
+
+    def test_equity_curve_is_bounded(self):
+        tracker = RiskTracker(curve_days=10)
+        for value in range(1, 50):
+            tracker.record(float(value))
+
+        self.assertEqual(list(tracker.equity_curve), [float(v) for v in range(40, 50)])
+
+    def test_not_enough_data(self):
+        tracker = RiskTracker()
+        tracker.record(100.0)
+
+        self.assertIsNone(tracker.sharpe())
+        self.assertEqual(tracker.parametric_var(), 0.0)
+
+
+class TestGameAnalytics(unittest.TestCase):
+    def test_next_day_records_all_players(self):
+        random.seed(5)
+        game = TradingGame(create_default_scenario())
+        for _ in range(5):
+            game.next_day()
+
+        summary = game.analytics.summary()
+        self.assertEqual(set(summary), {player.id for player in game.players})
+        self.assertEqual(summary[game.players[0].id]["samples"], 4)
+        self.assertIsInstance(game.analytics, RiskAnalytics)
+
+        info = TextInterface(game).display_player_info(0)
+        self.assertIn("РИЗИК:", info)
+        self.assertIn("VaR 95%", info)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+from unittest.mock import patch
+
+from benchmarks.suite import BENCHMARKS, run_suite, compare, build_synthetic_scenario
+from models.player import Player
+
+
+class TestBenchmarkSuite(unittest.TestCase):
+    def test_synthetic_scenario(self):
+        market, players, _, _ = build_synthetic_scenario(assets=8, players=3).build()
+
+        self.assertEqual(len(market.assets), 8)
+        self.assertEqual(len(players), 3)
+
+    def test_run_suite_covers_all_benchmarks(self):
+        scales = {"assets": [5], "players": [2], "days": [3], "ticks": [10]}
+        results = run_suite(scales)
+
+        self.assertEqual({r["benchmark"] for r in results["results"]}, set(BENCHMARKS))
+        for result in results["results"]:
+            self.assertGreater(result["seconds"], 0)
+
+    def test_margin_call_fixture_is_restored_between_rounds(self):
+        cover = Player.cover_asset
+        with patch.object(Player, "cover_asset", autospec=True, side_effect=cover) as mock_cover:
+            result = BENCHMARKS["check_margin_call"](assets=5, players=2)
+
+        # Один гравець нижче застави з 5 короткими позиціями - ліквідація в кожному повторі
+        self.assertEqual(mock_cover.call_count, 5 * result["rounds"])
+
+    def test_compare_flags_regression(self):
+        baseline = {"results": [{"benchmark": "b", "params": {"assets": 1}, "seconds": 1.0}]}
+        current = {"results": [{"benchmark": "b", "params": {"assets": 1}, "seconds": 1.5}]}
+
+        report = compare(baseline, current, threshold=0.2)
+
+        self.assertEqual(len(report), 1)
+        self.assertTrue(report[0]["regression"])
+
+
+if __name__ == '__main__':
+    unittest.main()
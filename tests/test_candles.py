@@ -0,0 +1,75 @@
+import unittest
+
+from models.asset import Stock
+from models.candles import PriceHistory, MAX_BARS
+from models.market import Market
+
+
+class TestPriceHistory(unittest.TestCase):
+    def setUp(self):
+        self.history = PriceHistory(100.0, raw_days=3)
+
+    def test_intraday_updates_build_one_candle(self):
+        for price in (105.0, 95.0, 101.0):
+            self.history.record(price)
+
+        candle = self.history.candles("day")[-1]
+        self.assertEqual(candle.as_tuple(), (1, 100.0, 105.0, 95.0, 101.0))
+
+    def test_roll_opens_candle_at_previous_close(self):
+        self.history.record(110.0)
+        self.history.roll(2)
+        self.history.record(120.0)
+
+        day_candles = self.history.candles("day")
+        self.assertEqual(len(day_candles), 2)
+        self.assertEqual(day_candles[-1].as_tuple(), (2, 110.0, 120.0, 110.0, 120.0))
+
+    def test_weekly_and_monthly_aggregation(self):
+        for day in range(2, 16):
+            self.history.roll(day)
+            self.history.record(100.0 + day)
+
+        weeks = self.history.candles("week")
+        self.assertEqual([c.start_day for c in weeks], [1, 8, 15])
+        self.assertEqual(weeks[0].as_tuple(), (1, 100.0, 107.0, 100.0, 107.0))
+        self.assertEqual(len(self.history.candles("month")), 1)
+        self.assertEqual(len(self.history.candles("day", count=5)), 5)
+
+    def test_raw_points_are_compacted(self):
+        for day in range(2, 11):
+            self.history.roll(day)
+            self.history.record(100.0 + day)
+
+        # Лишаються точки лише за останні raw_days днів
+        self.assertEqual(len(self.history.points), 4)
+        self.assertEqual(self.history.points[-1][1], 110.0)
+
+    def test_bars_are_bounded(self):
+        for day in range(2, MAX_BARS["day"] + 10):
+            self.history.roll(day)
+
+        self.assertEqual(len(self.history.candles("day")), MAX_BARS["day"])
+
+    def test_unknown_resolution(self):
+        with self.assertRaises(ValueError):
+            self.history.candles("year")
+
+
+class TestMarketCandles(unittest.TestCase):
+    def test_market_update_rolls_candles(self):
+        market = Market()
+        asset = Stock("Компанія", "CMP", 100.0)
+        market.add_asset(asset)
+
+        for _ in range(3):
+            market.update()
+
+        candles = asset.history.candles("day")
+        self.assertEqual([c.start_day for c in candles], [1, 2, 3, 4])
+        self.assertEqual(candles[-1].close, asset.current_price)
+        self.assertEqual(candles[1].open, candles[0].close)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+
+from game.trading_game import TradingGame
+from models.asset import Stock
+from models.market import Market
+from models.player import Investor, Player
+from models.price_model import TickPriceModel
+from utils.clock import DETACHED_CLOCK, GameClock, make_stamp, stamp_day, stamp_tick
+from utils.enums import RumorType, TradeType
+
+
+class TestGameClock(unittest.TestCase):
+    def test_stamp_round_trip(self):
+        stamp = make_stamp(1234, 567)
+        self.assertEqual((stamp_day(stamp), stamp_tick(stamp)), (1234, 567))
+        self.assertLess(make_stamp(5, 999), make_stamp(6))
+
+    def test_advance_day_resets_tick(self):
+        clock = GameClock(day=3, tick=40)
+        clock.advance_day()
+        self.assertEqual(clock.now(), make_stamp(4))
+
+    def test_wall_time_is_sampled_only_when_enabled(self):
+        clock = GameClock()
+        clock.sample_wall_time()
+        self.assertIsNone(clock.wall_time(clock.now()))
+
+        clock.enable_wall_time()
+        clock.sample_wall_time()
+        first = clock.now()
+        clock.advance_day()
+        clock.sample_wall_time()
+        self.assertEqual(len(clock.wall_times), 2)
+        self.assertEqual(clock.wall_time(first), clock.wall_times[0][1])
+        self.assertEqual(clock.wall_time(make_stamp(10)), clock.wall_times[1][1])
+        self.assertIsNone(clock.wall_time(make_stamp(0)))
+
+
+class TestMarketClock(unittest.TestCase):
+    def setUp(self):
+        self.market = Market()
+        self.asset = Stock("Компанія", "CMP", 100.0)
+        self.market.add_asset(self.asset)
+        self.player = Player("Гравець", 10000.0)
+        self.market.attach(self.player)
+
+    def test_player_uses_market_clock(self):
+        self.assertIs(self.player.clock, self.market.clock)
+        self.assertIs(Player("Без ринку", 10.0).clock, DETACHED_CLOCK)
+
+        self.market.update()
+        self.market.update()
+        self.player.buy_asset(self.asset, 1, 100.0)
+        stamp, trade_type = self.player.trade_history[-1][:2]
+        self.assertEqual(stamp_day(stamp), self.market.day)
+        self.assertEqual(trade_type, TradeType.BUY)
+
+    def test_investor_history_uses_player_clock(self):
+        self.market.day = 7
+        investor = Investor("Інвестор", 5000.0, 0.5)
+        investor.invest(self.player, 1000.0)
+        self.assertEqual(investor.investment_history[-1][0], make_stamp(7))
+
+    def test_price_points_and_rumors_are_stamped(self):
+        self.market.update()
+        self.assertEqual(stamp_day(self.asset.price_history[-1][0]), self.market.day)
+
+        rumor = self.market.create_rumor(self.player, self.asset, RumorType.INSIDER, "Чутка", True)
+        self.assertEqual(rumor.created_at, self.market.clock.now())
+
+    def test_tick_model_advances_ticks(self):
+        self.market.price_model = TickPriceModel(ticks_per_day=5)
+        self.market.update()
+        self.assertEqual(self.market.clock.tick, 4)
+        self.assertEqual(self.market.clock.day, 2)
+
+    def test_game_samples_wall_time_once_per_day(self):
+        game = TradingGame()
+        game.market.clock.enable_wall_time()
+        for _ in range(3):
+            game.next_day()
+        self.assertEqual([stamp_day(stamp) for stamp, _ in game.market.clock.wall_times], [2, 3, 4])
+
+
+if __name__ == '__main__':
+    unittest.main()
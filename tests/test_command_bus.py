@@ -0,0 +1,194 @@
+import unittest
+
+from game.trading_game import TradingGame
+from models.asset import Stock
+from models.market import Market
+from models.player import Investor, Player
+from patterns.command import CommandBus, TradeCommand
+from patterns.strategy import ValueInvestingStrategy
+from utils.enums import TradeType
+
+
+class TestCommandBus(unittest.TestCase):
+    def setUp(self):
+        self.bus = CommandBus()
+        self.player = Player("Бот", 1000.0)
+        self.asset = Stock("Компанія", "CMP", 10.0)
+
+    def order(self, trade_type, quantity, player=None):
+        command = TradeCommand(player or self.player, self.asset, trade_type, quantity, self.asset.current_price)
+        self.bus.submit(command)
+        return command
+
+    def test_orders_for_same_asset_are_netted(self):
+        for _ in range(5):
+            self.order(TradeType.BUY, 10)
+        self.order(TradeType.SELL, 20)
+
+        batch = self.bus.settle()
+
+        self.assertEqual(batch.accepted, 6)
+        self.assertEqual(batch.ledger, [(self.player.id, self.asset.id, TradeType.BUY, 30, 10.0)])
+        self.assertEqual(self.player.portfolio[self.asset.id], 30)
+        self.assertAlmostEqual(self.player.capital, 700.0)
+        self.assertEqual(len(self.player.trade_history), 1)
+        self.assertEqual(self.bus.pending(), 0)
+
+    def test_orders_validated_against_snapshot(self):
+        first = self.order(TradeType.BUY, 60)
+        second = self.order(TradeType.BUY, 60)
+        oversell = self.order(TradeType.SELL, 100)
+
+        batch = self.bus.settle()
+
+        self.assertTrue(first.executed)
+        self.assertFalse(second.executed)
+        self.assertFalse(oversell.executed)
+        self.assertEqual((batch.accepted, batch.rejected), (1, 2))
+        self.assertEqual(self.player.notifications, ["ОРДЕРИ: виконано 1, відхилено 2"])
+
+    def test_short_and_cover_net_out(self):
+        self.order(TradeType.SHORT, 10)
+        self.order(TradeType.COVER, 10)
+
+        batch = self.bus.settle()
+
+        self.assertEqual(batch.accepted, 2)
+        self.assertEqual(batch.ledger, [])
+        self.assertEqual(self.player.short_positions, {})
+        self.assertAlmostEqual(self.player.capital, 1000.0)
+
+    def test_margin_call_sees_pending_cover(self):
+        self.asset.set_price(100.0)
+        self.player.short_asset(self.asset, 10, 100.0)
+        bus = CommandBus(settlement_days=2)
+        bus.submit(TradeCommand(self.player, self.asset, TradeType.COVER, 10, 100.0))
+        bus.settle(1)
+        self.assertEqual(bus.short_positions(self.player), {})
+
+        market = Market()
+        market.add_asset(self.asset)
+        self.asset.set_price(150.0)
+        # Позицію вже закриває нерозрахований запис - повторного закриття і виплати немає
+        self.assertFalse(self.player.check_margin_call(market, bus))
+        self.assertEqual(self.player.capital, 500.0)
+
+        bus.apply_due(3)
+        self.assertEqual(self.player.capital, 1000.0)
+        self.assertEqual(self.player.short_positions, {})
+
+    def test_margin_call_sees_pending_short(self):
+        bus = CommandBus(settlement_days=2)
+        bus.submit(TradeCommand(self.player, self.asset, TradeType.SHORT, 100, 10.0))
+        bus.settle(1)
+        self.assertEqual(self.player.short_positions, {})
+
+        market = Market()
+        market.add_asset(self.asset)
+        self.asset.set_price(40.0)
+        self.assertTrue(self.player.check_margin_call(market, bus))
+        self.assertTrue(self.player.game_over)
+        self.assertEqual(bus.short_positions(self.player), {})
+
+        bus.settle(2)
+        bus.apply_due(4)
+        self.assertEqual(self.player.short_positions, {})
+        self.assertAlmostEqual(self.player.capital, 1000.0 - 500.0 + 500.0 - 3000.0)
+
+    def test_one_notification_per_player(self):
+        other = Player("Інший бот", 1000.0)
+        self.order(TradeType.BUY, 1)
+        self.order(TradeType.BUY, 1)
+        self.order(TradeType.BUY, 1, player=other)
+
+        batch = self.bus.settle()
+
+        self.assertEqual(set(batch.notifications), {self.player.id, other.id})
+        self.assertEqual(len(self.player.notifications), 1)
+        self.assertEqual(len(other.notifications), 1)
+
+
+class TestStrategiesUseBus(unittest.TestCase):
+    def test_bot_orders_settled_during_next_day(self):
+        game = TradingGame()
+        asset = Stock("Компанія", "CMP", 100.0)
+        game.market.add_asset(asset)
+        bot = Player("Бот", 10000.0)
+        bot.set_strategy(ValueInvestingStrategy())
+        game.players = [bot]
+        game.market.attach(bot)
+
+        asset.set_price(50.0)
+        game.next_day()
+
+        self.assertIn(asset.id, bot.portfolio)
+        self.assertEqual(game.command_bus.pending(), 0)
+        self.assertEqual(len(game.command_bus.last_batch.ledger), 1)
+
+
+class TestDeferredSettlement(unittest.TestCase):
+    def setUp(self):
+        self.game = TradingGame()
+        self.asset = Stock("Компанія", "CMP", 10.0)
+        self.game.market.add_asset(self.asset)
+        self.player = Player("Трейдер", 1000.0)
+        self.game.players = [self.player]
+
+    def trade(self, action, quantity):
+        return self.game.player_turn(0, action, asset_id=self.asset.id, quantity=quantity)
+
+    def test_intraday_fills_netted_at_end_of_day(self):
+        self.game.set_settlement(0)
+        for _ in range(10):
+            self.assertTrue(self.trade("buy", 5))
+        self.assertTrue(self.trade("sell", 20))
+
+        self.assertEqual(self.player.portfolio, {})
+        self.assertEqual(self.player.capital, 1000.0)
+
+        self.game.next_day()
+
+        self.assertEqual(self.player.portfolio[self.asset.id], 30)
+        self.assertAlmostEqual(self.player.capital, 700.0)
+        self.assertEqual(len(self.player.trade_history), 1)
+
+    def test_fills_validated_against_unsettled_trades(self):
+        self.game.set_settlement(2)
+        self.assertTrue(self.trade("buy", 80))
+        self.game.next_day()
+
+        # Готівка ще не списана, але вже зарезервована нерозрахованою угодою
+        self.assertEqual(self.player.capital, 1000.0)
+        self.assertFalse(self.game.player_turn(0, "buy", asset_id=self.asset.id,
+                                               quantity=1000.0 / self.asset.current_price))
+        self.assertTrue(self.trade("sell", 80))
+
+        self.game.next_day()
+        self.assertEqual(self.player.portfolio, {})
+        self.game.next_day()
+        self.assertEqual(self.player.portfolio[self.asset.id], 80)
+        self.game.next_day()
+        self.assertEqual(self.player.portfolio, {})
+        self.assertFalse(self.game.command_bus.unsettled)
+
+    def test_unsettled_cash_is_reserved_against_other_actions(self):
+        investor = Investor("Інвестор", 5000.0, 0.5)
+        self.game.investors = [investor]
+        self.assertTrue(self.game.player_turn(0, "get_investment", investor_id=investor.id, amount=500.0))
+        self.game.set_settlement(0)
+
+        self.assertTrue(self.trade("buy", 100))
+        self.assertEqual(self.player.committed_cash, 1000.0)
+        self.assertFalse(self.game.player_turn(0, "return_investment", investor_id=investor.id, amount=501.0))
+        self.assertTrue(self.game.player_turn(0, "return_investment", investor_id=investor.id, amount=400.0))
+        # Ордери, прийняті далі, перевіряються на живій готівці, а не на знімку
+        self.assertFalse(self.trade("buy", 11))
+
+        self.game.next_day()
+        self.assertAlmostEqual(self.player.capital, 100.0)
+        self.assertEqual(self.player.committed_cash, 0.0)
+        self.assertEqual(self.player.portfolio[self.asset.id], 100)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+import random
+import unittest
+from unittest.mock import patch
+
+from models.asset import Stock, Cryptocurrency, ForexPair
+from models.market import Market
+from models.price_model import CorrelatedPriceModel, cholesky
+from game.scenario_loader import validate_spec, ScenarioError
+from patterns.builder import ScenarioBuilder
+
+
+def sample_correlation(model, market, first, second, samples=4000):
+    assets = list(market.assets.values())
+    i, j = assets.index(first), assets.index(second)
+    xs, ys = [], []
+    for _ in range(samples):
+        draws = model.draw(market)
+        xs.append(draws[i])
+        ys.append(draws[j])
+    mean_x, mean_y = sum(xs) / samples, sum(ys) / samples
+    cov = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / samples
+    var_x = sum((x - mean_x) ** 2 for x in xs) / samples
+    var_y = sum((y - mean_y) ** 2 for y in ys) / samples
+    return cov / (var_x * var_y) ** 0.5
+
+
+class TestCholesky(unittest.TestCase):
+    def test_reconstructs_matrix(self):
+        matrix = [[1.0, 0.5, 0.2], [0.5, 1.0, 0.3], [0.2, 0.3, 1.0]]
+        lower = cholesky(matrix)
+
+        for i in range(3):
+            for j in range(3):
+                value = sum(a * b for a, b in zip(lower[i], lower[j]))
+                self.assertAlmostEqual(value, matrix[i][j])
+
+    def test_rejects_non_positive_definite(self):
+        with self.assertRaises(ValueError):
+            cholesky([[1.0, 0.99, -0.99], [0.99, 1.0, 0.99], [-0.99, 0.99, 1.0]])
+
+
+class TestCorrelatedPriceModel(unittest.TestCase):
+    def setUp(self):
+        random.seed(7)
+        self.market = Market()
+        self.btc = Cryptocurrency("Біткоїн", "BTC", 28500.0)
+        self.eth = Cryptocurrency("Етереум", "ETH", 1850.0)
+        self.stock = Stock("Компанія", "CMP", 100.0)
+        self.forex = ForexPair("Євро/Гривня", "EUR/UAH", 43.0)
+        for asset in (self.btc, self.eth, self.stock, self.forex):
+            self.market.add_asset(asset)
+
+    def test_factor_correlations(self):
+        model = CorrelatedPriceModel(market_correlation=0.2, type_correlation=0.5)
+
+        same_type = sample_correlation(model, self.market, self.btc, self.eth)
+        other_type = sample_correlation(model, self.market, self.btc, self.stock)
+
+        self.assertAlmostEqual(same_type, 0.7, delta=0.08)
+        self.assertAlmostEqual(other_type, 0.2, delta=0.08)
+
+    def test_pair_override(self):
+        model = CorrelatedPriceModel(market_correlation=0.1, pairs={("BTC", "ETH"): 0.9})
+
+        self.assertAlmostEqual(sample_correlation(model, self.market, self.btc, self.eth), 0.9, delta=0.05)
+
+    def implied_correlations(self, model):
+        rows = [dict(zip(*row)) for row in model.decompose(self.market)]
+        return [[sum(weight * other.get(index, 0.0) for index, weight in row.items()) for other in rows]
+                for row in rows]
+
+    def test_override_block_keeps_factor_loadings(self):
+        model = CorrelatedPriceModel(market_correlation=0.2, type_correlation=0.3, pairs={("BTC", "CMP"): 0.6})
+
+        with patch('models.price_model.cholesky', wraps=cholesky) as mock_cholesky:
+            implied = self.implied_correlations(model)
+        # Розкладається лише блок 2x2 активів з явною кореляцією
+        self.assertEqual(len(mock_cholesky.call_args[0][0]), 2)
+
+        expected = [[1.0, 0.5, 0.6, 0.2], [0.5, 1.0, 0.2, 0.2], [0.6, 0.2, 1.0, 0.2], [0.2, 0.2, 0.2, 1.0]]
+        for row, expected_row in zip(implied, expected):
+            for value, target in zip(row, expected_row):
+                self.assertAlmostEqual(value, target)
+
+    def test_incompatible_override_uses_dense_matrix_on_small_markets(self):
+        model = CorrelatedPriceModel(market_correlation=0.3, pairs={("BTC", "ETH"): -0.5})
+        self.assertAlmostEqual(self.implied_correlations(model)[0][1], -0.5)
+
+        model = CorrelatedPriceModel(market_correlation=0.3, pairs={("BTC", "ETH"): -0.5})
+        with patch.object(CorrelatedPriceModel, "DENSE_LIMIT", 3):
+            with self.assertRaises(ValueError):
+                model.decompose(self.market)
+
+    def test_decomposition_is_cached(self):
+        model = CorrelatedPriceModel(pairs={("BTC", "ETH"): 0.9})
+
+        with patch('models.price_model.cholesky', wraps=cholesky) as mock_cholesky:
+            for _ in range(5):
+                model.update_prices(self.market)
+            self.assertEqual(mock_cholesky.call_count, 1)
+
+            # Новий актив змінює структуру - розклад перераховується
+            self.market.add_asset(Stock("Інша", "OTH", 50.0))
+            model.update_prices(self.market)
+            self.assertEqual(mock_cholesky.call_count, 2)
+
+    def test_invalid_factor_weights(self):
+        with self.assertRaises(ValueError):
+            CorrelatedPriceModel(market_correlation=0.6, type_correlation=0.6)
+
+    def test_builder_sets_model(self):
+        builder = ScenarioBuilder()
+        builder.market.add_asset(self.btc)
+        builder.market.add_asset(self.eth)
+
+        market = builder.set_correlation(market=0.2, pairs=[("BTC", "ETH", 0.8)]).build()[0]
+
+        self.assertIsInstance(market.price_model, CorrelatedPriceModel)
+        self.assertEqual(market.price_model.overrides[("ETH", "BTC")], 0.8)
+
+
+class TestCorrelationSpec(unittest.TestCase):
+    SPEC = {
+        "title": "Тест",
+        "assets": [
+            {"type": "CRYPTO", "name": "Біткоїн", "ticker": "BTC", "price": 100.0},
+            {"type": "CRYPTO", "name": "Етереум", "ticker": "ETH", "price": 10.0}
+        ]
+    }
+
+    def test_valid_spec(self):
+        validate_spec(dict(self.SPEC, correlation={"market": 0.2, "pairs": [["BTC", "ETH", 0.9]]}))
+
+    def test_unknown_ticker(self):
+        with self.assertRaises(ScenarioError):
+            validate_spec(dict(self.SPEC, correlation={"pairs": [["BTC", "XRP", 0.9]]}))
+
+    def test_asymmetric_matrix(self):
+        matrix = {"tickers": ["BTC", "ETH"], "values": [[1, 0.5], [0.4, 1]]}
+        with self.assertRaises(ScenarioError):
+            validate_spec(dict(self.SPEC, correlation={"matrix": matrix}))
+
+
+if __name__ == '__main__':
+    unittest.main()
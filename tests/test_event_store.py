@@ -0,0 +1,136 @@
+import pickle
+import unittest
+
+from models.asset import Stock, Cryptocurrency
+from models.event import Event, Rumor
+from models.event_store import EventRecord, EventStore, RumorRecord, RumorStore, _RecordStore
+from models.market import Market
+from models.player import Investor, Player
+from utils.enums import EventType, RumorType
+
+
+def make_event(duration=2, assets=(1, 2)):
+    return Event(EventType.ECONOMIC, "Зміна ставки", "Центробанк змінив ставку", 2.5, duration, list(assets))
+
+
+class TestSlottedEntities(unittest.TestCase):
+    def test_entities_have_no_dict(self):
+        entities = [
+            Stock("Компанія", "CMP", 10.0),
+            Cryptocurrency("Токен", "TKN", 1.0),
+            make_event(),
+            Rumor(1, 2, RumorType.INSIDER, "Чутка", True),
+            Player("Гравець", 1000.0),
+            Investor("Інвестор", 1000.0, 0.5),
+        ]
+        for entity in entities:
+            self.assertFalse(hasattr(entity, "__dict__"), type(entity).__name__)
+
+    def test_slotted_entities_pickle(self):
+        player = Player("Гравець", 1000.0)
+        player.portfolio[5] = 3.0
+        restored = pickle.loads(pickle.dumps(player))
+        self.assertEqual(restored.id, player.id)
+        self.assertEqual(restored.portfolio, {5: 3.0})
+
+
+class TestEventStore(unittest.TestCase):
+    def setUp(self):
+        self.store = EventStore()
+        self.events = [make_event(duration=1, assets=(1,)), make_event(duration=3, assets=(2, 3, 4))]
+        self.store.extend(self.events)
+
+    def test_live_objects_until_compacted(self):
+        self.assertIs(self.store[0], self.events[0])
+        self.assertEqual(self.store.active(), self.events)
+
+        self.events[0].remaining_duration = 0
+        self.assertEqual(self.store.compact(), 1)
+        self.assertEqual(self.store.live_count, 1)
+        self.assertEqual(self.store.active(), [self.events[1]])
+
+    def test_record_keeps_fields(self):
+        event = self.events[1]
+        alias = event.alias
+        event.remaining_duration = 0
+        self.store.compact()
+
+        record = self.store[-1]
+        self.assertIsInstance(record, EventRecord)
+        self.assertEqual(record.id, event.id)
+        self.assertEqual(record.alias, alias)
+        self.assertEqual(record.event_type, EventType.ECONOMIC)
+        self.assertEqual(record.title, "Зміна ставки")
+        self.assertEqual(record.impact, 2.5)
+        self.assertEqual(record.duration, 3)
+        self.assertEqual(record.affected_assets, [2, 3, 4])
+        self.assertFalse(record.is_active())
+
+    def test_sequence_access(self):
+        self.assertEqual(len(self.store), 2)
+        self.assertEqual(len(self.store[-3:]), 2)
+        self.assertEqual([event.id for event in self.store], [event.id for event in self.events])
+        with self.assertRaises(IndexError):
+            self.store[2]
+
+    def test_strings_are_shared(self):
+        self.store.append(make_event())
+        self.assertEqual(len(self.store.strings.strings), 2)
+        self.assertGreater(self.store.nbytes(), 0)
+
+    def test_pickle(self):
+        for event in self.events:
+            event.remaining_duration = 0
+        self.store.compact()
+        restored = pickle.loads(pickle.dumps(self.store))
+        self.assertEqual(restored[1].affected_assets, [2, 3, 4])
+        self.assertEqual(restored[0].title, "Зміна ставки")
+
+    def test_store_must_implement_hooks(self):
+        class PartialStore(_RecordStore):
+            def nbytes(self) -> int:
+                return 0
+
+        with self.assertRaises(TypeError):
+            PartialStore()
+
+
+class TestRumorStore(unittest.TestCase):
+    def test_only_undiscovered_false_rumors_stay_live(self):
+        store = RumorStore()
+        true_rumor = Rumor(1, 2, RumorType.INSIDER, "Правда", True)
+        false_rumor = Rumor(1, 3, RumorType.NEWS_LEAK, "Вигадка", False)
+        store.extend([true_rumor, false_rumor])
+
+        self.assertEqual(store.active(), [false_rumor])
+        store.compact()
+        self.assertIsInstance(store[0], RumorRecord)
+        self.assertIs(store[1], false_rumor)
+
+        false_rumor.is_discovered = True
+        store.compact()
+        record = store[1]
+        self.assertTrue(record.is_discovered)
+        self.assertFalse(record.is_true)
+        self.assertEqual(record.content, "Вигадка")
+        self.assertEqual(record.asset_id, 3)
+        self.assertEqual(record.rumor_type, RumorType.NEWS_LEAK)
+        self.assertAlmostEqual(record.credibility, false_rumor.credibility)
+        self.assertFalse(record.check_discovery())
+
+
+class TestMarketStores(unittest.TestCase):
+    def test_expired_events_are_compacted(self):
+        market = Market()
+        asset = Stock("Компанія", "CMP", 10.0)
+        market.add_asset(asset)
+        market.add_event(make_event(duration=1, assets=(asset.id,)))
+
+        market.update()
+        self.assertEqual(market.events.live_count, 0)
+        self.assertEqual(len(market.events), 1)
+        self.assertEqual(market.events[0].affected_assets, [asset.id])
+
+
+if __name__ == '__main__':
+    unittest.main()
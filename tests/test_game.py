@@ -47,6 +47,7 @@ class TestTradingGame(unittest.TestCase):
         mock_player = MagicMock()
         mock_player.capital = 1000.0
         mock_player.game_over = False
+        mock_player.calculate_net_worth.return_value = 1000.0
         self.game.players = [mock_player]
 
         self.game.next_day()
@@ -54,7 +55,7 @@ class TestTradingGame(unittest.TestCase):
         self.mock_market.update.assert_called_once()
         self.mock_market.generate_random_event.assert_called_once()
 
-        mock_player.check_margin_call.assert_called_once_with(self.mock_market)
+        mock_player.check_margin_call.assert_called_once_with(self.mock_market, self.game.command_bus)
 
     def test_player_turn_buy(self):
         mock_player = MagicMock()
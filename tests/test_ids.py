@@ -0,0 +1,89 @@
+import itertools
+import json
+import pickle
+import unittest
+from unittest.mock import patch
+
+from game.trading_game import TradingGame
+from models.asset import Stock
+from models.player import Investor, Player
+from patterns.adapter import GameStateAdapter
+from models.event import Event
+from models.event_store import EventStore
+from utils import ids
+from utils.enums import EventType
+from utils.ids import alias_index
+
+
+class TestEntityIds(unittest.TestCase):
+    def test_ids_are_unique_integers(self):
+        first = Stock("A", "A", 1.0)
+        second = Stock("B", "B", 1.0)
+        player = Player("Гравець", 100.0)
+
+        self.assertIsInstance(first.id, int)
+        self.assertEqual(len({first.id, second.id, player.id}), 3)
+
+    def test_alias_is_created_on_demand(self):
+        asset = Stock("A", "A", 1.0)
+        self.assertEqual(alias_index([asset]), {})
+
+        alias = asset.alias
+        self.assertEqual(len(alias), 36)
+        self.assertEqual(asset.alias, alias)
+        self.assertEqual(alias_index([asset]), {alias: asset.id})
+
+    def test_given_id_becomes_alias(self):
+        investor = Investor("Інвестор", 1000.0, 0.5, investor_id="inv-1")
+        self.assertEqual(investor.alias, "inv-1")
+        self.assertIsInstance(investor.id, int)
+
+    def test_unpickled_entities_reserve_their_ids(self):
+        player = Player("Гравець", 100.0)
+        player.alias = "p-1"
+        store = EventStore()
+        store.append(Event(EventType.ECONOMIC, "Подія", "Опис", -0.1, 0, []))
+        store.compact()
+        snapshot = pickle.dumps((player, store))
+
+        # Новий процес: лічильник ID починається спочатку
+        with patch.object(ids, "_counter", itertools.count(1)):
+            restored, restored_store = pickle.loads(snapshot)
+            fresh = Stock("A", "A", 1.0)
+
+        self.assertEqual((restored.id, restored.alias, restored.capital), (player.id, "p-1", 100.0))
+        self.assertGreater(fresh.id, max(player.id, restored_store[0].id))
+
+
+class TestSavedStateUsesAliases(unittest.TestCase):
+    def setUp(self):
+        self.game = TradingGame()
+        self.asset = Stock("Компанія", "CMP", 10.0)
+        self.game.market.add_asset(self.asset)
+        self.player = Player("Гравець", 1000.0)
+        self.investor = Investor("Інвестор", 5000.0, 0.5)
+        self.game.players = [self.player]
+        self.game.investors = [self.investor]
+        self.player.buy_asset(self.asset, 3, self.asset.current_price)
+        self.investor.invest(self.player, 100.0)
+
+    def test_serialized_keys_are_aliases(self):
+        state = json.loads(json.dumps(GameStateAdapter.serialize_game(self.game)))
+
+        self.assertEqual(state['assets'][0]['id'], self.asset.alias)
+        self.assertEqual(state['players'][0]['portfolio'], {self.asset.alias: 3})
+        self.assertEqual(state['players'][0]['investor_funds'], {self.investor.alias: 100.0})
+
+    def test_reload_keeps_ids_referenced_by_portfolios(self):
+        net_worth = self.player.calculate_net_worth(self.game.market)
+        state = json.loads(json.dumps(GameStateAdapter.serialize_game(self.game)))
+        GameStateAdapter.deserialize_game(state, self.game)
+
+        restored = self.game.market.assets[self.asset.id]
+        self.assertIsNot(restored, self.asset)
+        self.assertEqual(restored.alias, self.asset.alias)
+        self.assertAlmostEqual(self.player.calculate_net_worth(self.game.market), net_worth)
+
+
+if __name__ == '__main__':
+    unittest.main()
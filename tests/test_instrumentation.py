@@ -0,0 +1,62 @@
+import json
+import os
+import tempfile
+import unittest
+
+from game.scenario import create_default_scenario
+from game.trading_game import TradingGame
+from utils.instrumentation import (Instrumentation, HistogramSink, JsonLinesSink, PrometheusTextSink,
+                                   NULL_INSTRUMENTATION)
+
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self):
+        self.game = TradingGame(create_default_scenario())
+
+    def test_disabled_by_default(self):
+        self.assertIs(self.game.instrumentation, NULL_INSTRUMENTATION)
+        self.assertIs(self.game.market.instrumentation, NULL_INSTRUMENTATION)
+        self.game.next_day()
+
+    def test_histogram_sink_records_phases_and_counters(self):
+        sink = HistogramSink()
+        self.game.set_instrumentation(Instrumentation(sink))
+
+        for _ in range(3):
+            self.game.next_day()
+
+        summary = sink.summary()
+        for phase in ("market.update", "market.prices", "margin_checks", "game_over"):
+            self.assertEqual(summary["phases"][phase]["count"], 3)
+        self.assertEqual(summary["counters"]["rumors_checked"], 0)
+        # Щонайменше одне сповіщення про новий день на кожного гравця
+        self.assertGreaterEqual(summary["counters"]["notifications_sent"], 3)
+
+    def test_json_lines_sink_writes_one_line_per_day(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            filename = os.path.join(temp_dir, "phases.jsonl")
+            self.game.set_instrumentation(Instrumentation(JsonLinesSink(filename)))
+
+            self.game.next_day()
+            self.game.next_day()
+
+            with open(filename, encoding='utf-8') as f:
+                rows = [json.loads(line) for line in f]
+
+        self.assertEqual([row["day"] for row in rows], [2, 3])
+        self.assertIn("market.update", rows[0]["phases"])
+
+    def test_prometheus_dump(self):
+        sink = PrometheusTextSink()
+        self.game.set_instrumentation(Instrumentation(sink))
+        self.game.next_day()
+
+        text = sink.dump()
+
+        self.assertIn('trading_phase_seconds_count{phase="market.update"} 1', text)
+        self.assertIn('trading_phase_seconds_bucket{phase="market.update",le="+Inf"} 1', text)
+        self.assertIn("trading_liquidations_total 0", text)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import main
+from game.input_source import ScriptedInput, prompt
+from game.interface import TextInterface
+from game.scenario import create_default_scenario
+from game.trading_game import TradingGame
+
+
+class TestScriptedInput(unittest.TestCase):
+    def test_reads_lines_and_raises_eof(self):
+        source = ScriptedInput(["1", "2"])
+
+        self.assertEqual(source.read_line(), "1")
+        self.assertEqual(source.read_line(), "2")
+        with self.assertRaises(EOFError):
+            source.read_line()
+
+    def test_prompt_echoes_answer(self):
+        output = io.StringIO()
+        answer = prompt(ScriptedInput(["так"]), "Питання? ", output)
+
+        self.assertEqual(answer, "так")
+        self.assertEqual(output.getvalue(), "Питання? так\n")
+
+
+class TestScriptedInterface(unittest.TestCase):
+    def setUp(self):
+        self.game = TradingGame(create_default_scenario())
+        self.output = io.StringIO()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.save_path = os.path.join(self.temp_dir.name, "save.json")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def run_script(self, lines):
+        interface = TextInterface(self.game, ScriptedInput(lines), self.output)
+        interface.run_game()
+        return self.output.getvalue()
+
+    def test_full_menu_flow(self):
+        player = self.game.players[0]
+
+        transcript = self.run_script([
+            "1", "8", "2", "",           # Купити 2 одиниці золота
+            "2", "1", "1", "",           # Продати одну
+            "3", "1", "1", "Чутка", "т", "",  # Поширити правдиву чутку
+            "4", "1", "1000",            # Залучити інвестиції
+            "7", self.save_path,         # Зберегти гру
+            "6",                         # Наступний день
+            "0", "т"                     # Вийти
+        ])
+
+        self.assertIn("Успішно куплено 2", transcript)
+        self.assertIn("Успішно продано 1", transcript)
+        self.assertIn("Чутка успішно поширена!", transcript)
+        self.assertIn("Успішно залучено ₴1000.00", transcript)
+        self.assertIn("Дякуємо за гру!", transcript)
+
+        self.assertEqual(sum(player.portfolio.values()), 1)
+        self.assertEqual(len(player.investor_funds), 1)
+        self.assertEqual(self.game.market.day, 2)
+
+        with open(self.save_path, encoding='utf-8') as f:
+            self.assertEqual(json.load(f)["players"][0]["name"], player.name)
+
+    def test_save_error_goes_to_output(self):
+        missing = os.path.join(self.temp_dir.name, "немає", "save.json")
+        with patch('sys.stdout', new_callable=io.StringIO) as stdout:
+            transcript = self.run_script(["7", missing, "0", "т"])
+
+        self.assertIn("Помилка збереження гри:", transcript)
+        self.assertIn("Помилка при збереженні гри!", transcript)
+        self.assertEqual(stdout.getvalue(), "")
+
+    def test_exhausted_script_ends_game(self):
+        transcript = self.run_script(["1", "8"])
+        self.assertIn("Виберіть номер активу", transcript)
+
+
+class TestMainMenu(unittest.TestCase):
+    def test_invalid_choices_do_not_recurse(self):
+        output = io.StringIO()
+        # Кожна невірна відповідь - це вибір і підтвердження Enter
+        script = ["невірно", ""] * 3000 + ["0"]
+
+        main.main(ScriptedInput(script), output)
+
+        self.assertIn("До побачення!", output.getvalue())
+        self.assertEqual(output.getvalue().count("Невідомий вибір!"), 3000)
+
+    def test_start_game_from_script(self):
+        output = io.StringIO()
+        main.main(ScriptedInput(["1", "0", "т"]), output)
+
+        self.assertIn("БІРЖОВИЙ СИМУЛЯТОР", output.getvalue())
+        self.assertIn("Дякуємо за гру!", output.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+
+from game.investors import InvestorEvaluator
+from game.trading_game import TradingGame
+from models.player import Player, Investor
+
+
+class TestInvestorEvaluator(unittest.TestCase):
+    def setUp(self):
+        self.game = TradingGame()
+        self.winner = Player("Переможець", 1000.0)
+        self.loser = Player("Невдаха", 1000.0)
+        self.game.players = [self.winner, self.loser]
+        self.patient = Investor("Терплячий", 10000.0, 0.2)
+        self.demanding = Investor("Вимогливий", 10000.0, 0.9)
+        self.game.investors = [self.patient, self.demanding]
+        self.evaluator = InvestorEvaluator(period=2, withdrawal_threshold=0.5)
+
+        self.patient.invest(self.winner, 500.0)
+        self.demanding.invest(self.loser, 400.0)
+
+    def record(self, winner_equity, loser_equity):
+        self.game.analytics.record(self.winner.id, winner_equity)
+        self.game.analytics.record(self.loser.id, loser_equity)
+
+    def test_player_returns_from_equity_curves(self):
+        self.record(1000.0, 1000.0)
+        self.record(1050.0, 990.0)
+        self.record(1100.0, 950.0)
+
+        returns = self.evaluator.player_returns(self.game)
+
+        self.assertAlmostEqual(returns[self.winner.id], 0.1 * 252 / 2)
+        self.assertAlmostEqual(returns[self.loser.id], -0.05 * 252 / 2)
+
+    def test_satisfaction_and_bulk_withdrawal(self):
+        self.record(1000.0, 1000.0)
+        self.record(1100.0, 900.0)
+
+        withdrawals = self.evaluator.evaluate(self.game)
+
+        self.assertEqual(self.patient.satisfaction, 1.0)
+        self.assertAlmostEqual(self.demanding.satisfaction, 0.8)
+        self.assertEqual(withdrawals, [])
+
+        for _ in range(2):
+            self.record(1100.0, 800.0)
+            withdrawals = self.evaluator.evaluate(self.game)
+
+        self.assertEqual(withdrawals, [(self.demanding, self.loser, 400.0)])
+        self.assertNotIn(self.demanding.id, self.loser.investor_funds)
+        self.assertEqual(self.demanding.capital, 10000.0)
+        self.assertIn(self.patient.id, self.winner.investor_funds)
+
+    def test_bulk_withdrawal_leaves_committed_cash(self):
+        self.loser.committed_cash = 1200.0  # Під нерозраховані ордери зарезервовано майже всю готівку
+        self.record(1000.0, 1000.0)
+        withdrawals = []
+        for day in range(1, 4):
+            self.record(1000.0 + 100.0 * day, 800.0)
+            withdrawals.extend(self.evaluator.evaluate(self.game))
+
+        self.assertEqual(withdrawals, [(self.demanding, self.loser, 200.0)])
+        self.assertEqual(self.loser.capital, 1200.0)
+        self.assertEqual(self.loser.investor_funds[self.demanding.id], 200.0)
+
+    def test_investor_index(self):
+        self.assertIs(self.game.get_investor(self.patient.id), self.patient)
+        self.assertIsNone(self.game.get_investor("unknown"))
+
+        # Новий список тієї самої довжини
+        replacement = Investor("Новий", 1000.0, 0.5)
+        self.game.investors = [replacement, self.demanding]
+        self.assertIs(self.game.get_investor(replacement.id), replacement)
+        self.assertIsNone(self.game.get_investor(self.patient.id))
+
+        late = Investor("Пізній", 1000.0, 0.5)
+        self.game.investors.append(late)
+        self.assertIs(self.game.get_investor(late.id), late)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import pickle
+import random
+import unittest
+
+from game.leaderboard import Leaderboard
+from game.scenario import create_multiplayer_scenario
+from game.trading_game import TradingGame
+
+
+class TestLeaderboard(unittest.TestCase):
+    def setUp(self):
+        self.leaderboard = Leaderboard(seed=1)
+        self.scores = {}
+        rng = random.Random(2)
+        for i in range(300):
+            player_id = f"player-{i}"
+            self.scores[player_id] = round(rng.uniform(0, 10000), 2)
+            self.leaderboard.update(player_id, self.scores[player_id])
+
+    def expected_order(self):
+        return sorted(self.scores.items(), key=lambda item: (-item[1], item[0]))
+
+    def test_top_and_iteration(self):
+        self.assertEqual(self.leaderboard.top(5), self.expected_order()[:5])
+        self.assertEqual(list(self.leaderboard), self.expected_order())
+
+    def test_rank_and_at_rank_after_updates(self):
+        rng = random.Random(3)
+        for _ in range(500):
+            player_id = f"player-{rng.randrange(300)}"
+            self.scores[player_id] = round(rng.uniform(0, 10000), 2)
+            self.leaderboard.update(player_id, self.scores[player_id])
+
+        order = self.expected_order()
+        for position, (player_id, score) in enumerate(order, start=1):
+            self.assertEqual(self.leaderboard.rank(player_id), position)
+            self.assertEqual(self.leaderboard.at_rank(position), (player_id, score))
+
+    def test_remove(self):
+        leader = self.expected_order()[0][0]
+        self.leaderboard.remove(leader)
+        del self.scores[leader]
+
+        self.assertEqual(len(self.leaderboard), 299)
+        self.assertIsNone(self.leaderboard.rank(leader))
+        self.assertEqual(self.leaderboard.top(1), self.expected_order()[:1])
+
+    def test_percentile(self):
+        order = self.expected_order()
+        self.assertEqual(self.leaderboard.percentile(order[0][0]), 100.0)
+        self.assertEqual(self.leaderboard.percentile(order[-1][0]), 0.0)
+        self.assertIsNone(self.leaderboard.percentile("unknown"))
+
+    def test_pickle_rebuilds_list(self):
+        restored = pickle.loads(pickle.dumps(self.leaderboard))
+
+        self.assertEqual(list(restored), self.expected_order())
+        self.assertEqual(restored.rank(self.expected_order()[10][0]), 11)
+
+
+class TestGameLeaderboard(unittest.TestCase):
+    def test_trades_and_days_update_standings(self):
+        random.seed(4)
+        game = TradingGame(create_multiplayer_scenario())
+        game.start_game()
+        self.assertEqual(len(game.leaderboard), len(game.players))
+
+        asset = next(iter(game.market.assets.values()))
+        game.player_turn(1, "buy", asset_id=asset.id, quantity=1)
+        game.next_day()
+
+        for player in game.players:
+            self.assertAlmostEqual(game.leaderboard.score(player.id), player.calculate_net_worth(game.market))
+        leader_id, _ = game.leaderboard.top(1)[0]
+        self.assertEqual(game.leaderboard.rank(leader_id), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
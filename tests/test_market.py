@@ -1,8 +1,10 @@
+import random
 import unittest
 from unittest.mock import MagicMock, patch
-from models.market import Market
+from models.market import Market, EVENT_BLOCK_DAYS
 from models.asset import Stock
 from patterns.state import BullMarketState, BearMarketState, VolatileMarketState
+from patterns.factory import EventFactory
 from utils.enums import RumorType
 
 
@@ -151,5 +153,50 @@ class TestMarket(unittest.TestCase):
             self.assertEqual(volatile_args, 3.0, "Волатильний ринок повинен давати очікувані зміни цін")
 
 
+class TestRandomEventSchedule(unittest.TestCase):
+    def setUp(self):
+        random.seed(7)
+        self.market = Market()
+        for i in range(20):
+            self.market.add_asset(Stock(f"Company {i}", f"C{i}", 100.0))
+
+    def test_asset_ids_cached_until_assets_change(self):
+        ids = self.market.asset_ids()
+        self.assertIs(self.market.asset_ids(), ids)
+
+        self.market.add_asset(Stock("New Company", "NEW", 50.0))
+        self.assertEqual(len(self.market.asset_ids()), 21)
+
+    def test_asset_ids_rebuilt_when_assets_replaced(self):
+        ids = list(self.market.asset_ids())
+        # Новий словник того самого розміру (як після завантаження гри) - теж зміна набору
+        self.market.assets = {asset_id + 1000: asset for asset_id, asset in self.market.assets.items()}
+        self.assertEqual(self.market.asset_ids(), [asset_id + 1000 for asset_id in ids])
+
+    def test_batch_covers_block_of_days(self):
+        events = EventFactory.create_random_events(self.market, 10, 100)
+
+        days = [day for day, _ in events]
+        self.assertEqual(days, sorted(set(days)))
+        self.assertTrue(all(10 <= day < 110 for day in days))
+        for _, event in events:
+            self.assertTrue(1 <= len(event.affected_assets) <= 5)
+            self.assertEqual(len(set(event.affected_assets)), len(event.affected_assets))
+            self.assertTrue(set(event.affected_assets) <= set(self.market.assets))
+            self.assertTrue(event.title in event.description)
+
+    def test_scheduled_events_released_on_their_day(self):
+        released = []
+        for _ in range(EVENT_BLOCK_DAYS * 3):
+            before = len(self.market.events)
+            self.market.generate_random_event()
+            released.append(len(self.market.events) - before)
+            self.market.day += 1
+
+        self.assertTrue(all(count <= 1 for count in released))
+        self.assertGreater(sum(released), 0)
+        self.assertTrue(all(day > self.market.day - 1 for day, _ in self.market.scheduled_events))
+
+
 if __name__ == '__main__':
     unittest.main()
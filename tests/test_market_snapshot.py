@@ -0,0 +1,133 @@
+import multiprocessing
+import pickle
+import unittest
+from unittest.mock import patch
+
+from models.asset import Stock
+from models.event import Event
+from models.event_store import EventStore
+from models.market import Market
+from models.market_snapshot import MarketSnapshotReader, MarketSnapshotWriter, SEQ, STATE_IDS
+from models.price_model import TickPriceModel
+from utils.enums import EventType
+
+
+def read_prices_in_worker(name, queue):
+    reader = MarketSnapshotReader(name)
+    queue.put((reader.day, reader.prices()))
+    reader.close()
+
+
+class TestMarketSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.market = Market()
+        self.assets = [Stock(f"Компанія {i}", f"C{i}", 10.0 * (i + 1)) for i in range(4)]
+        for asset in self.assets:
+            self.market.add_asset(asset)
+        self.writer = MarketSnapshotWriter(capacity=8)
+        self.reader = MarketSnapshotReader(self.writer.name)
+
+    def tearDown(self):
+        self.reader.close()
+        self.writer.close()
+
+    def test_publish_and_read(self):
+        self.market.add_event(Event(EventType.COMPANY, "Звіт", "Звіт", 0.5, 3, [self.assets[1].id]))
+        self.writer.publish(self.market)
+
+        self.assertEqual(self.reader.version, 2)
+        self.assertEqual(self.reader.day, self.market.day)
+        self.assertEqual(self.reader.state_id, STATE_IDS[type(self.market.current_state)])
+        self.assertEqual(list(self.reader.asset_ids), [asset.id for asset in self.assets])
+        self.assertEqual(self.reader.prices(), {asset.id: asset.current_price for asset in self.assets})
+        self.assertEqual(list(self.reader.column("event_impact")), [0.0, 0.5, 0.0, 0.0])
+
+    def test_event_impact_skips_finished_events(self):
+        self.market.add_event(Event(EventType.COMPANY, "Звіт", "Звіт", 0.5, 3, [self.assets[1].id]))
+        self.market.add_event(Event(EventType.COMPANY, "Старий звіт", "Звіт", 0.7, 0, [self.assets[2].id]))
+        self.market.events.compact()
+        self.assertEqual(self.market.events.live_count, 1)
+
+        with patch.object(EventStore, "__iter__", side_effect=AssertionError("Обхід усіх подій")):
+            self.writer.publish(self.market)
+        self.assertEqual(list(self.reader.column("event_impact")), [0.0, 0.5, 0.0, 0.0])
+
+    def test_asset_ids_rewritten_when_set_replaced(self):
+        self.writer.publish(self.market)
+        # Інший набір активів того самого розміру, як після завантаження збереженої гри
+        replacement = [Stock(f"Нова {i}", f"N{i}", 5.0) for i in range(4)]
+        self.market.assets = {asset.id: asset for asset in replacement}
+        self.writer.publish(self.market)
+
+        self.assertEqual(list(self.reader.asset_ids), [asset.id for asset in replacement])
+        self.assertEqual(self.reader.prices(), {asset.id: 5.0 for asset in replacement})
+
+    def test_market_update_publishes(self):
+        self.market.snapshot_writer = self.writer
+        self.market.update()
+
+        self.assertEqual(self.reader.day, self.market.day)
+        self.assertEqual(list(self.reader.column("price")), [asset.current_price for asset in self.assets])
+        self.assertEqual(list(self.reader.column("high")),
+                         [asset.history.candles("day", 1)[0].high for asset in self.assets])
+
+    def test_tick_mode_publishes_every_tick(self):
+        self.market.snapshot_writer = self.writer
+        self.market.price_model = TickPriceModel(ticks_per_day=5)
+        self.market.update()
+
+        self.assertEqual(self.reader.tick, -1)
+        # 5 тіків і кінець дня, кожна публікація збільшує лічильник на 2
+        self.assertEqual(self.reader.version, 12)
+
+    def test_read_retries_after_concurrent_write(self):
+        self.writer.publish(self.market)
+        calls = []
+
+        def read(reader):
+            calls.append(reader.version)
+            if len(calls) == 1:
+                self.writer.publish(self.market)  # Запис посеред читання
+            return reader.day
+
+        self.reader.read(read)
+        self.assertEqual(calls, [2, 4])
+
+    def test_read_times_out_while_writer_is_stuck(self):
+        self.writer.publish(self.market)
+        self.writer._layout.header[SEQ] += 1
+
+        with self.assertRaises(TimeoutError):
+            self.reader.read(lambda reader: reader.day, timeout=0.01)
+
+    def test_capacity_is_checked(self):
+        for i in range(5):
+            self.market.add_asset(Stock(f"Нова {i}", f"N{i}", 1.0))
+
+        with self.assertRaises(ValueError):
+            self.writer.publish(self.market)
+
+    def test_pickled_writer_reattaches_to_same_block(self):
+        self.writer.publish(self.market)
+        restored = pickle.loads(pickle.dumps(self.writer))
+        self.market.day += 1
+        restored.publish(self.market)
+
+        self.assertEqual(self.reader.day, self.market.day)
+        restored.close(unlink=False)
+
+    def test_worker_process_reads_snapshot(self):
+        self.writer.publish(self.market)
+        context = multiprocessing.get_context("spawn")
+        queue = context.Queue()
+        worker = context.Process(target=read_prices_in_worker, args=(self.writer.name, queue))
+        worker.start()
+        day, prices = queue.get(timeout=30)
+        worker.join(timeout=30)
+
+        self.assertEqual(day, self.market.day)
+        self.assertEqual(prices, {asset.id: asset.current_price for asset in self.assets})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import pickle
+import tempfile
+import unittest
+import urllib.request
+
+from game.metrics_server import MetricsServer
+from game.scenario import create_default_scenario
+from game.session_pool import SessionPool
+from game.trading_game import TradingGame
+from utils.instrumentation import Instrumentation
+from utils.metrics import HdrHistogram, MetricsRegistry, MetricsSink, MultiSink, REGISTRY
+
+
+class TestHdrHistogram(unittest.TestCase):
+    def test_quantiles_within_precision(self):
+        histogram = HdrHistogram()
+        for i in range(1, 10001):
+            histogram.record(i * 1e-5)  # Від 10 мкс до 100 мс
+
+        self.assertAlmostEqual(histogram.quantile(0.5), 0.05, delta=0.05 * 0.02)
+        self.assertAlmostEqual(histogram.quantile(0.99), 0.099, delta=0.099 * 0.02)
+        self.assertEqual(histogram.count, 10000)
+
+    def test_empty(self):
+        self.assertEqual(HdrHistogram().quantile(0.5), 0.0)
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    def setUp(self):
+        self.registry = MetricsRegistry()
+        self.game = TradingGame(create_default_scenario())
+        self.game.set_instrumentation(Instrumentation(MetricsSink(self.registry)))
+
+    def test_game_feeds_registry(self):
+        asset_id = next(iter(self.game.market.assets))
+        self.game.player_turn(0, "buy", asset_id=asset_id, quantity=1)
+        self.game.next_day()
+
+        text = self.registry.render()
+
+        self.assertIn("trading_days_simulated_total 1", text)
+        self.assertIn("trading_actions_total 1", text)
+        self.assertIn('trading_phase_seconds_count{phase="player_turn"} 1', text)
+        self.assertIn('trading_phase_seconds{phase="player_turn",quantile="0.99"}', text)
+        self.assertIn("# TYPE trading_days_simulated_per_second gauge", text)
+
+    def test_gauges(self):
+        self.registry.gauge("active_sessions", lambda: 3, "Активні сесії.")
+        text = self.registry.render()
+
+        self.assertIn("# HELP trading_active_sessions Активні сесії.", text)
+        self.assertIn("trading_active_sessions 3.0", text)
+
+    def test_failing_gauge_skipped(self):
+        self.registry.gauge("broken", lambda: 1 / 0)
+        self.registry.gauge("sessions", lambda: 2)
+        text = self.registry.render()
+
+        self.assertNotIn("trading_broken", text)
+        self.assertIn("trading_sessions 2.0", text)
+
+    def test_multi_sink(self):
+        other = MetricsRegistry()
+        sink = MultiSink(MetricsSink(self.registry), MetricsSink(other))
+        sink.record_count("saves", 2)
+
+        self.assertEqual(self.registry.counter("saves").value, 2)
+        self.assertEqual(other.counter("saves").value, 2)
+
+    def test_pickled_game_keeps_global_registry(self):
+        game = TradingGame(create_default_scenario())
+        game.set_instrumentation(Instrumentation(MetricsSink()))
+
+        restored = pickle.loads(pickle.dumps(game))
+
+        self.assertIs(restored.instrumentation.sink.registry, REGISTRY)
+        self.assertIs(restored.market.instrumentation, restored.instrumentation)
+
+    def test_evicted_game_reattaches_custom_registry(self):
+        self.registry.gauge("sessions", lambda: 1, "Усі сесії.")
+        with tempfile.TemporaryDirectory() as storage_dir:
+            pool = SessionPool(memory_budget=1, storage_dir=storage_dir)
+            pool.put("a", self.game)
+            pool.put("b", TradingGame(create_default_scenario()))
+            self.assertFalse(pool.is_resident("a"))
+
+            restored = pool.get("a")
+            self.assertIs(restored.instrumentation.sink.registry, self.registry)
+            self.assertIs(restored.market.instrumentation, restored.instrumentation)
+            restored.next_day()
+
+        self.assertIn("trading_days_simulated_total 1", self.registry.render())
+
+
+class TestMetricsServer(unittest.TestCase):
+    def test_metrics_endpoint(self):
+        registry = MetricsRegistry()
+        registry.counter("saves").inc()
+        server = MetricsServer(registry, port=0)
+        server.start()
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{server.port}/metrics") as response:
+                body = response.read().decode('utf-8')
+                self.assertIn("text/plain", response.headers["Content-Type"])
+        finally:
+            server.stop()
+
+        self.assertIn("trading_saves_total 1", body)
+
+
+if __name__ == '__main__':
+    unittest.main()
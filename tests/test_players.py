@@ -1,5 +1,5 @@
 import unittest
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 from models.player import Player, Investor
 from models.asset import Stock
 
@@ -167,13 +167,13 @@ class TestInvestor(unittest.TestCase):
         initial_investor_capital = self.investor.capital
         initial_player_capital = self.player.capital
 
-        self.player.receive_investment = MagicMock(return_value=True)
-
-        result = self.investor.invest(self.player, amount)
+        # Player не має __dict__, тому метод підміняється на рівні класу
+        with patch.object(Player, 'receive_investment', return_value=True) as receive_investment:
+            result = self.investor.invest(self.player, amount)
 
         self.assertTrue(result)
         self.assertEqual(self.investor.capital, initial_investor_capital - amount)
-        self.player.receive_investment.assert_called_once_with(self.investor.id, amount)
+        receive_investment.assert_called_once_with(self.investor.id, amount)
         self.assertEqual(len(self.investor.investment_history), 1)
 
     def test_invest_insufficient_funds(self):
@@ -0,0 +1,171 @@
+import io
+import math
+import os
+import pickle
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import main
+from game.input_source import ScriptedInput
+from game.interface import TextInterface
+from game.trading_game import TradingGame
+from models.asset import Stock
+from models.market import Market
+from models.event import Event
+from models.price_model import HistoricalPriceModel
+from utils.enums import EventType
+from patterns.adapter import GameStateAdapter
+from utils.price_store import convert_csv, PriceStore, PriceStoreError
+
+
+class PriceStoreTestCase(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.long_csv = self.write("prices.csv", [
+            "date,ticker,open,high,low,close",
+            "2020-01-03,AAA,11,12,10,11",
+            "2020-01-01,AAA,9,10,8,10",
+            "2020-01-02,AAA,10,11,9,10.5",
+            "2020-01-01,BBB,50,52,49,50",
+            "2020-01-03,BBB,55,56,54,55",
+        ])
+        # Файл без колонки ticker: тікер береться з імені файлу
+        self.ticker_csv = self.write("CCC.csv", [
+            "Date,Close",
+            "2020-01-02,7",
+        ])
+        self.store = convert_csv([self.long_csv, self.ticker_csv], os.path.join(self.temp_dir.name, "store"))
+
+    def tearDown(self):
+        self.store.close()
+        self.temp_dir.cleanup()
+
+    def write(self, name, lines):
+        path = os.path.join(self.temp_dir.name, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write("\n".join(lines) + "\n")
+        return path
+
+
+class TestPriceStore(PriceStoreTestCase):
+    def test_layout(self):
+        self.assertEqual(self.store.tickers, ["AAA", "BBB", "CCC"])
+        self.assertEqual(self.store.dates, ["2020-01-01", "2020-01-02", "2020-01-03"])
+        self.assertEqual(list(self.store.series("AAA")), [10.0, 10.5, 11.0])
+        self.assertEqual(self.store.value("AAA", 0, "high"), 10.0)
+
+    def test_missing_values_are_nan(self):
+        self.assertTrue(math.isnan(self.store.value("BBB", 1)))
+        self.assertTrue(math.isnan(self.store.value("CCC", 0)))
+        # Без колонки open використовується ціна закриття
+        self.assertEqual(self.store.value("CCC", 1, "open"), 7.0)
+
+    def test_reopen_and_pickle(self):
+        reopened = pickle.loads(pickle.dumps(self.store))
+        try:
+            self.assertEqual(list(reopened.series("BBB"))[2], 55.0)
+        finally:
+            reopened.close()
+
+    def test_missing_close_column(self):
+        path = self.write("bad.csv", ["date,ticker,open", "2020-01-01,AAA,1"])
+        with self.assertRaises(PriceStoreError):
+            convert_csv([path], os.path.join(self.temp_dir.name, "bad"))
+
+
+class TestHistoricalPriceModel(PriceStoreTestCase):
+    def setUp(self):
+        super().setUp()
+        self.market = Market()
+        self.asset = Stock("Компанія", "AAA", 100.0)
+        self.sparse = Stock("Інша", "BBB", 100.0)
+        self.unknown = Stock("Невідома", "ZZZ", 100.0)
+        for asset in (self.asset, self.sparse, self.unknown):
+            self.market.add_asset(asset)
+        self.model = HistoricalPriceModel(self.store)
+        self.market.price_model = self.model
+
+    def test_replay_follows_history(self):
+        self.model.align_prices(self.market)
+        self.assertEqual(self.asset.current_price, 10.0)
+
+        self.model.update_prices(self.market)
+        self.model.update_prices(self.market)
+
+        self.assertAlmostEqual(self.asset.current_price, 11.0)
+        # Пропуск у даних: дохідність рахується від останнього відомого значення
+        self.assertAlmostEqual(self.sparse.current_price, 55.0)
+        self.assertEqual(self.unknown.current_price, 100.0)
+
+    def test_events_layer_on_top(self):
+        self.model.align_prices(self.market)
+        self.asset.apply_event_impact(10.0)
+        base = self.asset.current_price
+
+        self.model.update_prices(self.market)
+
+        self.assertAlmostEqual(self.asset.current_price, base * 1.05)
+
+    def test_market_update_uses_model(self):
+        self.model.align_prices(self.market)
+        self.market.add_event(Event(EventType.ECONOMIC, "Подія", "Опис", 0.0, 1, []))
+
+        self.market.update()
+
+        self.assertEqual(self.model.day, 1)
+        self.assertAlmostEqual(self.asset.current_price, 10.5)
+
+    def test_falls_back_to_market_state_when_exhausted(self):
+        self.model.day = self.store.num_days - 1
+        price = self.unknown.current_price
+
+        self.model.update_prices(self.market)
+
+        self.assertNotEqual(self.unknown.current_price, price)
+
+    def test_model_survives_pickle(self):
+        self.model.update_prices(self.market)
+        restored = pickle.loads(pickle.dumps(self.market))
+        try:
+            restored.price_model.update_prices(restored)
+            self.assertEqual(restored.price_model.day, 2)
+        finally:
+            restored.price_model.store.close()
+
+
+class TestLoadedHistoricalGame(PriceStoreTestCase):
+    def test_load_keeps_prices_and_day_cursor(self):
+        game = TradingGame()
+        asset = Stock("Компанія", "AAA", 100.0)
+        game.market.add_asset(asset)
+        game.market.price_model = HistoricalPriceModel(self.store)
+        game.market.price_model.align_prices(game.market)
+        game.next_day()
+        asset.set_price(42.0)
+
+        saves_dir = os.path.join(self.temp_dir.name, "saves")
+        os.makedirs(saves_dir)
+        self.assertTrue(game.save_game(os.path.join(saves_dir, "game.json")))
+
+        cwd = os.getcwd()
+        os.chdir(self.temp_dir.name)
+        try:
+            with patch.object(TextInterface, "run_game", autospec=True) as run_game:
+                main.main(ScriptedInput(["4", "1"]), io.StringIO(), price_store=self.store)
+        finally:
+            os.chdir(cwd)
+
+        loaded = run_game.call_args[0][0].game
+        self.assertEqual(loaded.market.price_model.day, 1)
+        self.assertEqual(next(iter(loaded.market.assets.values())).current_price, 42.0)
+
+        loaded.market.price_model.update_prices(loaded.market)
+        self.assertAlmostEqual(next(iter(loaded.market.assets.values())).current_price, 42.0 * 11 / 10.5)
+
+    def test_save_without_history_mode_has_no_cursor(self):
+        self.assertNotIn('historical_day', GameStateAdapter.serialize_game(TradingGame()))
+
+
+if __name__ == '__main__':
+    unittest.main()
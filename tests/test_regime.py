@@ -0,0 +1,114 @@
+import pickle
+import unittest
+
+from models.market import Market
+from models.regime import RegimeEngine, uniform_matrix
+from patterns.state import BullMarketState, BearMarketState, MarketState, VolatileMarketState, state_instance
+
+
+class CalmMarketState(MarketState):
+    CHANGE_RANGE = (-0.2, 0.2)
+
+    def update_prices(self, market):
+        pass
+
+    def process_event(self, market, event):
+        pass
+
+    def process_rumor(self, market, rumor):
+        pass
+
+    def get_name(self) -> str:
+        return "Спокійний"
+
+
+class TestRegimeEngine(unittest.TestCase):
+    def test_matrix_validation(self):
+        with self.assertRaises(ValueError):
+            RegimeEngine(matrix=[[0.5, 0.5], [0.5, 0.5]])
+        with self.assertRaises(ValueError):
+            RegimeEngine(matrix=[[0.9, 0.2, -0.1], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]])
+        with self.assertRaises(ValueError):
+            RegimeEngine(matrix=[[0.5, 0.4, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]])
+        with self.assertRaises(ValueError):
+            RegimeEngine(states=[BullMarketState, BullMarketState])
+
+    def test_default_matrix_keeps_regime_with_95_percent(self):
+        engine = RegimeEngine()
+        for i, row in enumerate(engine.matrix):
+            self.assertAlmostEqual(row[i], 0.95)
+            self.assertAlmostEqual(sum(row), 1.0)
+        self.assertEqual(uniform_matrix(1), [[1.0]])
+
+    def test_states_are_flyweights(self):
+        self.assertIs(state_instance(BullMarketState), state_instance(BullMarketState))
+        first, second = Market(), Market()
+        self.assertIs(first.current_state, second.current_state)
+
+    def test_step_follows_scheduled_path(self):
+        market = Market()
+        engine = market.regime
+        engine.schedule([1, 1, 0])
+
+        engine.step(market)
+        self.assertIs(market.current_state, state_instance(BearMarketState))
+        engine.step(market)
+        self.assertIs(market.current_state, state_instance(BearMarketState))
+        engine.step(market)
+        self.assertIs(market.current_state, state_instance(BullMarketState))
+
+        statistics = engine.dwell_statistics()
+        self.assertEqual(statistics["Бичачий"]["spells"], 1)
+        self.assertEqual(statistics["Ведмежий"]["days"], 2)
+        self.assertEqual(engine.transitions[1][1], 1)
+
+        with self.assertRaises(ValueError):
+            engine.schedule([3])
+
+    def test_market_update_switches_regimes(self):
+        market = Market()
+        market.regime.schedule([2])
+        market.update()
+        self.assertIsInstance(market.current_state, VolatileMarketState)
+
+    def test_simulate_paths(self):
+        engine = RegimeEngine(matrix=[[0.9, 0.1, 0.0], [0.2, 0.8, 0.0], [0.0, 0.0, 1.0]])
+        paths = engine.simulate(markets=50, days=40, seed=7)
+        self.assertEqual(len(paths), 50)
+        self.assertTrue(all(len(path) == 40 for path in paths))
+        # Режим з нульовою ймовірністю переходу ніколи не з'являється
+        self.assertTrue(all(2 not in path for path in paths))
+        self.assertEqual(paths, engine.simulate(markets=50, days=40, seed=7))
+
+        stuck = engine.simulate(markets=3, days=10, start=[2, 2, 2], seed=1)
+        self.assertTrue(all(set(path) == {2} for path in stuck))
+        with self.assertRaises(ValueError):
+            engine.simulate(markets=2, days=5, start=[0])
+
+    def test_theoretical_statistics(self):
+        engine = RegimeEngine()
+        for dwell in engine.expected_dwell():
+            self.assertAlmostEqual(dwell, 20.0)
+        for share in engine.stationary_distribution():
+            self.assertAlmostEqual(share, 1 / 3)
+
+        skewed = RegimeEngine(states=[BullMarketState, BearMarketState], matrix=[[0.9, 0.1], [0.3, 0.7]])
+        self.assertAlmostEqual(skewed.stationary_distribution()[0], 0.75)
+
+    def test_custom_state(self):
+        market = Market()
+        market.regime = RegimeEngine(states=[BullMarketState, CalmMarketState], matrix=[[0.0, 1.0], [0.0, 1.0]])
+        market.regime.step(market)
+        self.assertIs(market.current_state, state_instance(CalmMarketState))
+        self.assertIs(market.regime.state_by_name("Спокійний"), market.current_state)
+
+    def test_pickle_keeps_flyweights(self):
+        market = pickle.loads(pickle.dumps(Market()))
+        self.assertIs(market.current_state, state_instance(BullMarketState))
+        market.regime.schedule([1])
+        market.regime.step(market)
+        self.assertIs(market.current_state, state_instance(BearMarketState))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import io
+import unittest
+from unittest.mock import patch
+
+from game.renderer import TerminalRenderer, CLEAR_SCREEN, move_cursor
+from game.interface import TextInterface
+from game.scenario import create_default_scenario
+from game.trading_game import TradingGame
+
+
+class TestTerminalRenderer(unittest.TestCase):
+    def setUp(self):
+        self.renderer = TerminalRenderer(stream=io.StringIO(), height=50)
+
+    def test_first_frame_is_full_redraw(self):
+        output = self.renderer.diff(["a", "b"])
+        self.assertTrue(output.startswith(CLEAR_SCREEN))
+
+    def test_only_changed_rows_are_emitted(self):
+        self.renderer.diff(["заголовок", "ціна 1", "ціна 2"])
+        output = self.renderer.diff(["заголовок", "ціна 1", "ціна 3"])
+
+        self.assertNotIn(CLEAR_SCREEN, output)
+        self.assertNotIn("заголовок", output)
+        self.assertIn(move_cursor(3) + "ціна 3", output)
+
+    def test_scrolled_output_forces_full_redraw(self):
+        self.renderer.diff(["a", "b"])
+        self.renderer.note_output("\n" * 60)
+
+        output = self.renderer.diff(["a", "c"])
+        self.assertTrue(output.startswith(CLEAR_SCREEN))
+
+    def test_tall_frame_diffs_visible_window(self):
+        self.renderer.height = 10
+        frame = [f"рядок {i}" for i in range(20)]
+        output = self.renderer.diff(frame)
+        self.assertNotIn("рядок 10\n", output)
+        self.assertTrue(output.endswith("рядок 19\n"))
+
+        # Перше меню під кадром прокручує екран; далі для нього лишається місце
+        self.renderer.note_output("меню\n" * 3)
+        self.assertTrue(self.renderer.diff(frame).startswith(CLEAR_SCREEN))
+        self.renderer.note_output("меню\n" * 3)
+        frame[-1] = "новий рядок"
+        output = self.renderer.diff(frame)
+
+        self.assertNotIn(CLEAR_SCREEN, output)
+        self.assertNotIn("рядок 18", output)
+        self.assertIn(move_cursor(6) + "новий рядок", output)
+
+    def test_resize_forces_full_redraw(self):
+        self.renderer.diff(["a", "b"])
+        self.renderer.height = 40
+        self.assertTrue(self.renderer.diff(["a", "b"]).startswith(CLEAR_SCREEN))
+        self.assertNotIn(CLEAR_SCREEN, self.renderer.diff(["a", "c"]))
+
+    def test_invalidate(self):
+        self.renderer.diff(["a"])
+        self.renderer.invalidate()
+        self.assertTrue(self.renderer.diff(["a"]).startswith(CLEAR_SCREEN))
+
+
+class TestInterfaceRendering(unittest.TestCase):
+    def setUp(self):
+        self.game = TradingGame(create_default_scenario())
+        self.interface = TextInterface(self.game)
+
+    def test_asset_row_cached_by_price_version(self):
+        asset = next(iter(self.game.market.assets.values()))
+
+        first = self.interface._asset_row(asset)
+        self.assertIs(self.interface._asset_row(asset), first)
+
+        asset.update_price(5.0)
+        self.assertIsNot(self.interface._asset_row(asset), first)
+
+    def test_clear_screen_does_not_spawn_process(self):
+        output = io.StringIO()
+        interface = TextInterface(self.game, output=output)
+        with patch('os.system') as mock_system, patch('sys.stdout', new_callable=io.StringIO) as stdout:
+            interface.clear_screen()
+            mock_system.assert_not_called()
+        self.assertEqual(output.getvalue(), CLEAR_SCREEN)
+        self.assertEqual(stdout.getvalue(), "")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+
+from game.scenario import create_synthetic_scenario
+from patterns.builder import ScenarioBuilder
+from utils.enums import AssetType
+
+
+class TestSyntheticScenario(unittest.TestCase):
+    def test_generates_requested_world(self):
+        market, players, investors, events = create_synthetic_scenario(
+            num_assets=400, num_players=50, num_investors=7, num_events=30, seed=1
+        ).build()
+
+        self.assertEqual(len(market.assets), 400)
+        self.assertEqual(len(players), 50)
+        self.assertEqual(len(investors), 7)
+        self.assertEqual(len(events), 30)
+        self.assertEqual(len(market._observers), 50)
+
+        asset_types = {type(asset).__name__ for asset in market.assets.values()}
+        self.assertEqual(len(asset_types), len(AssetType))
+
+        for event in events:
+            for asset_id in event.affected_assets:
+                self.assertIn(asset_id, market.assets)
+
+    def test_seed_is_reproducible(self):
+        first, _, _, _ = create_synthetic_scenario(100, 1, 0, 0, seed=7).build()
+        second, _, _, _ = create_synthetic_scenario(100, 1, 0, 0, seed=7).build()
+
+        self.assertEqual([a.initial_price for a in first.assets.values()],
+                         [a.initial_price for a in second.assets.values()])
+
+
+class TestBuilderBulkPaths(unittest.TestCase):
+    def test_add_players_uses_given_ids(self):
+        builder = ScenarioBuilder()
+        builder.add_players([{"id": "p1", "name": "А", "capital": 100.0},
+                             {"id": "p2", "name": "Б", "capital": 200.0}])
+
+        _, players, _, _ = builder.build()
+
+        self.assertEqual([p.alias for p in players], ["p1", "p2"])
+        self.assertNotEqual(players[0].id, players[1].id)
+        self.assertEqual(builder.market._observers, players)
+
+    def test_attach_many_skips_duplicates(self):
+        builder = ScenarioBuilder()
+        builder.add_player("А", 100.0)
+        player = builder.players[0]
+
+        builder.market.attach_many([player, player])
+
+        self.assertEqual(len(builder.market._observers), 1)
+
+    def test_add_assets_without_id_gets_uuid_alias(self):
+        builder = ScenarioBuilder()
+        builder.add_assets([{"type": AssetType.STOCK, "name": "А", "ticker": "A", "price": 1.0}])
+
+        asset = next(iter(builder.market.assets.values()))
+        self.assertIsInstance(asset.id, int)
+        self.assertEqual(len(asset.alias), 36)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from game.scenario_loader import ScenarioLibrary, ScenarioError, validate_spec, SCENARIOS_DIR
+
+SPEC = {
+    "title": "Тест",
+    "description": "Тестовий сценарій",
+    "players": [{"name": "Гравець", "capital": 1000.0}],
+    "assets": [
+        {"type": "STOCK", "name": "Компанія", "ticker": "CMP", "price": 10.0},
+        {"type": "CRYPTO", "name": "Токен", "ticker": "TKN", "price": 2.0}
+    ],
+    "investors": [{"name": "Фонд", "capital": 5000.0, "risk_tolerance": 0.5}],
+    "events": [{"type": "ECONOMIC", "title": "Подія", "description": "Опис",
+                "impact": 3.0, "duration": 2, "affected_assets": ["TKN"]}]
+}
+
+
+class TestScenarioLibrary(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.library = ScenarioLibrary(self.temp_dir.name)
+        self.write("test.json", SPEC)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write(self, filename, spec):
+        with open(os.path.join(self.temp_dir.name, filename), 'w', encoding='utf-8') as f:
+            json.dump(spec, f, ensure_ascii=False)
+
+    def test_load_builds_world(self):
+        market, players, investors, events = self.library.load("test.json").build()
+
+        self.assertEqual(len(market.assets), 2)
+        self.assertEqual(players[0].name, "Гравець")
+        self.assertEqual(investors[0].risk_tolerance, 0.5)
+        # Тікери у файлі перетворюються на ID активів
+        token = next(a for a in market.assets.values() if a.ticker == "TKN")
+        self.assertEqual(events[0].affected_assets, [token.id])
+        self.assertIs(market._observers[0], players[0])
+
+    def test_each_load_returns_fresh_objects(self):
+        first = self.library.load("test.json").build()[0]
+        second = self.library.load("test.json").build()[0]
+
+        self.assertIsNot(first, second)
+
+    def test_listing_uses_index_without_parsing(self):
+        self.assertEqual(self.library.list_scenarios()[0]["title"], "Тест")
+
+        library = ScenarioLibrary(self.temp_dir.name)
+        with patch('game.scenario_loader.parse_scenario') as mock_parse:
+            scenarios = library.list_scenarios()
+            library.load("test.json")
+
+        mock_parse.assert_not_called()
+        self.assertEqual(scenarios[0]["assets"], 2)
+
+    def test_changed_file_is_recompiled(self):
+        self.library.list_scenarios()
+        self.write("test.json", dict(SPEC, title="Новий заголовок", description="Довший опис сценарію"))
+
+        self.assertEqual(self.library.list_scenarios()[0]["title"], "Новий заголовок")
+
+    def test_invalid_files_are_skipped_in_listing(self):
+        self.write("broken.json", {"title": "Без активів"})
+
+        files = [s["file"] for s in self.library.list_scenarios()]
+
+        self.assertEqual(files, ["test.json"])
+
+    def test_bundled_scenarios_are_valid(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            scenarios = ScenarioLibrary(SCENARIOS_DIR, cache_dir).list_scenarios()
+
+        self.assertGreaterEqual(len(scenarios), 3)
+
+
+class TestValidation(unittest.TestCase):
+    def test_unknown_ticker_in_event(self):
+        spec = dict(SPEC, events=[dict(SPEC["events"][0], affected_assets=["???"])])
+        with self.assertRaises(ScenarioError):
+            validate_spec(spec)
+
+    def test_unknown_asset_type(self):
+        spec = dict(SPEC, assets=[dict(SPEC["assets"][0], type="BOND")])
+        with self.assertRaises(ScenarioError):
+            validate_spec(spec)
+
+    def test_duplicate_ticker(self):
+        spec = dict(SPEC, assets=[SPEC["assets"][0], SPEC["assets"][0]])
+        with self.assertRaises(ScenarioError):
+            validate_spec(spec)
+
+    def test_malformed_entries(self):
+        for spec in (dict(SPEC, players=["Гравець"]), dict(SPEC, assets=[None]), dict(SPEC, investors={}),
+                     dict(SPEC, events=[["Подія"]]), dict(SPEC, correlation={"matrix": []}),
+                     dict(SPEC, correlation={"pairs": [[["A"], "B", 0.5]]})):
+            with self.assertRaises(ScenarioError):
+                validate_spec(spec)
+
+
+if __name__ == '__main__':
+    unittest.main()
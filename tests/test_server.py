@@ -0,0 +1,207 @@
+import asyncio
+import json
+import unittest
+
+from game.server import GameServer
+from game.load_client import run_load
+from utils.metrics import MetricsRegistry
+
+
+class TestGameServer(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        # Годинник вимкнено, дні просуваємо вручну
+        self.server = GameServer(port=0, day_interval=0)
+        await self.server.start()
+        self.reader, self.writer = await asyncio.open_connection("127.0.0.1", self.server.port)
+
+    async def asyncTearDown(self):
+        self.writer.close()
+        await self.server.stop()
+
+    async def request(self, message):
+        self.writer.write(json.dumps(message).encode('utf-8') + b"\n")
+        return json.loads(await self.reader.readline())
+
+    async def test_create_join_and_trade(self):
+        created = await self.request({"cmd": "create", "scenario": "default"})
+        self.assertTrue(created["ok"])
+
+        joined = await self.request({"cmd": "join", "session": created["session"]})
+        self.assertTrue(joined["ok"])
+        self.assertEqual(joined["player"], 0)
+
+        result = await self.request({"cmd": "action", "action": "buy", "ticker": "XAU", "quantity": 2})
+        self.assertTrue(result["ok"])
+        self.assertTrue(result["result"])
+
+        info = await self.request({"cmd": "info"})
+        self.assertEqual(sum(info["portfolio"].values()), 2)
+
+    async def test_trade_by_asset_alias(self):
+        created = await self.request({"cmd": "create", "scenario": "default"})
+        await self.request({"cmd": "join", "session": created["session"]})
+
+        market = await self.request({"cmd": "market"})
+        asset = market["assets"][0]
+        self.assertIsInstance(asset["id"], str)
+
+        result = await self.request({"cmd": "action", "action": "buy", "asset_id": asset["id"], "quantity": 1})
+        self.assertTrue(result["result"])
+
+        info = await self.request({"cmd": "info"})
+        self.assertEqual(info["portfolio"], {asset["id"]: 1})
+
+    async def test_commands_require_binding(self):
+        response = await self.request({"cmd": "market"})
+        self.assertFalse(response["ok"])
+
+    async def test_invalid_json(self):
+        self.writer.write(b"not json\n")
+        response = json.loads(await self.reader.readline())
+        self.assertFalse(response["ok"])
+
+    async def test_second_connection_gets_new_player(self):
+        created = await self.request({"cmd": "create", "scenario": "default"})
+        await self.request({"cmd": "join", "session": created["session"]})
+
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.server.port)
+        writer.write(json.dumps({"cmd": "join", "session": created["session"]}).encode('utf-8') + b"\n")
+        joined = json.loads(await reader.readline())
+        writer.close()
+
+        self.assertEqual(joined["player"], 1)
+        self.assertEqual(len(self.server.sessions[created["session"]].game.players), 2)
+
+    async def test_invalid_amounts_are_rejected(self):
+        created = await self.request({"cmd": "create", "scenario": "default"})
+        await self.request({"cmd": "join", "session": created["session"]})
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.server.port)
+        join = {"cmd": "join", "session": created["session"], "capital": 1e12}
+        writer.write(json.dumps(join).encode('utf-8') + b"\n")
+        joined = json.loads(await reader.readline())
+        writer.close()
+        self.assertEqual(self.server.sessions[created["session"]].game.players[joined["player"]].capital,
+                         self.server.default_capital)
+
+        capital = (await self.request({"cmd": "info"}))["capital"]
+        for quantity in (float("nan"), float("inf"), "1e999", -1):
+            result = await self.request({"cmd": "action", "action": "buy", "ticker": "XAU", "quantity": quantity})
+            self.assertFalse(result["ok"])
+        for action in ("get_investment", "return_investment"):
+            for amount in (float("nan"), -100.0, 0):
+                result = await self.request({"cmd": "action", "action": action, "investor_id": None, "amount": amount})
+                self.assertFalse(result["ok"])
+        self.assertEqual((await self.request({"cmd": "info"}))["capital"], capital)
+
+    async def test_server_clock_advances_day(self):
+        created = await self.request({"cmd": "create", "scenario": "default"})
+        await self.request({"cmd": "join", "session": created["session"]})
+
+        await self.server.advance_all()
+
+        message = json.loads(await self.reader.readline())
+        self.assertEqual(message["event"], "day")
+        self.assertEqual(message["day"], 2)
+
+    async def test_risk_for_all_players(self):
+        created = await self.request({"cmd": "create", "scenario": "multiplayer"})
+        await self.request({"cmd": "join", "session": created["session"]})
+        await self.server.advance_all()
+        await self.reader.readline()  # Повідомлення про новий день
+
+        risk = await self.request({"cmd": "risk"})
+
+        self.assertTrue(risk["ok"])
+        self.assertEqual(len(risk["players"]), created["players"])
+        self.assertIn("var_historical", risk["players"][0])
+
+    async def test_leaderboard(self):
+        created = await self.request({"cmd": "create", "scenario": "multiplayer"})
+        await self.request({"cmd": "join", "session": created["session"], "player": 1})
+
+        standings = await self.request({"cmd": "leaderboard", "top": 1})
+
+        self.assertTrue(standings["ok"])
+        self.assertEqual(len(standings["top"]), 1)
+        self.assertEqual(standings["players"], created["players"])
+        self.assertIn(standings["rank"], range(1, created["players"] + 1))
+
+        for top in ("many", 1e999, None, [3]):
+            self.assertFalse((await self.request({"cmd": "leaderboard", "top": top}))["ok"])
+        self.assertEqual(len((await self.request({"cmd": "leaderboard", "top": -5}))["top"]), 1)
+        self.assertEqual(len((await self.request({"cmd": "leaderboard", "top": 10 ** 30}))["top"]), created["players"])
+
+    async def test_join_rejects_invalid_player_index(self):
+        created = await self.request({"cmd": "create", "scenario": "multiplayer"})
+        session = self.server.sessions[created["session"]]
+
+        for index in (0.5, True, "1", [1]):
+            self.assertFalse((await self.request({"cmd": "join", "session": created["session"], "player": index}))["ok"])
+        self.assertEqual(session.connections, {})
+        self.assertNotIn(created["session"], self.server.pool._pinned)
+
+    async def test_claimed_player_requires_token(self):
+        created = await self.request({"cmd": "create", "scenario": "multiplayer"})
+        joined = await self.request({"cmd": "join", "session": created["session"], "player": 1})
+        await self.request({"cmd": "join", "session": created["session"], "player": 0})  # Гравець 1 звільнився
+
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.server.port)
+        answers = []
+        for join in ({"player": 1}, {"player": 1, "token": "чужий"}, {"player": 1, "token": joined["token"]}):
+            writer.write(json.dumps(dict(join, cmd="join", session=created["session"])).encode('utf-8') + b"\n")
+            answers.append(json.loads(await reader.readline()))
+        writer.close()
+
+        self.assertEqual([answer["ok"] for answer in answers], [False, False, True])
+        self.assertEqual(answers[-1]["player"], 1)
+        # Без токена вільний гравець видається з тих, кого ще ніхто не займав
+        rejoined = await self.request({"cmd": "join", "session": created["session"]})
+        self.assertNotEqual(rejoined["player"], 1)
+
+    async def test_idle_session_rehydrated_on_join(self):
+        first = await self.request({"cmd": "create", "scenario": "default"})
+        self.server.pool.memory_budget = 1  # Лише остання використана гра лишається в пам'яті
+        await self.request({"cmd": "create", "scenario": "default"})
+
+        self.assertFalse(self.server.pool.is_resident(first["session"]))
+
+        joined = await self.request({"cmd": "join", "session": first["session"]})
+        self.assertTrue(joined["ok"])
+
+        stats = await self.request({"cmd": "pool"})
+        self.assertEqual(stats["misses"], 1)
+        self.assertGreaterEqual(stats["evictions"], 1)
+
+    async def test_gauges_read_loop_snapshot(self):
+        registry = MetricsRegistry()
+        server = GameServer(port=0, day_interval=0, metrics=registry)
+        await server.start()
+        try:
+            server.create_session("default")
+            self.assertIn("trading_sessions 0.0", registry.render())  # Знімок ще не оновлено
+
+            server.refresh_gauges()
+            self.assertIn("trading_sessions 1.0", registry.render())
+            self.assertIn("trading_resident_sessions 1.0", registry.render())
+        finally:
+            await server.stop()
+
+    async def test_request_fetches_game_once(self):
+        created = await self.request({"cmd": "create", "scenario": "default"})
+        await self.request({"cmd": "join", "session": created["session"]})
+        market = await self.request({"cmd": "market"})
+
+        hits = self.server.pool.hits
+        await self.request({"cmd": "action", "action": "buy", "asset_id": market["assets"][0]["id"], "quantity": 1})
+        self.assertEqual(self.server.pool.hits, hits + 1)
+
+    async def test_load_client(self):
+        report = await run_load("127.0.0.1", self.server.port, clients=20, sessions=2, actions=5)
+
+        self.assertEqual(report["errors"], 0)
+        # join + market + дії + quit для кожного клієнта
+        self.assertEqual(report["requests"], 20 * (5 + 3))
+
+
+if __name__ == '__main__':
+    unittest.main()
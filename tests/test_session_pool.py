@@ -0,0 +1,98 @@
+import os
+import tempfile
+import threading
+import unittest
+
+from game.session_pool import SessionPool, estimate_game_size
+from game.scenario import create_default_scenario
+from game.trading_game import TradingGame
+
+
+class TestSessionPool(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.game_size = estimate_game_size(TradingGame(create_default_scenario()))
+        # Бюджет на дві ігри
+        self.pool = SessionPool(memory_budget=self.game_size * 2, storage_dir=self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_lru_eviction_to_disk(self):
+        for session_id in ("a", "b", "c"):
+            self.pool.put(session_id, TradingGame(create_default_scenario()))
+
+        self.assertFalse(self.pool.is_resident("a"))
+        self.assertTrue(self.pool.is_resident("b"))
+        self.assertTrue(self.pool.is_resident("c"))
+        self.assertEqual(self.pool.evictions, 1)
+        self.assertTrue(os.path.exists(os.path.join(self.temp_dir.name, "a.pickle")))
+
+    def test_rehydration_preserves_state(self):
+        game = TradingGame(create_default_scenario())
+        game.next_day()
+        day = game.market.day
+        capital = game.players[0].capital
+
+        self.pool.put("a", game)
+        self.pool.put("b", TradingGame(create_default_scenario()))
+        self.pool.put("c", TradingGame(create_default_scenario()))
+
+        restored = self.pool.get("a")
+
+        self.assertEqual(self.pool.misses, 1)
+        self.assertEqual(restored.market.day, day)
+        self.assertEqual(restored.players[0].capital, capital)
+        # Спостерігачі ринку відновлюються разом з грою
+        self.assertIs(restored.market._observers[0], restored.players[0])
+        self.assertFalse(os.path.exists(os.path.join(self.temp_dir.name, "a.pickle")))
+
+    def test_hit_moves_session_to_most_recent(self):
+        self.pool.put("a", TradingGame(create_default_scenario()))
+        self.pool.put("b", TradingGame(create_default_scenario()))
+
+        self.pool.get("a")
+        self.pool.put("c", TradingGame(create_default_scenario()))
+
+        self.assertEqual(self.pool.hits, 1)
+        self.assertTrue(self.pool.is_resident("a"))
+        self.assertFalse(self.pool.is_resident("b"))
+
+    def test_pinned_session_is_not_evicted(self):
+        self.pool.put("a", TradingGame(create_default_scenario()))
+        self.pool.pin("a")
+        self.pool.put("b", TradingGame(create_default_scenario()))
+        self.pool.put("c", TradingGame(create_default_scenario()))
+
+        self.assertTrue(self.pool.is_resident("a"))
+        self.assertFalse(self.pool.is_resident("b"))
+
+    def test_failed_eviction_keeps_game_in_memory(self):
+        broken = TradingGame(create_default_scenario())
+        broken.lock = threading.Lock()  # Не серіалізується
+        self.pool.put("a", broken)
+        self.pool.put("b", TradingGame(create_default_scenario()))
+        self.pool.put("c", TradingGame(create_default_scenario()))
+
+        self.assertTrue(self.pool.is_resident("a"))
+        self.assertIs(self.pool.get("a"), broken)
+        self.assertEqual(os.listdir(self.temp_dir.name), ["b.pickle"])
+        with self.assertRaises(TypeError):
+            self.pool.evict("a")
+        self.assertTrue(self.pool.is_resident("a"))
+        self.assertEqual(os.listdir(self.temp_dir.name), ["b.pickle"])
+
+    def test_unknown_session(self):
+        with self.assertRaises(KeyError):
+            self.pool.get("missing")
+
+    def test_remove(self):
+        self.pool.put("a", TradingGame(create_default_scenario()))
+        self.pool.remove("a")
+
+        self.assertNotIn("a", self.pool)
+        self.assertEqual(self.pool.resident_bytes, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
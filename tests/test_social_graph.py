@@ -0,0 +1,178 @@
+import unittest
+
+from game.scenario_loader import ScenarioError, validate_spec
+from game.trading_game import TradingGame
+from models.asset import Stock
+from models.market import Market
+from models.player import Player
+from models.social_graph import RumorNetwork, SocialGraph
+from utils.enums import RumorType
+
+
+class TestSocialGraph(unittest.TestCase):
+    def test_from_edges_builds_csr(self):
+        graph = SocialGraph.from_edges(3, [(2, 0, 0.5), (0, 1, 1.0), (0, 2, 0.25)])
+        self.assertEqual(list(graph.offsets), [0, 2, 2, 3])
+        self.assertEqual(list(graph.targets), [1, 2, 0])
+        self.assertEqual(graph.edge_count, 3)
+
+        with self.assertRaises(ValueError):
+            SocialGraph.from_edges(2, [(0, 0, 1.0)])
+        with self.assertRaises(ValueError):
+            SocialGraph.from_edges(2, [(0, 1, 1.5)])
+
+    def test_spmv_visits_only_frontier_rows(self):
+        graph = SocialGraph.from_edges(4, [(0, 1, 0.5), (0, 2, 1.0), (1, 2, 0.5), (3, 0, 1.0)])
+        self.assertEqual(graph.spmv({0: 0.8, 1: 0.4}), {1: 0.4, 2: 1.0})
+        self.assertEqual(graph.spmv({}), {})
+
+    def test_add_node_rebuilds_csr(self):
+        graph = SocialGraph.from_edges(3, [(0, 1, 0.5), (2, 0, 1.0)])
+        self.assertEqual(graph.add_node([(3, 0, 0.4), (1, 3, 0.9)]), 3)
+        self.assertEqual(graph.size, 4)
+        self.assertEqual(sorted(graph.edges()), [(0, 1, 0.5), (1, 3, 0.9), (2, 0, 1.0), (3, 0, 0.4)])
+        self.assertEqual(graph.spmv({1: 1.0}), {3: 0.9})
+
+    def test_random_graph_has_no_self_loops(self):
+        graph = SocialGraph.random(50, degree=5, seed=3)
+        self.assertEqual(graph.edge_count, 250)
+        for node in range(graph.size):
+            listeners = list(graph.targets[graph.offsets[node]:graph.offsets[node + 1]])
+            self.assertNotIn(node, listeners)
+            self.assertEqual(len(set(listeners)), 5)
+
+
+class TestRumorNetwork(unittest.TestCase):
+    def setUp(self):
+        self.market = Market()
+        self.asset = Stock("Компанія", "CMP", 100.0)
+        self.market.add_asset(self.asset)
+        self.players = [Player(f"Гравець {i}", 1000.0) for i in range(3)]
+        self.market.attach_many(self.players)
+        # Ланцюжок 0 -> 1 -> NPC 3 -> 2
+        graph = SocialGraph.from_edges(4, [(0, 1, 1.0), (1, 3, 1.0), (3, 2, 1.0)])
+        self.market.social = RumorNetwork(graph, self.players, hop_decay=0.8)
+
+    def create_rumor(self, is_true=True):
+        rumor = self.market.create_rumor(self.players[0], self.asset, RumorType.INSIDER, "Чутка", is_true)
+        rumor.credibility = 0.5
+        self.market.social.spreads[rumor.id].frontier[0] = 0.5
+        return rumor
+
+    def test_rumor_reaches_players_hop_by_hop(self):
+        rumor = self.create_rumor()
+        self.assertEqual(self.players[0].notifications, ["ЧУТКА: Чутка"])
+        self.assertEqual(self.players[1].notifications, [])
+        self.assertEqual(self.asset.current_price, 100.0)
+
+        self.assertEqual(self.market.social.step(self.market), 1)
+        self.assertEqual(self.players[1].notifications, ["ЧУТКА: Чутка"])
+        self.assertAlmostEqual(rumor.credibility, 0.4)
+        self.assertAlmostEqual(rumor.reach, 0.25)
+        self.assertNotEqual(self.asset.current_price, 100.0)
+
+        self.market.social.step(self.market)
+        self.market.social.step(self.market)
+        self.assertEqual(self.players[2].notifications, ["ЧУТКА: Чутка"])
+        self.assertAlmostEqual(rumor.credibility, 0.5 * 0.8 ** 3)
+        self.assertEqual(self.market.social.coverage(rumor.id), 1.0)
+
+        self.market.social.step(self.market)
+        self.assertNotIn(rumor.id, self.market.social.spreads)
+
+    def test_credibility_never_rises_where_paths_meet(self):
+        # Два переказувачі 1 і 2 разом дають NPC 3 сильнішу чутку, ніж почули самі
+        graph = SocialGraph.from_edges(4, [(0, 1, 1.0), (0, 2, 1.0), (1, 3, 1.0), (2, 3, 1.0)])
+        self.market.social = RumorNetwork(graph, self.players, hop_decay=1.0)
+        rumor = self.create_rumor()
+
+        self.market.social.step(self.market)
+        self.market.social.step(self.market)
+        self.assertAlmostEqual(rumor.credibility, 0.5)
+        self.assertEqual(self.market.social.coverage(rumor.id), 1.0)
+
+    def test_weak_rumor_stops_spreading(self):
+        self.market.social.min_strength = 0.3
+        rumor = self.create_rumor()
+        for _ in range(3):
+            self.market.social.step(self.market)
+        # 0.5 -> 0.4 -> 0.32 -> 0.256: до третього вузла чутка доходить заслабкою
+        self.assertNotIn(rumor.id, self.market.social.spreads)
+        self.assertEqual(self.players[2].notifications, [])
+
+    def test_discovered_rumor_stops_and_spreading_rumor_stays_live(self):
+        rumor = self.create_rumor(is_true=False)
+        rumor.discovered_chance = 0.0
+        self.market.update()
+        self.assertIs(self.market.rumors[0], rumor)
+
+        rumor.is_discovered = True
+        self.market.update()
+        self.assertNotIn(rumor.id, self.market.social.spreads)
+        self.assertTrue(self.market.rumors[0].is_discovered)
+        self.assertIsNot(self.market.rumors[0], rumor)
+
+    def test_creator_outside_network_falls_back_to_broadcast(self):
+        outsider = Player("Сторонній", 1000.0)
+        self.market.attach(outsider)
+        self.market.create_rumor(outsider, self.asset, RumorType.INSIDER, "Чутка", True)
+        self.assertFalse(self.market.social.spreads)
+        self.assertEqual(self.players[2].notifications, ["ЧУТКА: Чутка"])
+
+    def test_joining_player_takes_npc_node_then_grows_network(self):
+        game = TradingGame()
+        game.market = self.market
+        game.players = list(self.players)
+        network = self.market.social
+        rumor = self.create_rumor()
+
+        first = game.players[game.add_player("Новий", 1000.0)]
+        self.assertEqual(network.node_of[first.id], 3)
+        self.assertEqual(network.graph.size, 4)
+
+        second = game.players[game.add_player("Ще один", 1000.0)]
+        node = network.node_of[second.id]
+        self.assertEqual((node, network.graph.size), (4, 5))
+        self.assertEqual(len(network.spreads[rumor.id].known), 5)
+        listeners = network.graph.targets[network.graph.offsets[node]:network.graph.offsets[node + 1]]
+        self.assertEqual(len(listeners), 4)
+        self.assertEqual(sum(1 for _, target, _ in network.graph.edges() if target == node), 4)
+        self.assertEqual(network.add_player(second), node)
+
+        # Ланцюжок 0 -> 1 -> 3: гравець на місці NPC чує чутку на другому кроці
+        network.step(self.market)
+        self.assertEqual(first.notifications, [])
+        network.step(self.market)
+        self.assertEqual(first.notifications, ["ЧУТКА: Чутка"])
+
+    def test_joins_grow_network_in_batches(self):
+        players = [Player(f"Гравець {i}", 1000.0) for i in range(40)]
+        network = RumorNetwork(SocialGraph.random(40, degree=4, seed=1), players, seed=1)
+        rebuilds = []
+        add_nodes = network.graph.add_nodes
+        network.graph.add_nodes = lambda count, edges: rebuilds.append(count) or add_nodes(count, edges)
+
+        nodes = [network.add_player(Player(f"Новий {i}", 1000.0), degree=4) for i in range(20)]
+
+        self.assertEqual(nodes, list(range(40, 60)))
+        self.assertEqual(rebuilds, [10, 12])
+        self.assertEqual(network.graph.size, 62)
+        self.assertEqual(network.players.count(None), 2)
+        # Власні слухачі нового вузла без повторів; пізніші вузли можуть додати йому ще слухачів-джерел
+        for node in range(40, 62):
+            listeners = list(network.graph.targets[network.graph.offsets[node]:network.graph.offsets[node + 1]])
+            self.assertEqual(len(set(listeners)), len(listeners))
+            self.assertGreaterEqual(len(listeners), 4)
+            self.assertNotIn(node, listeners)
+
+    def test_scenario_section_validation(self):
+        spec = {"title": "Т", "assets": [{"type": "STOCK", "name": "А", "ticker": "A", "price": 1.0}]}
+        validate_spec(dict(spec, social={"npcs": 10, "degree": 3, "hop_decay": 0.5}))
+        with self.assertRaises(ScenarioError):
+            validate_spec(dict(spec, social={"hop_decay": 0.0}))
+        with self.assertRaises(ScenarioError):
+            validate_spec(dict(spec, social={"fanout": 3}))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import random
+import unittest
+from unittest.mock import MagicMock
+
+from models.asset import Stock, Cryptocurrency
+from models.market import Market
+from models.price_model import TickPriceModel
+from patterns.state import BullMarketState, VolatileMarketState
+
+
+class TestTickPriceModel(unittest.TestCase):
+    def setUp(self):
+        random.seed(1)
+        self.market = Market()
+        self.stock = Stock("Компанія", "CMP", 100.0)
+        self.crypto = Cryptocurrency("Токен", "TKN", 10.0)
+        self.market.add_asset(self.stock)
+        self.market.add_asset(self.crypto)
+        self.model = TickPriceModel(ticks_per_day=50)
+        self.market.price_model = self.model
+
+    def test_paths_cover_every_tick(self):
+        paths = self.model.generate_paths(self.market)
+
+        self.assertEqual(len(paths), 2)
+        self.assertTrue(all(len(path) == 50 for path in paths))
+        self.assertTrue(all(price > 0 for path in paths for price in path))
+
+    def test_observers_receive_every_tick(self):
+        observer = MagicMock()
+        self.market.attach(observer)
+
+        self.model.update_prices(self.market)
+
+        ticks = [call.kwargs["tick"] for call in observer.update.call_args_list if "tick" in call.kwargs]
+        self.assertEqual(ticks, list(range(50)))
+
+    def test_day_closes_on_last_tick_without_raw_tick_points(self):
+        state = random.getstate()
+        paths = self.model.generate_paths(self.market)
+        random.setstate(state)
+
+        self.model.update_prices(self.market)
+
+        self.assertAlmostEqual(self.stock.current_price, paths[0][-1])
+        # У сирій історії лише початкова ціна і закриття дня, тіки - у свічці
+        self.assertEqual(len(self.stock.price_history), 2)
+        candle = self.stock.history.candles("day")[-1]
+        self.assertEqual(candle.high, max([100.0] + paths[0]))
+
+    def test_drift_follows_market_state(self):
+        self.assertGreater(BullMarketState().drift, 0)
+        self.assertEqual(VolatileMarketState().drift, 0)
+        self.assertAlmostEqual(VolatileMarketState().volatility, 4.0 / 12 ** 0.5)
+
+    def test_invalid_tick_count(self):
+        with self.assertRaises(ValueError):
+            TickPriceModel(0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+"""
+Ігровий час.
+
+Усі мітки часу в симуляції - цілі числа, що кодують ігровий день і тік усередині
+дня: stamp = day << TICK_BITS | tick. Вони детерміновані (повтор гри дає ті самі
+мітки), не потребують системного годинника і займають менше пам'яті, ніж datetime.
+Реальний час за потреби фіксується лише вибірково, раз на ігровий день сесії.
+"""
+
+from bisect import bisect_right
+from collections import deque
+import time
+from typing import Deque, Optional, Tuple
+
+TICK_BITS = 20  # До ~1 млн тіків на день
+TICK_MASK = (1 << TICK_BITS) - 1
+WALL_SAMPLES = 1000  # Скільки останніх зразків реального часу зберігається
+
+
+def make_stamp(day: int, tick: int = 0) -> int:
+    return day << TICK_BITS | tick
+
+
+def stamp_day(stamp: int) -> int:
+    return stamp >> TICK_BITS
+
+
+def stamp_tick(stamp: int) -> int:
+    return stamp & TICK_MASK
+
+
+class GameClock:
+    __slots__ = ("day", "tick", "wall_times")
+
+    def __init__(self, day: int = 1, tick: int = 0):
+        self.day = day
+        self.tick = tick
+        # (мітка, time.time()) - лише якщо сесія ввімкнула фіксацію реального часу
+        self.wall_times: Optional[Deque[Tuple[int, float]]] = None
+
+    def now(self) -> int:
+        return self.day << TICK_BITS | self.tick
+
+    def advance_day(self) -> int:
+        self.day += 1
+        self.tick = 0
+        return self.day
+
+    def enable_wall_time(self, samples: int = WALL_SAMPLES) -> None:
+        if self.wall_times is None:
+            self.wall_times = deque(maxlen=samples)
+
+    def sample_wall_time(self) -> None:
+        if self.wall_times is not None:
+            self.wall_times.append((self.now(), time.time()))
+
+    def wall_time(self, stamp: int) -> Optional[float]:
+        """Реальний час останнього зразка не пізніше за мітку (None, якщо зразків немає)"""
+        if not self.wall_times:
+            return None
+        samples = self.wall_times
+        index = bisect_right(samples, (stamp, float("inf")))
+        return samples[index - 1][1] if index else None
+
+
+# Годинник сутностей, ще не прив'язаних до ринку: завжди показує перший день
+DETACHED_CLOCK = GameClock()
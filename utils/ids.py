@@ -0,0 +1,62 @@
+"""
+Компактні ID сутностей.
+
+Активи, гравці, інвестори, події й чутки отримують щільні цілі ID з одного
+лічильника процесу: цілі ключі словників хешуються миттєво і займають значно
+менше пам'яті, ніж 36-символьні рядки uuid4. Рядковий псевдонім лишається лише
+зовнішнім ідентифікатором для збережень і мережевого API і створюється
+тільки тоді, коли його вперше запитують.
+"""
+
+import itertools
+import uuid
+from typing import Dict, Iterable, Optional
+
+_counter = itertools.count(1)
+
+
+def next_id() -> int:
+    return next(_counter)
+
+
+def reserve_ids(last_id: int) -> None:
+    """Наступні ID будуть більшими за last_id (після завантаження сутностей зі знімка)"""
+    global _counter
+    current = next(_counter)
+    _counter = itertools.count(max(current, last_id + 1))
+
+
+class Entity:
+    """Сутність з цілим ID і зовнішнім рядковим псевдонімом"""
+
+    __slots__ = ("id", "_alias")
+
+    id: int
+    _alias: Optional[str]
+
+    def _assign_id(self, alias: Optional[str] = None) -> None:
+        self.id = next_id()
+        self._alias = alias
+
+    def __setstate__(self, state) -> None:
+        # Об'єкти зі слотами серіалізуються як (__dict__ або None, словник слотів)
+        attributes, slots = state if isinstance(state, tuple) else (state, None)
+        for values in (attributes, slots):
+            for name, value in (values or {}).items():
+                setattr(self, name, value)
+        reserve_ids(self.id)
+
+    @property
+    def alias(self) -> str:
+        if self._alias is None:
+            self._alias = str(uuid.uuid4())
+        return self._alias
+
+    @alias.setter
+    def alias(self, value: str) -> None:
+        self._alias = value
+
+
+def alias_index(entities: Iterable[Entity]) -> Dict[str, int]:
+    """Псевдонім -> ID для сутностей, чиї псевдоніми вже створено (нові uuid тут не генеруються)"""
+    return {entity._alias: entity.id for entity in entities if entity._alias is not None}
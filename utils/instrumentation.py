@@ -0,0 +1,200 @@
+"""
+Інструментування ігрового циклу: таймери фаз і лічильники.
+
+Вимкнене інструментування (NULL_INSTRUMENTATION) не міряє час і нічого не зберігає,
+тому його можна лишати в гарячих шляхах назавжди.
+"""
+
+from abc import ABC, abstractmethod
+import bisect
+import json
+import time
+from typing import Dict, List, Optional
+
+# Межі кошиків гістограми тривалості фаз у секундах (1-2.5-5 на кожну декаду)
+DEFAULT_BUCKETS = [m * 10.0 ** e for e in range(-6, 2) for m in (1.0, 2.5, 5.0)]
+
+
+class InstrumentationSink(ABC):
+    @abstractmethod
+    def record_phase(self, phase: str, seconds: float) -> None:
+        pass
+
+    @abstractmethod
+    def record_count(self, counter: str, value: int) -> None:
+        pass
+
+    def flush(self, day: Optional[int] = None) -> None:
+        """Кінець ігрового дня; сінки, що пишуть у файл, скидають буфер тут"""
+        pass
+
+
+class Histogram:
+    def __init__(self, buckets: Optional[List[float]] = None):
+        self.buckets = buckets or DEFAULT_BUCKETS
+        self.counts = [0] * (len(self.buckets) + 1)  # Останній кошик - +Inf
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """Оцінка квантиля за верхньою межею кошика"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank and bucket_count:
+                return self.buckets[index] if index < len(self.buckets) else float("inf")
+        return float("inf")
+
+
+class HistogramSink(InstrumentationSink):
+    """Гістограми тривалості фаз і сумарні лічильники в пам'яті"""
+
+    def __init__(self, buckets: Optional[List[float]] = None):
+        self.buckets = buckets or DEFAULT_BUCKETS
+        self.phases: Dict[str, Histogram] = {}
+        self.counters: Dict[str, int] = {}
+
+    def record_phase(self, phase: str, seconds: float) -> None:
+        histogram = self.phases.get(phase)
+        if histogram is None:
+            histogram = self.phases[phase] = Histogram(self.buckets)
+        histogram.observe(seconds)
+
+    def record_count(self, counter: str, value: int) -> None:
+        self.counters[counter] = self.counters.get(counter, 0) + value
+
+    def summary(self) -> Dict:
+        return {
+            "phases": {
+                phase: {"count": h.count, "total_sec": h.total,
+                        "mean_sec": h.total / h.count if h.count else 0.0,
+                        "p50_sec": h.quantile(0.5), "p99_sec": h.quantile(0.99)}
+                for phase, h in self.phases.items()
+            },
+            "counters": dict(self.counters),
+        }
+
+
+class JsonLinesSink(InstrumentationSink):
+    """Один JSON-рядок на ігровий день: сумарний час фаз і лічильники за день"""
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self._phases: Dict[str, float] = {}
+        self._counters: Dict[str, int] = {}
+
+    def record_phase(self, phase: str, seconds: float) -> None:
+        self._phases[phase] = self._phases.get(phase, 0.0) + seconds
+
+    def record_count(self, counter: str, value: int) -> None:
+        self._counters[counter] = self._counters.get(counter, 0) + value
+
+    def flush(self, day: Optional[int] = None) -> None:
+        if not self._phases and not self._counters:
+            return
+
+        # Файл відкривається на кожен запис, щоб сінк лишався придатним для pickle
+        with open(self.filename, 'a', encoding='utf-8') as f:
+            f.write(json.dumps({"day": day, "phases": self._phases, "counters": self._counters}) + "\n")
+        self._phases = {}
+        self._counters = {}
+
+
+class PrometheusTextSink(HistogramSink):
+    """Накопичує гістограми і віддає їх у текстовому форматі Prometheus"""
+
+    def __init__(self, prefix: str = "trading", buckets: Optional[List[float]] = None):
+        super().__init__(buckets)
+        self.prefix = prefix
+
+    def dump(self) -> str:
+        name = f"{self.prefix}_phase_seconds"
+        lines = [f"# HELP {name} Тривалість фаз ігрового дня.", f"# TYPE {name} histogram"]
+
+        for phase, histogram in sorted(self.phases.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(histogram.buckets, histogram.counts):
+                cumulative += bucket_count
+                lines.append(f'{name}_bucket{{phase="{phase}",le="{bound:g}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{phase="{phase}",le="+Inf"}} {histogram.count}')
+            lines.append(f'{name}_sum{{phase="{phase}"}} {histogram.total}')
+            lines.append(f'{name}_count{{phase="{phase}"}} {histogram.count}')
+
+        for counter, value in sorted(self.counters.items()):
+            counter_name = f"{self.prefix}_{counter}_total"
+            lines.append(f"# TYPE {counter_name} counter")
+            lines.append(f"{counter_name} {value}")
+
+        return "\n".join(lines) + "\n"
+
+    def write(self, filename: str) -> None:
+        with open(filename, 'w', encoding='utf-8') as f:
+            f.write(self.dump())
+
+
+class PhaseTimer:
+    def __init__(self, sink: InstrumentationSink, phase: str):
+        self.sink = sink
+        self.phase = phase
+        self.started = 0.0
+
+    def __enter__(self) -> 'PhaseTimer':
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.sink.record_phase(self.phase, time.perf_counter() - self.started)
+
+
+class NullPhase:
+    def __enter__(self) -> 'NullPhase':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        pass
+
+
+NULL_PHASE = NullPhase()
+
+
+class Instrumentation:
+    enabled = True
+
+    def __init__(self, sink: InstrumentationSink):
+        self.sink = sink
+
+    def phase(self, name: str):
+        return PhaseTimer(self.sink, name)
+
+    def count(self, counter: str, value: int = 1) -> None:
+        self.sink.record_count(counter, value)
+
+    def flush(self, day: Optional[int] = None) -> None:
+        self.sink.flush(day)
+
+
+class NullInstrumentation(Instrumentation):
+    enabled = False
+
+    def __init__(self):
+        super().__init__(None)
+
+    def phase(self, name: str):
+        return NULL_PHASE
+
+    def count(self, counter: str, value: int = 1) -> None:
+        pass
+
+    def flush(self, day: Optional[int] = None) -> None:
+        pass
+
+
+NULL_INSTRUMENTATION = NullInstrumentation()
@@ -0,0 +1,234 @@
+"""
+Реєстр метрик для довготривалих симуляцій і серверних сесій.
+
+Метрики віддаються у текстовому форматі Prometheus. Затримки зберігаються
+в HDR-подібних гістограмах (логарифмічно-лінійні кошики), що дають точні
+квантилі p50/p99 за сталої пам'яті.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional, Tuple
+
+from utils.instrumentation import InstrumentationSink
+
+
+def _labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in sorted(labels.items())) + "}"
+
+
+class Counter:
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount: int = 1) -> None:
+        self.value += amount
+
+
+class Meter(Counter):
+    """Лічильник із середньою швидкістю за ковзне вікно"""
+
+    def __init__(self, window: float = 60.0):
+        super().__init__()
+        self.window = window
+        self._samples: deque = deque([(time.monotonic(), 0)])
+
+    def inc(self, amount: int = 1) -> None:
+        self.value += amount
+        self._sample()
+
+    def _sample(self) -> None:
+        now = time.monotonic()
+        # Не частіше одного зразка на секунду, щоб вікно мало сталий розмір
+        if now - self._samples[-1][0] >= 1.0:
+            self._samples.append((now, self.value))
+            while len(self._samples) > 2 and now - self._samples[1][0] >= self.window:
+                self._samples.popleft()
+
+    def rate(self) -> float:
+        self._sample()
+        oldest_time, oldest_value = self._samples[0]
+        elapsed = time.monotonic() - oldest_time
+        return (self.value - oldest_value) / elapsed if elapsed > 0 else 0.0
+
+
+class HdrHistogram:
+    """Гістограма з логарифмічно-лінійними кошиками: відносна похибка ~2^-precision"""
+
+    def __init__(self, precision: int = 7, unit: float = 1e-6):
+        self.unit = unit  # Значення зберігаються цілими кратними unit (за замовчуванням - мікросекунди)
+        self.sub_bucket_count = 1 << precision
+        self.half = self.sub_bucket_count >> 1
+        self.precision = precision
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def _index(self, value: int) -> int:
+        if value < self.sub_bucket_count:
+            return value
+        shift = value.bit_length() - self.precision
+        return self.sub_bucket_count + (shift - 1) * self.half + ((value >> shift) - self.half)
+
+    def _upper_bound(self, index: int) -> int:
+        if index < self.sub_bucket_count:
+            return index
+        offset = index - self.sub_bucket_count
+        shift = offset // self.half + 1
+        sub = offset % self.half + self.half
+        return ((sub + 1) << shift) - 1
+
+    def record(self, value: float) -> None:
+        index = self._index(max(0, int(value / self.unit)))
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = max(1, int(q * self.count + 0.5))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(self._upper_bound(index) * self.unit, self.max)
+        return self.max
+
+
+class MetricsRegistry:
+    QUANTILES = (0.5, 0.9, 0.99, 0.999)
+
+    def __init__(self, prefix: str = "trading"):
+        self.prefix = prefix
+        self._metrics: Dict[Tuple[str, Tuple], object] = {}
+        self._help: Dict[str, str] = {}
+        self._gauges: Dict[Tuple[str, Tuple], Callable[[], float]] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, name: str, labels: Dict[str, str], factory: Callable[[], object], help_text: str):
+        key = (name, tuple(sorted(labels.items())))
+        metric = self._metrics.get(key)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.setdefault(key, factory())
+                if help_text:
+                    self._help.setdefault(name, help_text)
+        return metric
+
+    def counter(self, name: str, help_text: str = "", **labels: str) -> Meter:
+        return self._get(name, labels, Meter, help_text)
+
+    def histogram(self, name: str, help_text: str = "", **labels: str) -> HdrHistogram:
+        return self._get(name, labels, HdrHistogram, help_text)
+
+    def gauge(self, name: str, func: Callable[[], float], help_text: str = "", **labels: str) -> None:
+        """Датчик, значення якого обчислюється під час кожного зчитування"""
+        with self._lock:
+            self._gauges[(name, tuple(sorted(labels.items())))] = func
+            if help_text:
+                self._help.setdefault(name, help_text)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        declared = set()
+
+        def header(name: str, full_name: str, metric_type: str) -> None:
+            if full_name in declared:
+                return
+            declared.add(full_name)
+            if name in self._help:
+                lines.append(f"# HELP {full_name} {self._help[name]}")
+            lines.append(f"# TYPE {full_name} {metric_type}")
+
+        with self._lock:
+            metrics = sorted(self._metrics.items(), key=lambda item: item[0])
+            gauges = sorted(self._gauges.items(), key=lambda item: item[0])
+
+        for (name, labels), metric in metrics:
+            full_name = f"{self.prefix}_{name}"
+            label_dict = dict(labels)
+            if isinstance(metric, Meter):
+                header(name, f"{full_name}_total", "counter")
+                lines.append(f"{full_name}_total{_labels(label_dict)} {metric.value}")
+            else:
+                header(name, full_name, "summary")
+                for q in self.QUANTILES:
+                    lines.append(f"{full_name}{_labels(dict(label_dict, quantile=str(q)))} {metric.quantile(q)}")
+                lines.append(f"{full_name}_sum{_labels(label_dict)} {metric.total}")
+                lines.append(f"{full_name}_count{_labels(label_dict)} {metric.count}")
+
+        # Швидкості лічильників за ковзне вікно - окремими датчиками
+        for (name, labels), metric in metrics:
+            if isinstance(metric, Meter):
+                full_name = f"{self.prefix}_{name}_per_second"
+                header(f"{name}_per_second", full_name, "gauge")
+                lines.append(f"{full_name}{_labels(dict(labels))} {metric.rate()}")
+
+        for (name, labels), func in gauges:
+            try:
+                value = float(func())
+            except Exception:
+                # Збій одного датчика не повинен ламати весь скрейп
+                continue
+            full_name = f"{self.prefix}_{name}"
+            header(name, full_name, "gauge")
+            lines.append(f"{full_name}{_labels(dict(labels))} {value}")
+
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+
+class MetricsSink(InstrumentationSink):
+    """Інструментування гри, що пише фази і лічильники в реєстр метрик"""
+
+    def __init__(self, registry: Optional[MetricsRegistry] = None):
+        self.registry = registry or REGISTRY
+        self._phases: Dict[str, HdrHistogram] = {}
+        self._counters: Dict[str, Meter] = {}
+
+    def record_phase(self, phase: str, seconds: float) -> None:
+        histogram = self._phases.get(phase)
+        if histogram is None:
+            histogram = self._phases[phase] = self.registry.histogram(
+                "phase_seconds", "Тривалість фаз гри.", phase=phase)
+        histogram.record(seconds)
+
+    def record_count(self, counter: str, value: int) -> None:
+        meter = self._counters.get(counter)
+        if meter is None:
+            meter = self._counters[counter] = self.registry.counter(counter)
+        meter.inc(value)
+
+    def __reduce__(self):
+        # Знімок гри (pickle) не повинен тягнути за собою копію реєстру
+        if self.registry is REGISTRY:
+            return MetricsSink, ()
+        return MetricsSink, (self.registry,)
+
+
+class MultiSink(InstrumentationSink):
+    """Розсилка інструментування в кілька сінків одночасно"""
+
+    def __init__(self, *sinks: InstrumentationSink):
+        self.sinks = list(sinks)
+
+    def record_phase(self, phase: str, seconds: float) -> None:
+        for sink in self.sinks:
+            sink.record_phase(phase, seconds)
+
+    def record_count(self, counter: str, value: int) -> None:
+        for sink in self.sinks:
+            sink.record_count(counter, value)
+
+    def flush(self, day: Optional[int] = None) -> None:
+        for sink in self.sinks:
+            sink.flush(day)
@@ -0,0 +1,221 @@
+"""
+Колонкове сховище історичних цін.
+
+CSV-файли перетворюються один раз у каталог із файлом метаданих і окремим
+бінарним файлом на кожну колонку (open/high/low/close). Усередині колонки
+ряди активів лежать підряд: значення активу i за день d має зміщення
+(i * days + d) * 8. Файли відкриваються через mmap, тож у пам'ять потрапляють
+лише сторінки, які реально читаються - десятиліття даних по тисячах тікерів
+не завантажуються цілком.
+
+    python -m utils.price_store data/*.csv --output prices/
+"""
+
+import argparse
+import array
+import csv
+import json
+import math
+import mmap
+import os
+import sys
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+META_FILE = "meta.json"
+STORE_FORMAT = 1
+COLUMNS = ("open", "high", "low", "close")
+ITEM_SIZE = 8  # float64
+FILL_CHUNK = 1 << 16  # Кількість значень NaN, що записуються за раз під час створення файлу
+
+
+class PriceStoreError(ValueError):
+    pass
+
+
+def _column_file(directory: str, column: str) -> str:
+    return os.path.join(directory, f"{column}.f64")
+
+
+def _read_rows(path: str) -> Iterator[Tuple[str, str, Dict[str, str]]]:
+    """Рядки CSV як (дата, тікер, значення); без колонки ticker тікером є ім'я файлу"""
+    default_ticker = os.path.splitext(os.path.basename(path))[0]
+
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.DictReader(f)
+        if not reader.fieldnames:
+            return
+        fields = {name.strip().lower(): name for name in reader.fieldnames}
+        if "date" not in fields or "close" not in fields:
+            raise PriceStoreError(f"{path}: потрібні колонки date і close")
+        ticker_field = fields.get("ticker") or fields.get("symbol")
+
+        for row in reader:
+            ticker = row[ticker_field].strip() if ticker_field else default_ticker
+            values = {column: row[fields[column]] for column in COLUMNS if column in fields}
+            yield row[fields["date"]].strip(), ticker, values
+
+
+def _parse_price(text: Optional[str]) -> float:
+    try:
+        value = float(text)
+    except (TypeError, ValueError):
+        return math.nan
+    return value if value > 0 else math.nan
+
+
+def convert_csv(paths: Iterable[str], output_dir: str) -> 'PriceStore':
+    """
+    Перетворення CSV у колонкове сховище за два проходи: перший збирає дати й тікери,
+    другий пише значення одразу у відображені файли, не тримаючи таблицю в пам'яті
+    """
+    paths = list(paths)
+    dates = set()
+    tickers = set()
+    for path in paths:
+        for date, ticker, _ in _read_rows(path):
+            dates.add(date)
+            tickers.add(ticker)
+
+    if not dates or not tickers:
+        raise PriceStoreError("CSV-файли не містять даних")
+
+    # ISO-дати (YYYY-MM-DD) сортуються лексикографічно
+    date_list = sorted(dates)
+    ticker_list = sorted(tickers)
+    day_index = {date: i for i, date in enumerate(date_list)}
+    ticker_index = {ticker: i for i, ticker in enumerate(ticker_list)}
+    num_days = len(date_list)
+    total = len(ticker_list) * num_days
+
+    os.makedirs(output_dir, exist_ok=True)
+    files = {}
+    maps = {}
+    views = {}
+    try:
+        nan_chunk = array.array('d', [math.nan] * min(total, FILL_CHUNK)).tobytes()
+        for column in COLUMNS:
+            f = files[column] = open(_column_file(output_dir, column), 'w+b')
+            remaining = total
+            while remaining > 0:
+                count = min(remaining, FILL_CHUNK)
+                f.write(nan_chunk[:count * ITEM_SIZE])
+                remaining -= count
+            f.flush()
+            maps[column] = mmap.mmap(f.fileno(), total * ITEM_SIZE)
+            views[column] = memoryview(maps[column]).cast('d')
+
+        for path in paths:
+            for date, ticker, values in _read_rows(path):
+                offset = ticker_index[ticker] * num_days + day_index[date]
+                close = _parse_price(values.get("close"))
+                for column in COLUMNS:
+                    # Відсутні open/high/low заповнюються ціною закриття
+                    value = _parse_price(values[column]) if column in values else close
+                    views[column][offset] = value
+    finally:
+        for view in views.values():
+            view.release()
+        for m in maps.values():
+            m.flush()
+            m.close()
+        for f in files.values():
+            f.close()
+
+    meta = {
+        "format": STORE_FORMAT,
+        "byteorder": sys.byteorder,
+        "columns": list(COLUMNS),
+        "tickers": ticker_list,
+        "dates": date_list,
+    }
+    with open(os.path.join(output_dir, META_FILE), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False)
+
+    return PriceStore(output_dir)
+
+
+class PriceStore:
+    """Читання сховища: ряди активів повертаються як memoryview поверх mmap без копіювання"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._open()
+
+    def _open(self) -> None:
+        try:
+            with open(os.path.join(self.directory, META_FILE), 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError) as e:
+            raise PriceStoreError(f"{self.directory}: не вдалося прочитати метадані ({e})")
+
+        if meta.get("format") != STORE_FORMAT:
+            raise PriceStoreError(f"{self.directory}: непідтримуваний формат сховища")
+        if meta.get("byteorder") != sys.byteorder:
+            raise PriceStoreError(f"{self.directory}: сховище створене на платформі з іншим порядком байтів")
+
+        self.tickers: List[str] = meta["tickers"]
+        self.dates: List[str] = meta["dates"]
+        self.columns: List[str] = meta["columns"]
+        self.num_days = len(self.dates)
+        self._ticker_index = {ticker: i for i, ticker in enumerate(self.tickers)}
+        self._maps: Dict[str, mmap.mmap] = {}
+        self._views: Dict[str, memoryview] = {}
+
+    def _column(self, column: str) -> memoryview:
+        view = self._views.get(column)
+        if view is None:
+            if column not in self.columns:
+                raise PriceStoreError(f"Невідома колонка '{column}'")
+            with open(_column_file(self.directory, column), 'rb') as f:
+                self._maps[column] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            view = self._views[column] = memoryview(self._maps[column]).cast('d')
+        return view
+
+    def __contains__(self, ticker: str) -> bool:
+        return ticker in self._ticker_index
+
+    def __len__(self) -> int:
+        return len(self.tickers)
+
+    def series(self, ticker: str, column: str = "close") -> memoryview:
+        """Ряд активу за всі дні; відсутні значення - NaN"""
+        index = self._ticker_index.get(ticker)
+        if index is None:
+            raise KeyError(ticker)
+        start = index * self.num_days
+        return self._column(column)[start:start + self.num_days]
+
+    def value(self, ticker: str, day: int, column: str = "close") -> float:
+        return self.series(ticker, column)[day]
+
+    def close(self) -> None:
+        for view in self._views.values():
+            view.release()
+        for m in self._maps.values():
+            try:
+                m.close()
+            except BufferError:
+                # Ряди, видані через series(), ще використовуються - відображення
+                # звільниться, коли зникне останній з них
+                pass
+        self._views = {}
+        self._maps = {}
+
+    def __getstate__(self):
+        # Відображення файлів не серіалізуються - після відновлення сховище відкривається знову
+        return {"directory": self.directory}
+
+    def __setstate__(self, state) -> None:
+        self.directory = state["directory"]
+        self._open()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Перетворення CSV з історичними цінами у колонкове сховище")
+    parser.add_argument("csv", nargs="+", help="CSV-файли (date, [ticker], [open, high, low], close)")
+    parser.add_argument("--output", required=True, help="каталог сховища")
+    args = parser.parse_args()
+
+    store = convert_csv(args.csv, args.output)
+    print(f"Збережено {len(store)} тікерів за {store.num_days} днів у {args.output}")
+    store.close()